@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ArticlesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "articles"
+
+    def ready(self):
+        # Connects the cache invalidation signals of the @cached_service lookups,
+        # so they also run in processes that never import the views (e.g. workers)
+        from .services import articles  # noqa: F401
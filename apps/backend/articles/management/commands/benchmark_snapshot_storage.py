@@ -0,0 +1,130 @@
+import copy
+import random
+import time
+
+import orjson
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from articles.models import ContentBlob
+from articles.tiptap import apply_patch, diff_documents
+from core.utils.benchmarks import make_paragraph, make_tiptap_document
+
+
+def _make_history(*, blocks, revisions, edits, seed=0):
+    """
+    Build successive revisions of a document, each editing or inserting a few blocks,
+    like an author resubmitting after review.
+    """
+    rng = random.Random(seed)
+    document = make_tiptap_document(blocks=blocks, seed=seed)
+    history = [document]
+
+    for _ in range(revisions - 1):
+        document = copy.deepcopy(document)
+        for _ in range(edits):
+            index = rng.randrange(len(document["content"]))
+            if rng.random() < 0.2:
+                document["content"].insert(index, make_paragraph(rng))
+            else:
+                document["content"][index] = make_paragraph(rng)
+        history.append(document)
+
+    return history
+
+
+class Command(BaseCommand):
+    help = "Report the storage saved by delta snapshot storage and the reconstruction latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--blocks", type=int, default=200, help="Blocks of the generated document")
+        parser.add_argument("--revisions", type=int, default=50)
+        parser.add_argument("--edits", type=int, default=3, help="Blocks changed per revision")
+        parser.add_argument("--keyframe-interval", type=int, default=settings.ARTICLE_SNAPSHOT_KEYFRAME_INTERVAL)
+        parser.add_argument("--iterations", type=int, default=100)
+        parser.add_argument(
+            "--from-db", action="store_true",
+            help="Measure the stored content blobs instead of a generated history",
+        )
+
+    def handle(self, *args, **options):
+        if options["from_db"]:
+            self._report_database()
+            return
+
+        history = _make_history(blocks=options["blocks"], revisions=options["revisions"], edits=options["edits"])
+        chain = self._store(history, options["keyframe_interval"])
+
+        full_size = sum(len(orjson.dumps(document)) for document in history)
+        stored_size = sum(size for _, _, size in chain)
+        keyframes = sum(1 for _, patch, _ in chain if patch is None)
+        self._report_sizes(len(history), keyframes, full_size, stored_size)
+
+        # Rebuilding the newest revision from its keyframe, without the LRU
+        started_at = time.perf_counter()
+        for _ in range(options["iterations"]):
+            document = self._rebuild(chain, len(chain) - 1)
+        rebuild_time = (time.perf_counter() - started_at) / options["iterations"] * 1_000_000
+        assert document == history[-1]
+
+        depth = len(chain) - 1 - max(index for index, (_, patch, _) in enumerate(chain) if patch is None)
+        self.stdout.write(f"rebuild newest revision ({depth} deltas): {rebuild_time:.1f} µs")
+
+    @staticmethod
+    def _store(history, keyframe_interval):
+        """
+        Store the history like acquire_content_blob() in "delta" mode.
+        Return (document, patch or None for keyframes, stored bytes) tuples.
+        """
+        chain = []
+        depth = 0
+
+        for index, document in enumerate(history):
+            patch = None
+            if index and depth + 1 < keyframe_interval:
+                patch = diff_documents(history[index - 1], document)
+                if len(orjson.dumps(patch)) >= len(orjson.dumps(document)):
+                    patch = None
+
+            depth = 0 if patch is None else depth + 1
+            stored = document if patch is None else patch
+            chain.append((document, patch, len(orjson.dumps(stored))))
+
+        return chain
+
+    @staticmethod
+    def _rebuild(chain, index):
+        deltas = []
+        while chain[index][1] is not None:
+            deltas.append(chain[index][1])
+            index -= 1
+
+        document = chain[index][0]
+        for patch in reversed(deltas):
+            document = apply_patch(document, patch)
+        return document
+
+    def _report_sizes(self, count, keyframes, full_size, stored_size):
+        saved = 1 - stored_size / full_size if full_size else 0
+        self.stdout.write(f"{count} contents, {keyframes} keyframes")
+        self.stdout.write(f"full storage:  {full_size:>12} bytes")
+        self.stdout.write(f"delta storage: {stored_size:>12} bytes ({saved:.1%} saved)")
+
+    def _report_database(self):
+        blobs = list(ContentBlob.objects.only("content_hash", "content", "base", "patch").order_by("depth"))
+        if not blobs:
+            self.stdout.write(self.style.WARNING("No content blobs to measure"))
+            return
+
+        full_size = 0
+        stored_size = 0
+        keyframes = 0
+        started_at = time.perf_counter()
+        for blob in blobs:
+            full_size += len(orjson.dumps(blob.get_content()))
+            stored_size += len(orjson.dumps(blob.content if blob.patch is None else blob.patch))
+            keyframes += blob.patch is None
+        rebuild_time = (time.perf_counter() - started_at) / len(blobs) * 1_000_000
+
+        self._report_sizes(len(blobs), keyframes, full_size, stored_size)
+        self.stdout.write(f"mean content read (LRU warming up): {rebuild_time:.1f} µs")
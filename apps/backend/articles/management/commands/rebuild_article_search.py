@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from articles.models import PublishedArticle
+from articles.services.search import (
+    is_full_text_search_supported,
+    refresh_search_columns,
+    update_search_index,
+)
+
+
+class Command(BaseCommand):
+    help = "Recompute the plain text and the search vectors of all published articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = (
+            PublishedArticle.objects.select_related("blob").only("id", "plain_text", "blob__content").order_by("pk")
+        )
+
+        batch = []
+        total = 0
+        for published_article in queryset.iterator(chunk_size=batch_size):
+            refresh_search_columns(published_article)
+            batch.append(published_article)
+            if len(batch) >= batch_size:
+                total += self._flush(batch)
+
+        total += self._flush(batch)
+
+        if not is_full_text_search_supported():
+            self.stdout.write(self.style.WARNING("Not PostgreSQL: only the plain text was rebuilt"))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the search columns of {total} published articles"))
+
+    @staticmethod
+    def _flush(batch):
+        if not batch:
+            return 0
+
+        PublishedArticle.objects.bulk_update(batch, fields=["plain_text"])
+        update_search_index([published_article.pk for published_article in batch])
+        count = len(batch)
+        batch.clear()
+        return count
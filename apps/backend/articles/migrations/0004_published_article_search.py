@@ -0,0 +1,96 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexOnPostgres
+
+BLOCK_NODE_TYPES = frozenset({
+    'paragraph', 'heading', 'blockquote', 'codeBlock', 'listItem', 'taskItem',
+    'tableCell', 'tableHeader', 'horizontalRule',
+})
+
+
+def extract_plain_text(doc):
+    # Frozen copy of articles.tiptap.extract_plain_text() at the time of this migration
+    lines = []
+    current = []
+
+    def end_block():
+        if current:
+            line = "".join(current).strip()
+            if line:
+                lines.append(line)
+            current.clear()
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+            return
+        if not isinstance(node, dict):
+            return
+
+        node_type = node.get('type')
+        if node_type == 'text':
+            current.append(node.get('text') or "")
+        elif node_type == 'hardBreak':
+            current.append(" ")
+        elif isinstance(node.get('text'), str):
+            # Simplified documents storing the text on the block itself
+            current.append(node['text'])
+
+        walk(node.get('content') or node.get('blocks') or [])
+
+        if node_type in BLOCK_NODE_TYPES:
+            end_block()
+
+    walk(doc)
+    end_block()
+
+    return "\n".join(lines)
+
+
+def backfill_search_columns(apps, schema_editor):
+    PublishedArticle = apps.get_model('articles', 'PublishedArticle')
+
+    for published_article in PublishedArticle.objects.only('id', 'content').iterator(chunk_size=500):
+        PublishedArticle.objects.filter(pk=published_article.pk).update(
+            plain_text=extract_plain_text(published_article.content)
+        )
+
+    if schema_editor.connection.vendor == 'postgresql':
+        from django.conf import settings
+        from django.contrib.postgres.search import SearchVector
+
+        config = settings.ARTICLE_SEARCH_CONFIG
+        PublishedArticle.objects.update(
+            search_vector=SearchVector('title', weight='A', config=config)
+            + SearchVector('plain_text', weight='B', config=config)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_alter_articleevent_id_alter_articlesnapshot_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publishedarticle',
+            name='plain_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='The text of the content, used for search', verbose_name='plain text'),
+        ),
+        migrations.AddField(
+            model_name='publishedarticle',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='The weighted tsvector of the title (A) and the plain text (B)', null=True, verbose_name='search vector'),
+        ),
+        AddIndexOnPostgres(
+            model_name='publishedarticle',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='published_search_vector_gin'),
+        ),
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+    ]
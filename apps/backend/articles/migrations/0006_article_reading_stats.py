@@ -0,0 +1,141 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:15
+
+import math
+import re
+
+from django.db import migrations, models
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 200
+
+_CJK_CHARACTER = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]')
+
+BLOCK_NODE_TYPES = frozenset({
+    'paragraph', 'heading', 'blockquote', 'codeBlock', 'listItem', 'taskItem',
+    'tableCell', 'tableHeader', 'horizontalRule',
+})
+
+
+def extract_plain_text(doc):
+    # Frozen copy of articles.tiptap.extract_plain_text() at the time of this migration
+    lines = []
+    current = []
+
+    def end_block():
+        if current:
+            line = "".join(current).strip()
+            if line:
+                lines.append(line)
+            current.clear()
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+            return
+        if not isinstance(node, dict):
+            return
+
+        node_type = node.get('type')
+        if node_type == 'text':
+            current.append(node.get('text') or "")
+        elif node_type == 'hardBreak':
+            current.append(" ")
+        elif isinstance(node.get('text'), str):
+            # Simplified documents storing the text on the block itself
+            current.append(node['text'])
+
+        walk(node.get('content') or node.get('blocks') or [])
+
+        if node_type in BLOCK_NODE_TYPES:
+            end_block()
+
+    walk(doc)
+    end_block()
+
+    return "\n".join(lines)
+
+
+def count_words(text):
+    cjk_count = len(_CJK_CHARACTER.findall(text))
+    return cjk_count + len(_CJK_CHARACTER.sub(" ", text).split())
+
+
+def make_excerpt(text, *, max_length=EXCERPT_LENGTH):
+    text = " ".join(text.split())
+    if len(text) <= max_length:
+        return text
+
+    cut = text[:max_length]
+    space_index = cut.rfind(" ")
+    if space_index > max_length // 2:
+        cut = cut[:space_index]
+
+    return cut.rstrip(" ,;:.-") + "…"
+
+
+def get_reading_stats(plain_text):
+    # Frozen copy of articles.tiptap.get_reading_stats() at the time of this migration
+    word_count = count_words(plain_text)
+
+    return {
+        'excerpt': make_excerpt(plain_text),
+        'word_count': word_count,
+        'reading_time': math.ceil(word_count / WORDS_PER_MINUTE),
+    }
+
+
+def backfill_reading_stats(apps, schema_editor):
+    SourceArticle = apps.get_model('articles', 'SourceArticle')
+    PublishedArticle = apps.get_model('articles', 'PublishedArticle')
+
+    for source_article in SourceArticle.objects.only('id', 'content').iterator(chunk_size=500):
+        SourceArticle.objects.filter(pk=source_article.pk).update(
+            **get_reading_stats(extract_plain_text(source_article.content))
+        )
+
+    for published_article in PublishedArticle.objects.only('id', 'plain_text').iterator(chunk_size=500):
+        PublishedArticle.objects.filter(pk=published_article.pk).update(
+            **get_reading_stats(published_article.plain_text)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_published_title_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publishedarticle',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False, help_text='The beginning of the text of the content', verbose_name='excerpt'),
+        ),
+        migrations.AddField(
+            model_name='publishedarticle',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='The estimated reading time of the content, in minutes', verbose_name='reading time'),
+        ),
+        migrations.AddField(
+            model_name='publishedarticle',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='The number of words of the content', verbose_name='word count'),
+        ),
+        migrations.AddField(
+            model_name='sourcearticle',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False, help_text='The beginning of the text of the content', verbose_name='excerpt'),
+        ),
+        migrations.AddField(
+            model_name='sourcearticle',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='The estimated reading time of the content, in minutes', verbose_name='reading time'),
+        ),
+        migrations.AddField(
+            model_name='sourcearticle',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='The number of words of the content', verbose_name='word count'),
+        ),
+        migrations.RunPython(backfill_reading_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_article_reading_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentBlob',
+            fields=[
+                ('content_hash', models.CharField(editable=False, help_text='The hash of the title and the content', max_length=128, primary_key=True, serialize=False, verbose_name='content hash')),
+                ('content', models.JSONField(default=dict, editable=False, help_text='The content shared by the snapshots and published versions', verbose_name='content')),
+                ('ref_count', models.PositiveIntegerField(db_index=True, default=0, editable=False, help_text='The number of snapshots and published versions referencing the blob', verbose_name='reference count')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='The created DateTime of the blob', verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'content blob',
+                'verbose_name_plural': 'content blobs',
+            },
+        ),
+        # The blake2b hex digests are 128 characters long
+        migrations.AlterField(
+            model_name='articlesnapshot',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='The content hash of the article snapshot', max_length=128, verbose_name='content hash'),
+        ),
+        migrations.AddField(
+            model_name='publishedarticle',
+            name='blob',
+            field=models.ForeignKey(db_column='content_hash', help_text='The content of the published article, keyed by its content hash', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='published_articles', to='articles.contentblob', verbose_name='content blob'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:24
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def hash_content(title, content):
+    # Frozen copy of articles.services.blobs.hash_content() at the time of this migration
+    items_json = json.dumps({'title': title.strip(), 'content': content}, sort_keys=True)
+    return hashlib.blake2b(items_json.encode("utf-8")).hexdigest()
+
+
+def _acquire_blob(ContentBlob, content_hash, content):
+    _, created = ContentBlob.objects.get_or_create(
+        content_hash=content_hash, defaults={'content': content, 'ref_count': 1},
+    )
+    if not created:
+        ContentBlob.objects.filter(pk=content_hash).update(ref_count=models.F('ref_count') + 1)
+
+
+def move_contents_to_blobs(apps, schema_editor):
+    ContentBlob = apps.get_model('articles', 'ContentBlob')
+    ArticleSnapshot = apps.get_model('articles', 'ArticleSnapshot')
+    PublishedArticle = apps.get_model('articles', 'PublishedArticle')
+
+    snapshots = ArticleSnapshot.objects.only('id', 'title', 'content', 'content_hash')
+    for snapshot in snapshots.iterator(chunk_size=500):
+        content_hash = hash_content(snapshot.title, snapshot.content)
+        _acquire_blob(ContentBlob, content_hash, snapshot.content)
+        if snapshot.content_hash != content_hash:
+            ArticleSnapshot.objects.filter(pk=snapshot.pk).update(content_hash=content_hash)
+
+    published_articles = PublishedArticle.objects.only('id', 'title', 'content')
+    for published_article in published_articles.iterator(chunk_size=500):
+        content_hash = hash_content(published_article.title, published_article.content)
+        _acquire_blob(ContentBlob, content_hash, published_article.content)
+        PublishedArticle.objects.filter(pk=published_article.pk).update(blob_id=content_hash)
+
+
+def move_blobs_to_contents(apps, schema_editor):
+    ContentBlob = apps.get_model('articles', 'ContentBlob')
+    ArticleSnapshot = apps.get_model('articles', 'ArticleSnapshot')
+    PublishedArticle = apps.get_model('articles', 'PublishedArticle')
+
+    for snapshot in ArticleSnapshot.objects.only('id', 'content_hash').iterator(chunk_size=500):
+        content = ContentBlob.objects.values_list('content', flat=True).get(pk=snapshot.content_hash)
+        ArticleSnapshot.objects.filter(pk=snapshot.pk).update(content=content)
+
+    published_articles = PublishedArticle.objects.select_related('blob').only('id', 'blob__content')
+    for published_article in published_articles.iterator(chunk_size=500):
+        PublishedArticle.objects.filter(pk=published_article.pk).update(content=published_article.blob.content)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_content_blobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_contents_to_blobs, move_blobs_to_contents),
+    ]
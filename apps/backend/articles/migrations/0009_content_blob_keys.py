@@ -0,0 +1,46 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_move_contents_to_blobs'),
+    ]
+
+    operations = [
+        # ArticleSnapshot.content_hash becomes the foreign key to the blob, in the same column
+        migrations.RemoveIndex(
+            model_name='articlesnapshot',
+            name='articles_ar_source__a682c0_idx',
+        ),
+        migrations.RenameField(
+            model_name='articlesnapshot',
+            old_name='content_hash',
+            new_name='blob',
+        ),
+        migrations.AlterField(
+            model_name='articlesnapshot',
+            name='blob',
+            field=models.ForeignKey(db_column='content_hash', help_text='The content of the article snapshot, keyed by its content hash', on_delete=django.db.models.deletion.PROTECT, related_name='article_snapshots', to='articles.contentblob', verbose_name='content blob'),
+        ),
+        migrations.AddIndex(
+            model_name='articlesnapshot',
+            index=models.Index(fields=['source_article', 'blob'], name='articles_ar_source__a682c0_idx'),
+        ),
+        migrations.AlterField(
+            model_name='publishedarticle',
+            name='blob',
+            field=models.ForeignKey(db_column='content_hash', help_text='The content of the published article, keyed by its content hash', on_delete=django.db.models.deletion.PROTECT, related_name='published_articles', to='articles.contentblob', verbose_name='content blob'),
+        ),
+        migrations.RemoveField(
+            model_name='articlesnapshot',
+            name='content',
+        ),
+        migrations.RemoveField(
+            model_name='publishedarticle',
+            name='content',
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_content_blob_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contentblob',
+            name='base',
+            field=models.ForeignKey(editable=False, help_text='The blob the patch applies to, null for keyframes', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='deltas', to='articles.contentblob', verbose_name='base'),
+        ),
+        migrations.AddField(
+            model_name='contentblob',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='The number of deltas since the last keyframe', verbose_name='depth'),
+        ),
+        migrations.AddField(
+            model_name='contentblob',
+            name='patch',
+            field=models.JSONField(editable=False, help_text='The structural patch against the base blob, null for keyframes', null=True, verbose_name='patch'),
+        ),
+        migrations.AlterField(
+            model_name='contentblob',
+            name='content',
+            field=models.JSONField(default=dict, editable=False, help_text='The content shared by the snapshots and published versions, null for deltas', null=True, verbose_name='content'),
+        ),
+    ]
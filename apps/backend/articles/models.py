@@ -1,13 +1,21 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 
 from core.model_mixins import TimeStampedMixin, UUIDPrimaryKeyMixin, SoftDeleteMixin
+from core.utils.local_cache import LRUCache
+from .tiptap import apply_patch
 
 
 User = get_user_model()
 
+# Contents rebuilt from delta blobs. Blobs never change, the timeout only bounds the memory held.
+_blob_contents = LRUCache(
+    max_entries=settings.CONTENT_BLOB_CACHE_MAX_ENTRIES, timeout=settings.CONTENT_BLOB_CACHE_TIMEOUT,
+)
+
 
 class SourceArticle(UUIDPrimaryKeyMixin,
                     TimeStampedMixin,
@@ -46,6 +54,21 @@ class SourceArticle(UUIDPrimaryKeyMixin,
         verbose_name=_("content"),
         help_text=_("The content of the article"),
     )
+    excerpt = models.TextField(
+        blank=True, default="", editable=False,
+        verbose_name=_("excerpt"),
+        help_text=_("The beginning of the text of the content"),
+    )
+    word_count = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name=_("word count"),
+        help_text=_("The number of words of the content"),
+    )
+    reading_time = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name=_("reading time"),
+        help_text=_("The estimated reading time of the content, in minutes"),
+    )
     status = models.IntegerField(
         choices=ArticleStatus.choices, default=ArticleStatus.DRAFT, db_index=True,
         verbose_name=_("status"),
@@ -71,10 +94,91 @@ class SourceArticle(UUIDPrimaryKeyMixin,
         return self.title
 
 
+class ContentBlob(models.Model):
+    """
+    The content of article snapshots and published articles, stored once per content hash
+    (the hash of the title and the content, see articles.services.blobs.hash_content()).
+
+    A blob is either a keyframe storing the whole 'content', or a delta storing a structural
+    'patch' against its 'base' blob ('content' is then null), see ARTICLE_SNAPSHOT_STORAGE.
+    'depth' is the number of deltas since the last keyframe. Read the content with get_content().
+
+    'ref_count' is the number of snapshots, published articles and deltas referencing the blob,
+    maintained by articles.services.blobs. Unreferenced blobs are deleted periodically.
+    """
+    content_hash = models.CharField(
+        primary_key=True, max_length=128, editable=False,
+        verbose_name=_("content hash"),
+        help_text=_("The hash of the title and the content"),
+    )
+    content = models.JSONField(
+        null=True, default=dict, editable=False,
+        verbose_name=_("content"),
+        help_text=_("The content shared by the snapshots and published versions, null for deltas"),
+    )
+    base = models.ForeignKey(
+        'self', on_delete=models.PROTECT, null=True, editable=False, related_name="deltas",
+        verbose_name=_("base"),
+        help_text=_("The blob the patch applies to, null for keyframes"),
+    )
+    patch = models.JSONField(
+        null=True, editable=False,
+        verbose_name=_("patch"),
+        help_text=_("The structural patch against the base blob, null for keyframes"),
+    )
+    depth = models.PositiveSmallIntegerField(
+        default=0, editable=False,
+        verbose_name=_("depth"),
+        help_text=_("The number of deltas since the last keyframe"),
+    )
+    ref_count = models.PositiveIntegerField(
+        default=0, db_index=True, editable=False,
+        verbose_name=_("reference count"),
+        help_text=_("The number of snapshots and published versions referencing the blob"),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, editable=False,
+        verbose_name=_("created at"),
+        help_text=_("The created DateTime of the blob"),
+    )
+
+    class Meta:
+        verbose_name = _("content blob")
+        verbose_name_plural = _("content blobs")
+
+    def __str__(self):
+        return self.content_hash
+
+    def get_content(self):
+        """
+        Return the content, rebuilt from the last keyframe for deltas.
+        The returned document is shared with the cache and must not be mutated.
+        """
+        if self.content is not None:
+            return self.content
+
+        deltas = []
+        blob = self
+        while True:
+            content = blob.content if blob.content is not None else _blob_contents.get(blob.pk)
+            if content is not None:
+                break
+            deltas.append(blob)
+            blob = ContentBlob.objects.only('content_hash', 'content', 'base', 'patch').get(pk=blob.base_id)
+
+        for delta in reversed(deltas):
+            content = apply_patch(content, delta.patch)
+            _blob_contents.set(delta.pk, content)
+
+        return content
+
+
 class PublishedArticle(UUIDPrimaryKeyMixin,
                        TimeStampedMixin,
                        models.Model):
     """
+    The content lives in a ContentBlob, shared with the snapshot it was approved from.
+
     Mixin fields:
     - id
     - created_at
@@ -91,10 +195,35 @@ class PublishedArticle(UUIDPrimaryKeyMixin,
         verbose_name=_("title"),
         help_text=_("The title of the published article"),
     )
-    content = models.JSONField(
-        blank=True, default=dict,
-        verbose_name=_("content"),
-        help_text=_("The content of the published article"),
+    blob = models.ForeignKey(
+        ContentBlob, on_delete=models.PROTECT, related_name="published_articles", db_column="content_hash",
+        verbose_name=_("content blob"),
+        help_text=_("The content of the published article, keyed by its content hash"),
+    )
+    excerpt = models.TextField(
+        blank=True, default="", editable=False,
+        verbose_name=_("excerpt"),
+        help_text=_("The beginning of the text of the content"),
+    )
+    word_count = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name=_("word count"),
+        help_text=_("The number of words of the content"),
+    )
+    reading_time = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name=_("reading time"),
+        help_text=_("The estimated reading time of the content, in minutes"),
+    )
+    plain_text = models.TextField(
+        blank=True, default="", editable=False,
+        verbose_name=_("plain text"),
+        help_text=_("The text of the content, used for search"),
+    )
+    search_vector = SearchVectorField(
+        null=True, editable=False,
+        verbose_name=_("search vector"),
+        help_text=_("The weighted tsvector of the title (A) and the plain text (B)"),
     )
 
     class Meta:
@@ -102,14 +231,26 @@ class PublishedArticle(UUIDPrimaryKeyMixin,
         verbose_name_plural = _("published articles")
 
         ordering = ['-created_at']
+        # PostgreSQL-only indexes, kept out of the model state (see core.migration_operations):
+        # - published_search_vector_gin: GIN on search_vector (migration 0004)
+        # - published_title_trgm: GIN gin_trgm_ops on UPPER(title), for autocomplete (migration 0005)
 
     def __str__(self):
         return f"Published version of article {self.source_article}"
 
+    @property
+    def content_hash(self):
+        return self.blob_id
+
+    @property
+    def content(self):
+        return self.blob.get_content()
+
 
 class ArticleSnapshot(UUIDPrimaryKeyMixin, models.Model):
     """
     Freeze the current version of the article for review and retrospection.
+    The content lives in a ContentBlob, shared with the identical snapshots and published versions.
 
     Mixin fields:
         - id
@@ -131,15 +272,10 @@ class ArticleSnapshot(UUIDPrimaryKeyMixin, models.Model):
         verbose_name=_("title"),
         help_text=_("The title of the article snapshot"),
     )
-    content = models.JSONField(
-        blank=True, default=dict,
-        verbose_name=_("content"),
-        help_text=_("The content of the article snapshot"),
-    )
-    content_hash = models.CharField(
-        max_length=64, blank=True, default="", db_index=True,
-        verbose_name=_("content hash"),
-        help_text=_("The content hash of the article snapshot"),
+    blob = models.ForeignKey(
+        ContentBlob, on_delete=models.PROTECT, related_name="article_snapshots", db_column="content_hash",
+        verbose_name=_("content blob"),
+        help_text=_("The content of the article snapshot, keyed by its content hash"),
     )
     moderation_status = models.IntegerField(
         choices=SnapshotStatus.choices, default=SnapshotStatus.PENDING, db_index=True,
@@ -160,12 +296,20 @@ class ArticleSnapshot(UUIDPrimaryKeyMixin, models.Model):
         indexes = [
             models.Index(fields=['source_article', 'created_at']),
             models.Index(fields=['moderation_status', 'created_at']),
-            models.Index(fields=['source_article', 'content_hash']),
+            models.Index(fields=['source_article', 'blob']),
         ]
 
     def __str__(self):
         return f"Snapshot of article {self.source_article_id}"
 
+    @property
+    def content_hash(self):
+        return self.blob_id
+
+    @property
+    def content(self):
+        return self.blob.get_content()
+
 
 class ArticleEvent(UUIDPrimaryKeyMixin, models.Model):
     """
@@ -6,14 +6,17 @@ from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.request import Request
 
+from core.serializers import FlatRepresentationMixin
 from core.validators import (
     FileTypeValidator, FileSizeValidator
 )
 from core.utils.permissions import is_moderator
 from .models import SourceArticle, PublishedArticle, ArticleSnapshot, ArticleEvent
+from .services.articles import get_last_snapshot_id, get_published_version_id, refresh_reading_stats
 
 import uuid
 import io
+from typing import ClassVar
 from PIL import Image
 from pathlib import Path
 
@@ -33,6 +36,12 @@ class SourceArticleReadSerializer(serializers.ModelSerializer):
     class Meta:
         model = SourceArticle
         fields = '__all__'
+        method_field_sources: ClassVar[dict[str, list[str]]] = {
+            'status_display': ['status'],
+            # Read from annotations, see SourceArticleViewSet.get_queryset()
+            'last_snapshot_id': [],
+            'published_version_id': [],
+        }
         read_only_fields = [
             'id',
             'author',
@@ -57,24 +66,38 @@ class SourceArticleReadSerializer(serializers.ModelSerializer):
         if annotated_value is not None:
             return annotated_value
 
-        last_snapshot_id = (
-            obj.article_snapshots
-            .order_by("-created_at")
-            .values_list("id", flat=True)
-            .first()
-        )
-        return last_snapshot_id
+        return get_last_snapshot_id(obj.id)
 
     def get_published_version_id(self, obj):
         annotated_value = getattr(obj, "published_version_id", None)
         if annotated_value is not None:
             return annotated_value
 
-        return (
-            PublishedArticle.objects
-            .filter(source_article=obj)
-            .values_list("id", flat=True)
-            .first()
+        return get_published_version_id(obj.id)
+
+
+class SourceArticleListSerializer(SourceArticleReadSerializer):
+    """
+    Serializer for source article lists, with the excerpt and reading stats instead of the content.
+    """
+
+    class Meta(SourceArticleReadSerializer.Meta):
+        fields = (
+            'id',
+            'author',
+            'author_username',
+            'title',
+            'excerpt',
+            'word_count',
+            'reading_time',
+            'status',
+            'status_display',
+            'last_moderation_at',
+            'created_at',
+            'updated_at',
+            'is_deleted',
+            'last_snapshot_id',
+            'published_version_id',
         )
 
 
@@ -102,7 +125,18 @@ class SourceArticleWriteSerializer(serializers.ModelSerializer):
         validated_data.setdefault("title", "Untitled")
         validated_data.setdefault("content", {"type": "doc", "content": [{"type": "paragraph"}]})
 
-        return super().create(validated_data)
+        source_article = SourceArticle(**validated_data)
+        refresh_reading_stats(source_article)
+        source_article.save()
+
+        return source_article
+
+    def update(self, instance, validated_data):
+        if 'content' in validated_data:
+            instance.content = validated_data['content']
+            refresh_reading_stats(instance)
+
+        return super().update(instance, validated_data)
 
     def validate_title(self, value):
         if value is not None and value.strip() == "":
@@ -143,14 +177,18 @@ class ImageUploadSerializer(serializers.Serializer):
         }
 
 
-class PublishedArticleSerializer(serializers.ModelSerializer):
+class PublishedArticleSerializer(FlatRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer for published articles. All fields are ready-only.
     """
+    content = serializers.JSONField(source='blob.get_content', read_only=True)
 
     class Meta:
         model = PublishedArticle
-        fields = '__all__'
+        exclude = ('blob', 'plain_text', 'search_vector')
+        method_field_sources: ClassVar[dict[str, list[str]]] = {
+            'content': ['blob.content', 'blob.patch', 'blob.base_id'],
+        }
         read_only_fields = (
             'id',
             'source_article',
@@ -161,16 +199,61 @@ class PublishedArticleSerializer(serializers.ModelSerializer):
         )
 
 
-class ArticleSnapshotSerializer(serializers.ModelSerializer):
+class PublishedArticleListSerializer(FlatRepresentationMixin, serializers.ModelSerializer):
+    """
+    Serializer for published article lists, with the excerpt and reading stats instead of the content.
+    """
+
+    class Meta:
+        model = PublishedArticle
+        fields = (
+            'id', 'source_article', 'title', 'excerpt', 'word_count', 'reading_time', 'created_at', 'updated_at',
+        )
+        read_only_fields = fields
+
+
+class PublishedArticleSearchResultSerializer(FlatRepresentationMixin, serializers.ModelSerializer):
+    """
+    Serializer for published article search results, without the content.
+    'headline' is HTML-escaped text with the matched terms wrapped in <mark>.
+    """
+    rank = serializers.FloatField(read_only=True, allow_null=True)
+    headline = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = PublishedArticle
+        fields = ('id', 'source_article', 'title', 'headline', 'rank', 'created_at', 'updated_at')
+        read_only_fields = fields
+
+
+class ArticleSnapshotSerializer(FlatRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer for article snapshots. All fields are ready-only.
     """
+    content = serializers.JSONField(source='blob.get_content', read_only=True)
+    content_hash = serializers.CharField(source='blob_id', read_only=True)
     moderation_status_display = serializers.SerializerMethodField()
     source_article_id = serializers.SerializerMethodField()
 
     class Meta:
         model = ArticleSnapshot
-        fields = '__all__'
+        fields = (
+            'id',
+            'source_article',
+            'title',
+            'content',
+            'content_hash',
+            'moderation_status',
+            'created_at',
+            'moderation_status_display',
+            'source_article_id',
+        )
+        method_field_sources: ClassVar[dict[str, list[str]]] = {
+            # Deltas are rebuilt from their base blobs, see ContentBlob.get_content()
+            'content': ['blob.content', 'blob.patch', 'blob.base_id'],
+            'moderation_status_display': ['moderation_status'],
+            'source_article_id': ['source_article_id'],
+        }
         read_only_fields = (
             'id',
             'source_article',
@@ -190,7 +273,7 @@ class ArticleSnapshotSerializer(serializers.ModelSerializer):
         return obj.source_article_id
 
 
-class ArticleEventSerializer(serializers.ModelSerializer):
+class ArticleEventSerializer(FlatRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer for article moderation events. All fields are ready-only except annotation.
     """
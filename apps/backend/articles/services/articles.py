@@ -2,16 +2,71 @@ from django.db import transaction
 from django.utils import timezone
 
 from datetime import timedelta
-import json
-import hashlib
 
 from articles.models import SourceArticle, PublishedArticle, ArticleSnapshot, ArticleEvent
+from articles.tiptap import extract_plain_text, get_reading_stats
 from core.exceptions import ServiceError
+from core.utils.cached_service import cached_service
 from logs.logging import get_logger
+from .blobs import acquire_content_blob, hash_content, release_content_blob, retain_content_blob
+from .payloads import schedule_payload_drop, schedule_payload_warm
+from .search import refresh_search_columns, schedule_title_autocomplete_invalidation, update_search_index
 
 logger = get_logger(__name__)
 
 
+@cached_service(
+    namespace='articles', timeout=3600, negative_timeout=3600,
+    invalidate_on={
+        ArticleSnapshot: lambda snapshot: {'source_article_id': snapshot.source_article_id},
+    },
+)
+def get_last_snapshot_id(source_article_id):
+    """
+    Return the id (as a string) of the most recent snapshot of a source article, or None.
+    """
+    last_snapshot_id = (
+        ArticleSnapshot.objects
+        .filter(source_article_id=source_article_id)
+        .order_by("-created_at")
+        .values_list("id", flat=True)
+        .first()
+    )
+    return None if last_snapshot_id is None else str(last_snapshot_id)
+
+
+@cached_service(
+    namespace='articles', timeout=3600, negative_timeout=3600,
+    invalidate_on={
+        PublishedArticle: lambda published: {'source_article_id': published.source_article_id},
+    },
+)
+def get_published_version_id(source_article_id):
+    """
+    Return the id (as a string) of the published version of a source article, or None.
+    """
+    published_version_id = (
+        PublishedArticle.objects
+        .filter(source_article_id=source_article_id)
+        .values_list("id", flat=True)
+        .first()
+    )
+    return None if published_version_id is None else str(published_version_id)
+
+
+def refresh_reading_stats(article, *, plain_text=None):
+    """
+    Set the excerpt, word count and reading time of a source or published article from its content,
+    so that lists never walk the document trees.
+    Pass 'plain_text' when the text of the content has already been extracted.
+    """
+    if plain_text is None:
+        plain_text = extract_plain_text(article.content)
+
+    for name, value in get_reading_stats(plain_text).items():
+        setattr(article, name, value)
+
+
 def _get_locked_source_article(source_article_id):
     """
     Return a locked SourceArticle for business logic.
@@ -88,22 +143,6 @@ class ArticleWorkflow:
             .first()
         )
 
-    @staticmethod
-    def _hash_and_normalize(title, content):
-        """
-        Make a stable representation of the article and calculate its hash value.
-        It strips the spaces before and after the title and the summary.
-        Return: hash_value
-        """
-        items_to_hash = {
-            'title': title.strip(),
-            'content': content,
-        }
-        items_json = json.dumps(items_to_hash, sort_keys=True)
-        hash_value = hashlib.blake2b(items_json.encode("utf-8")).hexdigest()
-
-        return hash_value
-
     def _get_the_published_article(self):
         """
         Return the published version of the article
@@ -134,23 +173,37 @@ class ArticleWorkflow:
 
     def _create_or_update_published_article(self):
         """
-        Create or update the source article's published version.
+        Create or update the source article's published version,
+        which shares the content blob of the snapshot.
         Return the published_article.
         """
         published_article = self._get_the_published_article()
+        blob = self.article_snapshot.blob
 
         if published_article:
-            published_article.title = self.article_snapshot.title
-            published_article.content = self.article_snapshot.content
-            published_article.save(update_fields=['title', 'content'])
+            if published_article.blob_id != blob.pk:
+                retain_content_blob(blob.pk)
+                release_content_blob(published_article.blob_id)
 
-            return published_article
+            published_article.title = self.article_snapshot.title
+            published_article.blob = blob
+            refresh_search_columns(published_article)
+            refresh_reading_stats(published_article, plain_text=published_article.plain_text)
+            published_article.save(update_fields=[
+                'title', 'blob', 'plain_text', 'excerpt', 'word_count', 'reading_time', 'updated_at',
+            ])
+        else:
+            retain_content_blob(blob.pk)
+            published_article = PublishedArticle(
+                source_article=self.source_article,
+                title=self.article_snapshot.title,
+                blob=blob,
+            )
+            refresh_search_columns(published_article)
+            refresh_reading_stats(published_article, plain_text=published_article.plain_text)
+            published_article.save()
 
-        published_article = PublishedArticle.objects.create(
-            source_article=self.source_article,
-            title=self.article_snapshot.title,
-            content=self.article_snapshot.content,
-        )
+        update_search_index([published_article.id])
 
         return published_article
 
@@ -210,10 +263,7 @@ class ArticleWorkflow:
             error_message="You can only submit an article draft!"
         )
 
-        current_hash = self._hash_and_normalize(
-            self.source_article.title,
-            self.source_article.content
-        )
+        current_hash = hash_content(self.source_article.title, self.source_article.content)
 
         if self.article_snapshot and self.article_snapshot.content_hash == current_hash:
             raise ServiceError(
@@ -221,11 +271,16 @@ class ArticleWorkflow:
                 code='no_change_error'
             )
 
-        new_snapshot = ArticleSnapshot.objects.create(
-            source_article=self.source_article,
+        blob = acquire_content_blob(
             title=self.source_article.title,
             content=self.source_article.content,
             content_hash=current_hash,
+            base_hash=self.article_snapshot.blob_id if self.article_snapshot else None,
+        )
+        new_snapshot = ArticleSnapshot.objects.create(
+            source_article=self.source_article,
+            title=self.source_article.title,
+            blob=blob,
             moderation_status=ArticleSnapshot.SnapshotStatus.PENDING
         )
         self.article_snapshot = new_snapshot
@@ -271,7 +326,9 @@ class ArticleWorkflow:
                 code='no_change_error'
             )
 
-        self._create_or_update_published_article()
+        published_article = self._create_or_update_published_article()
+        schedule_payload_warm(published_article)
+        schedule_title_autocomplete_invalidation()
 
         self.source_article.status = SourceArticle.ArticleStatus.PUBLISHED
         self.source_article.last_moderation_at = timezone.now()
@@ -319,6 +376,11 @@ class ArticleWorkflow:
                 code='no_snapshot_error'
             )
 
+        published_article = self._get_the_published_article()
+        if published_article:
+            schedule_payload_drop(published_article.id)
+            schedule_title_autocomplete_invalidation()
+
         self.source_article.status = SourceArticle.ArticleStatus.UNPUBLISHED
         self.source_article.last_moderation_at = timezone.now()
         self.source_article.save(update_fields=['status', 'last_moderation_at'])
@@ -340,6 +402,8 @@ class ArticleWorkflow:
         published_article = self._get_the_published_article()
 
         if published_article:
+            schedule_payload_drop(published_article.id)
+            schedule_title_autocomplete_invalidation()
             published_article.delete()
 
         self.source_article.is_deleted = True  # Soft delete source article
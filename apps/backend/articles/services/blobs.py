@@ -0,0 +1,126 @@
+import hashlib
+import json
+from collections import Counter
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from articles.models import ArticleSnapshot, ContentBlob, PublishedArticle
+from articles.tiptap import diff_documents
+from logs.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def hash_content(title, content):
+    """
+    Make a stable representation of an article and return its hash.
+    The spaces before and after the title are stripped.
+    """
+    items_to_hash = {
+        'title': title.strip(),
+        'content': content,
+    }
+    items_json = json.dumps(items_to_hash, sort_keys=True)
+
+    return hashlib.blake2b(items_json.encode("utf-8")).hexdigest()
+
+
+def retain_content_blob(content_hash):
+    """
+    Add a reference to an existing blob.
+    Return whether the blob exists.
+    """
+    return ContentBlob.objects.filter(pk=content_hash).update(ref_count=F('ref_count') + 1) == 1
+
+
+def release_content_blob(content_hash):
+    """
+    Remove a reference to a blob. Unreferenced blobs are deleted by collect_unreferenced_content_blobs().
+    """
+    ContentBlob.objects.filter(pk=content_hash, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+
+
+def _make_delta(base_hash, content):
+    """
+    Return the fields of a delta blob against 'base_hash', or None when a keyframe is due
+    or when the patch would not be smaller than the content.
+    """
+    base = ContentBlob.objects.filter(pk=base_hash).first()
+    if base is None or base.depth + 1 >= settings.ARTICLE_SNAPSHOT_KEYFRAME_INTERVAL:
+        return None
+
+    patch = diff_documents(base.get_content(), content)
+    if len(orjson.dumps(patch)) >= len(orjson.dumps(content)):
+        return None
+
+    return {'content': None, 'base': base, 'patch': patch, 'depth': base.depth + 1}
+
+
+def acquire_content_blob(*, title, content, content_hash=None, base_hash=None):
+    """
+    Return the blob of an article's content, creating it on the first reference,
+    with one more reference. 'content_hash' saves hashing again when the caller already did.
+
+    With the "delta" ARTICLE_SNAPSHOT_STORAGE, a new blob is stored as a patch against
+    'base_hash' (the blob of the previous snapshot of the article) when it is worth it.
+    """
+    if content_hash is None:
+        content_hash = hash_content(title, content)
+
+    # Incrementing first locks the row, so a concurrent collection cannot delete it in between
+    if retain_content_blob(content_hash):
+        # Same hash, same content: no need to read it back
+        return ContentBlob.from_db(ContentBlob.objects.db, ['content_hash', 'content'], [content_hash, content])
+
+    defaults = {'content': content}
+    if base_hash is not None and settings.ARTICLE_SNAPSHOT_STORAGE == 'delta':
+        defaults = _make_delta(base_hash, content) or defaults
+
+    blob, created = ContentBlob.objects.get_or_create(
+        content_hash=content_hash, defaults={**defaults, 'ref_count': 1},
+    )
+    if not created:
+        retain_content_blob(content_hash)
+    elif blob.base_id is not None:
+        retain_content_blob(blob.base_id)
+
+    return blob
+
+
+def collect_unreferenced_content_blobs():
+    """
+    Delete the blobs no snapshot, published article or delta references anymore,
+    releasing the bases of the deleted deltas (collected on the next run if unreferenced).
+    Return the number of deleted blobs.
+    """
+    referenced = (
+        Q(article_snapshots__isnull=False) | Q(published_articles__isnull=False) | Q(deltas__isnull=False)
+    )
+    with transaction.atomic():
+        # Locked, so that acquire_content_blob() cannot reference them again until they are gone
+        orphans = dict(
+            ContentBlob.objects.filter(ref_count=0).exclude(referenced)
+            .select_for_update().values_list('pk', 'base_id')
+        )
+        if not orphans:
+            return 0
+
+        deleted, _ = ContentBlob.objects.filter(pk__in=list(orphans)).delete()
+
+        for base_hash, count in Counter(base_hash for base_hash in orphans.values() if base_hash).items():
+            ContentBlob.objects.filter(pk=base_hash).update(ref_count=F('ref_count') - count)
+
+    logger.info(f"Collected {deleted} unreferenced content blobs")
+
+    return deleted
+
+
+@receiver(post_delete, sender=ArticleSnapshot, dispatch_uid='release_snapshot_content_blob')
+@receiver(post_delete, sender=PublishedArticle, dispatch_uid='release_published_content_blob')
+def _release_deleted_content_blob(sender, instance, **kwargs):
+    release_content_blob(instance.blob_id)
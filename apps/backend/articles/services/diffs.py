@@ -0,0 +1,63 @@
+import hashlib
+
+from articles.models import ArticleSnapshot, ContentBlob, PublishedArticle
+from articles.tiptap import diff_trees
+from core.exceptions import ServiceError
+from core.utils.cache import get_or_set_cache
+
+DIFF_NAMESPACE = 'articles'
+DIFF_ENTITY = 'content_diff'
+# Blobs never change under a hash, so neither does their diff
+DIFF_TIMEOUT = 60 * 60 * 24
+
+EMPTY_DOCUMENT = {'type': 'doc', 'content': []}
+
+
+def _get_blob_content(content_hash):
+    if content_hash is None:
+        return EMPTY_DOCUMENT
+    return ContentBlob.objects.only('content_hash', 'content', 'base', 'patch').get(pk=content_hash).get_content()
+
+
+def diff_content_blobs(*, base_hash, content_hash):
+    """
+    Return the diff_trees() changes from the blob 'base_hash' (None: an empty document) to the blob 'content_hash'.
+    Cached by the pair of hashes, the contents are only read on a miss.
+    """
+    # Two full hashes would exceed the key length limit of some backends
+    identifier = hashlib.blake2b(f"{base_hash or ''}:{content_hash}".encode(), digest_size=16).hexdigest()
+
+    return get_or_set_cache(
+        namespace=DIFF_NAMESPACE, entity=DIFF_ENTITY, identifier=identifier,
+        creator=lambda: diff_trees(_get_blob_content(base_hash), _get_blob_content(content_hash)),
+        timeout=DIFF_TIMEOUT,
+    )
+
+
+def diff_snapshot_with_published(snapshot_id):
+    """
+    Return the changes of an article snapshot against the published version of its article,
+    or against an empty document when the article has never been published.
+    """
+    snapshot = ArticleSnapshot.objects.filter(id=snapshot_id).values('source_article_id', 'title', 'blob_id').first()
+    if snapshot is None:
+        raise ServiceError(
+            detail="Article snapshot not found", code='article_snapshot_not_found'
+        )
+
+    published = (
+        PublishedArticle.objects
+        .filter(source_article_id=snapshot['source_article_id'])
+        .values('id', 'title', 'blob_id')
+        .first()
+    )
+    base_hash = None if published is None else published['blob_id']
+
+    return {
+        'published_article_id': None if published is None else published['id'],
+        'base_content_hash': base_hash,
+        'content_hash': snapshot['blob_id'],
+        'old_title': None if published is None else published['title'],
+        'new_title': snapshot['title'],
+        'changes': diff_content_blobs(base_hash=base_hash, content_hash=snapshot['blob_id']),
+    }
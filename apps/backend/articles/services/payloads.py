@@ -0,0 +1,87 @@
+import orjson
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from articles.models import PublishedArticle, SourceArticle
+from core.renderers import ORJSON_OPTIONS, encode_default
+from core.utils.cache import add_cache, delete_cache, get_cache, set_cache
+from logs.logging import get_logger
+
+logger = get_logger(__name__)
+
+PAYLOAD_NAMESPACE = 'articles'
+PAYLOAD_ENTITY = 'published_payload'
+PAYLOAD_TIMEOUT = 60 * 60 * 24
+
+
+def render_published_article(published_article):
+    """
+    Return the serialized published article as a JSON string.
+    """
+    # Imported here, as the serializers module imports the article services
+    from articles.serializers import PublishedArticleSerializer
+
+    data = PublishedArticleSerializer(published_article).data
+    return orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS).decode()
+
+
+def get_published_article_payload(published_article_id):
+    """
+    Return (updated_at, rendered JSON string) of a published article, or None if it is not cached.
+    """
+    cached = get_cache(namespace=PAYLOAD_NAMESPACE, entity=PAYLOAD_ENTITY, identifier=published_article_id)
+    if cached is None:
+        return None
+
+    return parse_datetime(cached['updated_at']), cached['data']
+
+
+def warm_published_article_payload(published_article, *, overwrite=True):
+    """
+    Render a published article and cache it under its id, stamped with its updated_at.
+    Without 'overwrite' a payload already cached is kept, so a read that loaded the article
+    before an approval cannot replace the payload that approval cached.
+    Return the rendered JSON string.
+    """
+    rendered = render_published_article(published_article)
+    cache_payload = set_cache if overwrite else add_cache
+    cache_payload(
+        namespace=PAYLOAD_NAMESPACE, entity=PAYLOAD_ENTITY, identifier=published_article.id,
+        value={'updated_at': published_article.updated_at.isoformat(), 'data': rendered},
+        timeout=PAYLOAD_TIMEOUT,
+    )
+    return rendered
+
+
+def drop_published_article_payload(published_article_id):
+    delete_cache(namespace=PAYLOAD_NAMESPACE, entity=PAYLOAD_ENTITY, identifier=published_article_id)
+
+
+def is_payload_cacheable(published_article):
+    """
+    Only articles that are currently published are cached, see unpublish().
+    """
+    return published_article.source_article.status == SourceArticle.ArticleStatus.PUBLISHED
+
+
+def schedule_payload_warm(published_article: PublishedArticle):
+    """
+    Warm the payload once the transaction commits, so readers never get uncommitted content.
+    """
+    def warm():
+        try:
+            warm_published_article_payload(published_article)
+        except Exception:
+            # The next read renders it from the database
+            logger.exception("Published article payload warm-up failed")
+
+    transaction.on_commit(warm)
+
+
+def schedule_payload_drop(published_article_id):
+    """
+    Drop the payload now and again after commit, so a read racing the transaction
+    cannot leave the old payload behind.
+    """
+    drop_published_article_payload(published_article_id)
+    transaction.on_commit(lambda: drop_published_article_payload(published_article_id))
@@ -0,0 +1,147 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connections, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.utils.html import escape
+
+from articles.models import PublishedArticle, SourceArticle
+from articles.tiptap import extract_plain_text
+from core.utils.autocomplete import autocomplete
+from core.utils.cache import invalidate_cache_namespace
+
+# Delimiters of the highlighted terms returned by ts_headline,
+# replaced by <mark> once the rest of the text is escaped
+_HIGHLIGHT_START = "\x02"
+_HIGHLIGHT_STOP = "\x03"
+
+# 'articles' is listed in CACHE_VERSIONED_NAMESPACES, so all the cached suggestions
+# are dropped at once when the set of published titles changes
+AUTOCOMPLETE_NAMESPACE = 'articles'
+AUTOCOMPLETE_ENTITY = 'title_autocomplete'
+
+HEADLINE_OPTIONS = {
+    'max_words': 35,
+    'min_words': 15,
+    'max_fragments': 2,
+    'fragment_delimiter': " … ",
+}
+
+
+def is_full_text_search_supported(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def build_search_vector():
+    """
+    Return the weighted search vector expression: title (A) and plain text (B).
+    """
+    config = settings.ARTICLE_SEARCH_CONFIG
+    return (
+        SearchVector('title', weight='A', config=config)
+        + SearchVector('plain_text', weight='B', config=config)
+    )
+
+
+def update_search_index(published_article_ids):
+    """
+    Recompute the search vectors of the given published articles from their stored columns.
+    Does nothing outside PostgreSQL.
+    """
+    if is_full_text_search_supported():
+        PublishedArticle.objects.filter(pk__in=published_article_ids).update(search_vector=build_search_vector())
+
+
+def refresh_search_columns(published_article):
+    """
+    Set the plain text of a published article from its content.
+    Call update_search_index() once it has been saved.
+    """
+    published_article.plain_text = extract_plain_text(published_article.content)
+
+
+def search_published_articles(query):
+    """
+    Return the published articles matching a web-search style query ("quoted phrases", -exclusions, or),
+    annotated with 'rank' and ordered by it.
+    Outside PostgreSQL, it falls back to substring matching without ranking.
+    """
+    queryset = PublishedArticle.objects.filter(
+        source_article__status=SourceArticle.ArticleStatus.PUBLISHED,
+    ).defer('plain_text', 'search_vector')
+
+    if not is_full_text_search_supported():
+        return queryset.filter(Q(title__icontains=query) | Q(plain_text__icontains=query)).annotate(
+            rank=Value(None, output_field=FloatField())
+        ).order_by('-created_at', '-id')
+
+    search_query = SearchQuery(query, search_type='websearch', config=settings.ARTICLE_SEARCH_CONFIG)
+    return queryset.filter(search_vector=search_query).annotate(
+        rank=SearchRank(F('search_vector'), search_query),
+    ).order_by('-rank', '-created_at', '-id')
+
+
+def _highlight(text):
+    return escape(text).replace(_HIGHLIGHT_START, "<mark>").replace(_HIGHLIGHT_STOP, "</mark>")
+
+
+def _fallback_headline(plain_text, query, *, width=120):
+    position = plain_text.lower().find(query.lower())
+    if position < 0:
+        return escape(plain_text[:width * 2])
+
+    start = max(0, position - width)
+    end = position + len(query)
+    return (
+        ("… " if start else "")
+        + escape(plain_text[start:position])
+        + "<mark>" + escape(plain_text[position:end]) + "</mark>"
+        + escape(plain_text[end:end + width])
+    )
+
+
+def get_search_headlines(published_article_ids, query):
+    """
+    Return the highlighted snippets (HTML-escaped, terms wrapped in <mark>) by published article id.
+    Only run it on the page being returned, ts_headline is costly.
+    """
+    queryset = PublishedArticle.objects.filter(pk__in=published_article_ids)
+
+    if not is_full_text_search_supported():
+        return {pk: _fallback_headline(text, query) for pk, text in queryset.values_list('pk', 'plain_text')}
+
+    search_query = SearchQuery(query, search_type='websearch', config=settings.ARTICLE_SEARCH_CONFIG)
+    headlines = queryset.annotate(
+        headline=SearchHeadline(
+            'plain_text', search_query, config=settings.ARTICLE_SEARCH_CONFIG,
+            start_sel=_HIGHLIGHT_START, stop_sel=_HIGHLIGHT_STOP, **HEADLINE_OPTIONS,
+        ),
+    ).values_list('pk', 'headline')
+
+    return {pk: _highlight(headline) for pk, headline in headlines}
+
+
+def autocomplete_published_titles(query, *, limit):
+    """
+    Return up to 'limit' published articles whose title starts with or resembles 'query',
+    as {'id', 'title'} dicts. Results are cached briefly per (query, limit).
+    """
+    return autocomplete(
+        queryset=PublishedArticle.objects.filter(source_article__status=SourceArticle.ArticleStatus.PUBLISHED),
+        field='title', query=query, limit=limit,
+        namespace=AUTOCOMPLETE_NAMESPACE, entity=AUTOCOMPLETE_ENTITY,
+    )
+
+
+def schedule_title_autocomplete_invalidation():
+    """
+    Invalidate the cached title suggestions once the transaction commits,
+    so suggestions cached in between never outlive the change.
+    """
+    transaction.on_commit(
+        lambda: invalidate_cache_namespace(namespace=AUTOCOMPLETE_NAMESPACE, entity=AUTOCOMPLETE_ENTITY)
+    )
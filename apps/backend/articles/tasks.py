@@ -6,6 +6,7 @@ from pathlib import Path
 from urllib.parse import urlparse
 
 from articles.models import SourceArticle
+from articles.services.blobs import collect_unreferenced_content_blobs
 
 
 def _extract_media_relpaths_from_tiptap(doc):
@@ -122,3 +123,11 @@ def cleanup_unreferenced_article_images(grace_days=1):
         "skipped_recent": skipped_recent,
         "grace_days": grace_days,
     }
+
+
+@task
+def collect_content_blobs():
+    """
+    Delete the content blobs no snapshot or published article references anymore.
+    """
+    return {"deleted": collect_unreferenced_content_blobs()}
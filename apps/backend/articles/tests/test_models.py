@@ -1,10 +1,13 @@
 from articles.models import (
     ArticleEvent,
-    ArticleSnapshot,
-    PublishedArticle,
     SourceArticle,
 )
-from core.tests.factories import create_source_article, create_user
+from core.tests.factories import (
+    create_article_snapshot,
+    create_published_article,
+    create_source_article,
+    create_user,
+)
 from core.tests.testcases import BaseTestCase
 
 
@@ -27,33 +30,19 @@ class ArticleModelTests(BaseTestCase):
 
     def test_published_article_string_representation_references_source_article(self):
         article = create_source_article(author=self.author, title="Ship log")
-        published = PublishedArticle.objects.create(
-            source_article=article,
-            title=article.title,
-            content=article.content,
-        )
+        published = create_published_article(article)
 
         self.assertEqual(str(published), "Published version of article Ship log")
 
     def test_article_snapshot_string_representation_uses_source_article_id(self):
         article = create_source_article(author=self.author)
-        snapshot = ArticleSnapshot.objects.create(
-            source_article=article,
-            title=article.title,
-            content=article.content,
-            content_hash="hash-value",
-        )
+        snapshot = create_article_snapshot(article)
 
         self.assertEqual(str(snapshot), f"Snapshot of article {article.id}")
 
     def test_article_event_string_representation_includes_operation_actor_and_article(self):
         article = create_source_article(author=self.author)
-        snapshot = ArticleSnapshot.objects.create(
-            source_article=article,
-            title=article.title,
-            content=article.content,
-            content_hash="hash-value",
-        )
+        snapshot = create_article_snapshot(article)
         event = ArticleEvent.objects.create(
             source_article=article,
             article_snapshot=snapshot,
@@ -1,21 +1,37 @@
+from django.core.management import call_command
+from django.test import override_settings
 from django.utils import timezone
 
 from datetime import timedelta
+import io
+import json
 
 from articles.models import (
     ArticleEvent,
     ArticleSnapshot,
+    ContentBlob,
     PublishedArticle,
     SourceArticle,
 )
 from articles.services.articles import (
     approve,
+    get_last_snapshot_id,
+    get_published_version_id,
     reject,
     soft_delete,
     submit,
     unpublish,
     withdraw,
 )
+from articles.services.blobs import collect_unreferenced_content_blobs
+from articles.services.diffs import diff_snapshot_with_published
+from articles.services.payloads import (
+    get_published_article_payload,
+    render_published_article,
+    warm_published_article_payload,
+)
+from articles.services.search import get_search_headlines, search_published_articles
+from articles.tiptap import apply_patch, diff_documents, diff_trees, extract_plain_text, get_reading_stats
 from core.exceptions import ServiceError
 from core.tests.factories import (
     create_article_snapshot,
@@ -137,10 +153,12 @@ class ArticleServiceTests(BaseTestCase):
             title="Old title",
             content={"blocks": [{"type": "paragraph", "text": "Old"}]},
         )
+        previous_updated_at = published.updated_at
 
         approve(source_article_id=article.id, actor=self.moderator)
 
         published.refresh_from_db()
+        self.assertGreater(published.updated_at, previous_updated_at)
         self.assertEqual(PublishedArticle.objects.filter(source_article=article).count(), 1)
         self.assertEqual(published.id, PublishedArticle.objects.get(source_article=article).id)
         self.assertEqual(published.title, snapshot.title)
@@ -218,3 +236,340 @@ class ArticleServiceTests(BaseTestCase):
         self.assert_service_error(exc, code="state_transition_error")
         article.refresh_from_db()
         self.assertFalse(article.is_deleted)
+
+
+class ArticleLookupTests(BaseTestCase):
+    def test_published_version_id_is_refreshed_after_approval(self):
+        article = create_source_article(status=SourceArticle.ArticleStatus.PENDING)
+        create_article_snapshot(article)
+        self.assertIsNone(get_published_version_id(article.id))
+
+        approve(source_article_id=article.id, actor=create_moderator())
+
+        self.assertEqual(
+            get_published_version_id(article.id),
+            str(PublishedArticle.objects.get(source_article=article).id),
+        )
+
+    def test_last_snapshot_id_is_refreshed_after_submission(self):
+        article = create_source_article()
+        self.assertIsNone(get_last_snapshot_id(article.id))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_last_snapshot_id(article.id))
+
+        submit(source_article_id=article.id, actor=article.author)
+
+        self.assertEqual(
+            get_last_snapshot_id(article.id),
+            str(ArticleSnapshot.objects.get(source_article=article).id),
+        )
+
+
+class PublishedArticlePayloadTests(BaseTestCase):
+    def setUp(self):
+        self.moderator = create_moderator()
+        self.article = create_source_article(status=SourceArticle.ArticleStatus.PENDING)
+        create_article_snapshot(self.article)
+
+    def approve(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            approve(source_article_id=self.article.id, actor=self.moderator)
+        return PublishedArticle.objects.get(source_article=self.article)
+
+    def test_approve_warms_the_rendered_payload(self):
+        published = self.approve()
+
+        updated_at, rendered = get_published_article_payload(published.id)
+
+        self.assertEqual(updated_at, published.updated_at)
+        self.assertEqual(json.loads(rendered), json.loads(render_published_article(published)))
+        self.assertEqual(json.loads(rendered)["title"], published.title)
+
+    def test_warming_without_overwrite_keeps_the_cached_payload(self):
+        published = self.approve()
+        stale = PublishedArticle.objects.get(pk=published.pk)
+        stale.title = "Loaded before the approval"
+        stale.updated_at -= timedelta(minutes=1)
+
+        warm_published_article_payload(stale, overwrite=False)
+
+        updated_at, rendered = get_published_article_payload(published.id)
+        self.assertEqual(updated_at, published.updated_at)
+        self.assertEqual(json.loads(rendered)["title"], published.title)
+
+    def test_unpublish_drops_the_payload(self):
+        published = self.approve()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            unpublish(source_article_id=self.article.id, actor=self.moderator)
+
+        self.assertIsNone(get_published_article_payload(published.id))
+
+    def test_soft_delete_drops_the_payload(self):
+        published = self.approve()
+        SourceArticle.objects.filter(pk=self.article.pk).update(status=SourceArticle.ArticleStatus.DRAFT)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            soft_delete(source_article_id=self.article.id, actor=self.article.author)
+
+        self.assertIsNone(get_published_article_payload(published.id))
+
+
+class PublishedArticleSearchTests(BaseTestCase):
+    def test_extract_plain_text_keeps_one_line_per_block(self):
+        doc = {
+            "type": "doc",
+            "content": [
+                {"type": "heading", "content": [{"type": "text", "text": "Redstone basics"}]},
+                {"type": "paragraph", "content": [
+                    {"type": "text", "text": "Build a "},
+                    {"type": "text", "marks": [{"type": "bold"}], "text": "clock"},
+                    {"type": "hardBreak"},
+                    {"type": "text", "text": "today."},
+                ]},
+                {"type": "image", "attrs": {"src": "/media/a.png"}},
+                {"type": "bulletList", "content": [
+                    {"type": "listItem", "content": [
+                        {"type": "paragraph", "content": [{"type": "text", "text": "Repeater"}]},
+                    ]},
+                ]},
+            ],
+        }
+
+        self.assertEqual(extract_plain_text(doc), "Redstone basics\nBuild a clock today.\nRepeater")
+
+    def test_approve_stores_the_plain_text(self):
+        article = create_source_article(
+            status=SourceArticle.ArticleStatus.PENDING,
+            content={"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Hi"}]}]},
+        )
+        create_article_snapshot(article)
+
+        approve(source_article_id=article.id, actor=create_moderator())
+
+        self.assertEqual(PublishedArticle.objects.get(source_article=article).plain_text, "Hi")
+
+    def test_search_matches_published_articles_only(self):
+        published = create_source_article(status=SourceArticle.ArticleStatus.PUBLISHED, title="Nether portal")
+        unpublished = create_source_article(status=SourceArticle.ArticleStatus.UNPUBLISHED, title="Nether hub")
+        for article in (published, unpublished):
+            create_published_article(article)
+
+        results = list(search_published_articles("nether"))
+
+        self.assertEqual([result.source_article_id for result in results], [published.id])
+
+    def test_headlines_are_escaped_and_highlighted(self):
+        article = create_source_article(status=SourceArticle.ArticleStatus.PUBLISHED)
+        published = create_published_article(article, plain_text="Use <b>the</b> nether portal")
+
+        headlines = get_search_headlines([published.id], "nether")
+
+        self.assertEqual(headlines[published.id], "Use &lt;b&gt;the&lt;/b&gt; <mark>nether</mark> portal")
+
+    def test_rebuild_command_refreshes_the_plain_text(self):
+        article = create_source_article(status=SourceArticle.ArticleStatus.PUBLISHED)
+        published = create_published_article(
+            article,
+            content={
+                "type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Rebuilt"}]}],
+            },
+        )
+
+        call_command("rebuild_article_search", stdout=io.StringIO())
+
+        published.refresh_from_db()
+        self.assertEqual(published.plain_text, "Rebuilt")
+
+
+class ReadingStatsTests(BaseTestCase):
+    def test_reading_stats_count_words_and_cut_the_excerpt_at_a_word(self):
+        stats = get_reading_stats("Redstone basics\n" + "clock " * 300 + "末影龙")
+
+        self.assertEqual(stats["word_count"], 305)
+        self.assertEqual(stats["reading_time"], 2)
+        self.assertTrue(stats["excerpt"].startswith("Redstone basics clock clock"))
+        self.assertTrue(stats["excerpt"].endswith("clock…"))
+        self.assertLessEqual(len(stats["excerpt"]), 201)
+
+    def test_empty_text_has_no_reading_time(self):
+        self.assertEqual(get_reading_stats(""), {"excerpt": "", "word_count": 0, "reading_time": 0})
+
+    def test_approve_stores_the_reading_stats(self):
+        article = create_source_article(
+            status=SourceArticle.ArticleStatus.PENDING,
+            content={
+                "type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Hi there"}]}],
+            },
+        )
+        create_article_snapshot(article)
+
+        approve(source_article_id=article.id, actor=create_moderator())
+
+        published = PublishedArticle.objects.get(source_article=article)
+        self.assertEqual((published.excerpt, published.word_count, published.reading_time), ("Hi there", 2, 1))
+
+
+class ContentBlobTests(BaseTestCase):
+    def setUp(self):
+        self.moderator = create_moderator()
+        self.content = {"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Hi"}]}]}
+
+    def _submit(self, article):
+        submit(source_article_id=article.id, actor=article.author)
+        return ArticleSnapshot.objects.filter(source_article=article).latest("created_at")
+
+    def test_identical_submissions_share_one_blob(self):
+        first = self._submit(create_source_article(title="Same title", content=self.content))
+        second = self._submit(create_source_article(title="Same title", content=self.content))
+
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual(ContentBlob.objects.get().ref_count, 2)
+        self.assertEqual(second.content, self.content)
+
+    def test_approve_references_the_snapshot_blob(self):
+        article = create_source_article(title="Same title", content=self.content)
+        snapshot = self._submit(article)
+
+        approve(source_article_id=article.id, actor=self.moderator)
+
+        published = PublishedArticle.objects.get(source_article=article)
+        self.assertEqual(published.content_hash, snapshot.content_hash)
+        self.assertEqual(ContentBlob.objects.get().ref_count, 2)
+
+    def test_republishing_moves_the_reference_to_the_new_blob(self):
+        article = create_source_article(title="Same title", content=self.content)
+        old_snapshot = self._submit(article)
+        approve(source_article_id=article.id, actor=self.moderator)
+
+        SourceArticle.objects.filter(id=article.id).update(
+            status=SourceArticle.ArticleStatus.DRAFT, last_moderation_at=None, content={"type": "doc"},
+        )
+        new_snapshot = self._submit(article)
+        approve(source_article_id=article.id, actor=self.moderator)
+
+        self.assertEqual(ContentBlob.objects.get(pk=old_snapshot.blob_id).ref_count, 1)
+        self.assertEqual(ContentBlob.objects.get(pk=new_snapshot.blob_id).ref_count, 2)
+
+    def test_unreferenced_blobs_are_collected(self):
+        kept = self._submit(create_source_article(title="Kept title", content=self.content))
+        dropped = self._submit(create_source_article(title="Dropped title", content=self.content))
+
+        dropped.delete()
+
+        self.assertEqual(ContentBlob.objects.get(pk=dropped.blob_id).ref_count, 0)
+        self.assertEqual(collect_unreferenced_content_blobs(), 1)
+        self.assertEqual(list(ContentBlob.objects.values_list("pk", flat=True)), [kept.blob_id])
+
+
+def _make_document(texts):
+    return {
+        "type": "doc",
+        "content": [{"type": "paragraph", "content": [{"type": "text", "text": text}]} for text in texts],
+    }
+
+
+@override_settings(ARTICLE_SNAPSHOT_STORAGE="delta", ARTICLE_SNAPSHOT_KEYFRAME_INTERVAL=3)
+class ContentBlobDeltaTests(BaseTestCase):
+    def setUp(self):
+        self.texts = [f"Paragraph {index} about redstone clocks and hoppers" for index in range(20)]
+        self.article = create_source_article(title="Delta title", content=_make_document(self.texts))
+
+    def _resubmit(self, index):
+        self.texts[index] = f"Rewritten paragraph {index}"
+        SourceArticle.objects.filter(id=self.article.id).update(
+            status=SourceArticle.ArticleStatus.DRAFT, content=_make_document(self.texts),
+        )
+        submit(source_article_id=self.article.id, actor=self.article.author)
+        return ArticleSnapshot.objects.filter(source_article=self.article).latest("created_at")
+
+    def test_diff_and_patch_round_trip(self):
+        old = _make_document(["a", "b", "c"])
+        new = _make_document(["a", "B", "c", "d"])
+        new["attrs"] = {"lang": "en"}
+
+        self.assertEqual(apply_patch(old, diff_documents(old, new)), new)
+        self.assertEqual(apply_patch(new, diff_documents(new, old)), old)
+
+    def test_children_that_are_not_nodes_are_replaced(self):
+        old = _make_document(["a", "b", "c"])
+        new = _make_document(["a", "b", "c"])
+        old["content"][1] = "b"
+        new["content"][2] = ["c"]
+
+        self.assertEqual(apply_patch(old, diff_documents(old, new)), new)
+        self.assertEqual(apply_patch(new, diff_documents(new, old)), old)
+
+    def test_resubmission_is_stored_as_a_delta_of_the_previous_snapshot(self):
+        first = self._resubmit(0)
+        second = self._resubmit(1)
+
+        blob = ContentBlob.objects.get(pk=second.blob_id)
+        self.assertIsNone(blob.content)
+        self.assertEqual((blob.base_id, blob.depth), (first.blob_id, 1))
+        self.assertEqual(ContentBlob.objects.get(pk=first.blob_id).ref_count, 2)
+        self.assertEqual(ArticleSnapshot.objects.get(pk=second.pk).content, _make_document(self.texts))
+
+    def test_keyframe_is_stored_every_interval(self):
+        snapshots = [self._resubmit(index) for index in range(4)]
+
+        depths = [ContentBlob.objects.get(pk=snapshot.blob_id).depth for snapshot in snapshots]
+        self.assertEqual(depths, [0, 1, 2, 0])
+        self.assertEqual(ContentBlob.objects.get(pk=snapshots[3].blob_id).content, _make_document(self.texts))
+
+    def test_collecting_a_delta_releases_its_base(self):
+        first = self._resubmit(0)
+        second = self._resubmit(1)
+
+        first.delete()
+        self.assertEqual(collect_unreferenced_content_blobs(), 0)
+
+        second.delete()
+        self.assertEqual(collect_unreferenced_content_blobs(), 1)
+        self.assertEqual(ContentBlob.objects.get(pk=first.blob_id).ref_count, 0)
+        self.assertEqual(collect_unreferenced_content_blobs(), 1)
+        self.assertFalse(ContentBlob.objects.exists())
+
+
+class ContentDiffTests(BaseTestCase):
+    def test_identical_documents_have_no_changes(self):
+        document = _make_document(["a", "b"])
+
+        self.assertEqual(diff_trees(document, json.loads(json.dumps(document))), [])
+
+    def test_changes_are_reported_at_their_paths(self):
+        old = _make_document(["x", "a", "b", "c"])
+        new = _make_document(["a", "b", "c!", "d"])
+        new["content"][1]["attrs"] = {"textAlign": "center"}
+
+        self.assertEqual(diff_trees(old, new), [
+            {"op": "delete", "old_path": [0], "old": old["content"][0]},
+            {"op": "update", "old_path": [2], "new_path": [1],
+             "old": {"type": "paragraph"}, "new": {"type": "paragraph", "attrs": {"textAlign": "center"}}},
+            {"op": "replace", "old_path": [3, 0], "new_path": [2, 0],
+             "old": {"type": "text", "text": "c"}, "new": {"type": "text", "text": "c!"}},
+            {"op": "insert", "new_path": [3], "new": new["content"][3]},
+        ])
+
+    def test_moved_blocks_are_matched_by_their_digests(self):
+        old = _make_document(["a", "b", "c", "d", "e"])
+        new = _make_document(["a", "d", "b", "c", "e"])
+
+        self.assertEqual(diff_trees(old, new), [
+            {"op": "insert", "new_path": [1], "new": old["content"][3]},
+            {"op": "delete", "old_path": [3], "old": old["content"][3]},
+        ])
+
+    def test_unpublished_snapshots_are_diffed_against_an_empty_document(self):
+        article = create_source_article(content=_make_document(["a"]))
+        snapshot = create_article_snapshot(article)
+
+        diff = diff_snapshot_with_published(snapshot.id)
+
+        self.assertIsNone(diff["base_content_hash"])
+        self.assertEqual(diff["changes"], [{"op": "insert", "new_path": [0], "new": article.content["content"][0]}])
+
+    def test_unknown_snapshot_raises(self):
+        with self.assertRaises(ServiceError):
+            diff_snapshot_with_published(create_source_article().id)
@@ -1,7 +1,17 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 
+import json
+from unittest.mock import patch
+
+from articles.services.articles import approve, submit
+from articles.services.payloads import get_published_article_payload
+from articles.views import PublishedArticleViewSet
 from core.tests.factories import (
     create_article_snapshot,
     create_moderator,
@@ -44,6 +54,30 @@ class ArticleViewTests(BaseAPITestCase):
         self.assert_uuid_equal(response.data["data"]["author"], self.author.id)
         self.assertEqual(SourceArticle.objects.count(), 1)
 
+    def test_source_article_reading_stats_follow_the_content(self):
+        self.authenticate(self.author)
+        response = self.post_json(
+            reverse("source_article-list"),
+            {"title": "Draft title", "content": {"type": "doc", "content": [{"type": "paragraph"}]}},
+        )
+        article = SourceArticle.objects.get(id=response.data["data"]["id"])
+        self.assertEqual(article.word_count, 0)
+
+        response = self.patch_json(
+            reverse("source_article-detail", args=[article.id]),
+            {"content": {"type": "doc", "content": [
+                {"type": "paragraph", "content": [{"type": "text", "text": "Three short words"}]},
+            ]}},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.get_json(reverse("source_article-list"))
+        result = response.data["data"]["results"][0]
+        self.assertNotIn("content", result)
+        self.assertEqual(
+            (result["excerpt"], result["word_count"], result["reading_time"]), ("Three short words", 3, 1),
+        )
+
     def test_source_article_list_only_returns_articles_owned_by_authenticated_author(self):
         own_article = create_source_article(author=self.author, title="Mine")
         other_article = create_source_article(
@@ -156,3 +190,235 @@ class ArticleViewTests(BaseAPITestCase):
         )
         self.assertEqual(len(response.data["data"]), 1)
         self.assert_uuid_equal(response.data["data"][0]["id"], pending_snapshot.id)
+
+    def test_pending_snapshots_endpoint_reads_the_blobs_in_the_same_query(self):
+        for _ in range(3):
+            create_article_snapshot(create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PENDING))
+
+        self.authenticate(self.moderator)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_json(reverse("article_snapshot-pending-ones"))
+
+        self.assertEqual(len(response.data["data"]), 3)
+        self.assertEqual(sum("articles_contentblob" in query["sql"] for query in queries), 1)
+
+    def test_snapshot_list_pages_by_number_unless_a_cursor_is_given(self):
+        create_article_snapshot(create_source_article(author=self.author))
+        self.authenticate(self.moderator)
+
+        response = self.get_json(reverse("article_snapshot-list"))
+        self.assertEqual(response.data["data"]["count"], 1)
+
+        response = self.get_json(reverse("article_snapshot-list"), {"cursor": ""})
+        self.assertEqual(len(response.data["data"]["results"]), 1)
+        self.assertNotIn("count", response.data["data"])
+
+        response = self.get_json(reverse("article_snapshot-list"), {"cursor": "eyJ2IjpbNSw2XSwiciI6ZmFsc2V9"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_snapshot_diff_returns_the_changed_nodes_against_the_published_version(self):
+        def document(*texts):
+            return {
+                "type": "doc",
+                "content": [{"type": "paragraph", "content": [{"type": "text", "text": text}]} for text in texts],
+            }
+
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PENDING)
+        create_published_article(article, content=document("Intro", "Body"))
+        snapshot = create_article_snapshot(article, title="New title", content=document("Intro", "Body!", "Outro"))
+
+        self.authenticate(self.moderator)
+        url = reverse("article_snapshot-diff", kwargs={"pk": snapshot.id})
+        response = self.get_json(url)
+
+        self.assert_success_response(response, status_code=status.HTTP_200_OK, code="diffed")
+        data = response.data["data"]
+        self.assertEqual(data["content_hash"], snapshot.blob_id)
+        self.assertEqual((data["old_title"], data["new_title"]), (article.title, "New title"))
+        self.assertEqual(
+            [(change["op"], change.get("new_path")) for change in data["changes"]],
+            [("replace", [1, 0]), ("insert", [2])],
+        )
+
+        # Cached by the pair of content hashes: the contents are not read again
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_json(url).data["data"], data)
+        self.assertFalse(any("articles_contentblob" in query["sql"] for query in queries))
+
+    def test_snapshot_diff_of_a_malformed_id_is_not_found(self):
+        self.authenticate(self.moderator)
+        response = self.get_json(reverse("article_snapshot-diff", kwargs={"pk": "not-a-uuid"}))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_snapshot_diff_is_for_moderators_only(self):
+        snapshot = create_article_snapshot(create_source_article(author=self.author))
+
+        self.authenticate(self.author)
+        response = self.get_json(reverse("article_snapshot-diff", kwargs={"pk": snapshot.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_article_events_can_be_streamed_as_ndjson(self):
+        article = create_source_article(author=self.author)
+        submit(source_article_id=article.id, actor=self.author)
+        create_source_article(author=self.other_author)
+
+        self.authenticate(self.author)
+        response = self.client.get(reverse("article_event-list"), {"stream": "ndjson"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 1)
+        event = json.loads(lines[0])
+        self.assert_uuid_equal(event["source_article"], article.id)
+        self.assertEqual(event["event_type"], ArticleEvent.EventType.SUBMIT)
+
+    def test_published_article_detail_is_served_from_the_cached_payload(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PENDING)
+        create_article_snapshot(article)
+        with self.captureOnCommitCallbacks(execute=True):
+            approve(source_article_id=article.id, actor=self.moderator)
+        published = PublishedArticle.objects.get(source_article=article)
+
+        self.authenticate(self.author)
+        url = reverse("published_article-detail", args=[published.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = json.loads(response.content)
+        self.assert_uuid_equal(body["data"]["id"], published.id)
+        self.assertEqual(body["data"]["title"], published.title)
+        # Only the primary key lookup of the access check, no content read
+        article_queries = [query["sql"] for query in queries if "articles_" in query["sql"]]
+        self.assertEqual(len(article_queries), 1)
+        self.assertNotIn("content", article_queries[0])
+
+        response = self.client.get(url, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_payload_of_an_older_version_is_a_miss(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PENDING)
+        create_article_snapshot(article)
+        with self.captureOnCommitCallbacks(execute=True):
+            approve(source_article_id=article.id, actor=self.moderator)
+        published = PublishedArticle.objects.get(source_article=article)
+        # Updated without the payload being replaced
+        PublishedArticle.objects.filter(pk=published.pk).update(title="Renamed", updated_at=timezone.now())
+        published.refresh_from_db()
+
+        self.authenticate(self.author)
+        response = self.client.get(reverse("published_article-detail", args=[published.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["data"]["title"], "Renamed")
+        self.assertEqual(get_published_article_payload(published.id)[0], published.updated_at)
+
+    def test_cached_published_article_detail_still_checks_the_queryset(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PENDING)
+        create_article_snapshot(article)
+        with self.captureOnCommitCallbacks(execute=True):
+            approve(source_article_id=article.id, actor=self.moderator)
+        published = PublishedArticle.objects.get(source_article=article)
+
+        self.authenticate(self.author)
+        with patch.object(PublishedArticleViewSet, "get_queryset", return_value=PublishedArticle.objects.none()):
+            response = self.client.get(reverse("published_article-detail", args=[published.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cached_published_article_detail_renders_with_other_renderers(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PENDING)
+        create_article_snapshot(article)
+        with self.captureOnCommitCallbacks(execute=True):
+            approve(source_article_id=article.id, actor=self.moderator)
+        published = PublishedArticle.objects.get(source_article=article)
+
+        self.authenticate(self.author)
+        with patch.object(PublishedArticleViewSet, "renderer_classes", [JSONRenderer]):
+            response = self.client.get(reverse("published_article-detail", args=[published.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["data"]["title"], published.title)
+
+    def test_published_article_detail_renders_from_the_database_on_a_miss(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PUBLISHED)
+        published = create_published_article(article)
+
+        self.authenticate(self.author)
+        response = self.client.get(reverse("published_article-detail", args=[published.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["data"]["title"], published.title)
+        self.assertIsNotNone(get_published_article_payload(published.id))
+
+    def test_published_article_list_returns_reading_stats_instead_of_content(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PUBLISHED)
+        create_published_article(article, excerpt="Light the portal", word_count=3, reading_time=1)
+
+        self.authenticate(self.author)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_json(reverse("published_article-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('"content"' in query["sql"] for query in queries))
+        result = response.data["data"]["results"][0]
+        self.assertNotIn("content", result)
+        self.assertEqual(
+            (result["excerpt"], result["word_count"], result["reading_time"]), ("Light the portal", 3, 1),
+        )
+
+    def test_published_article_search_returns_ranked_page_with_headlines(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PUBLISHED)
+        published = create_published_article(article, title="Portal guide", plain_text="Light the nether portal")
+
+        self.authenticate(self.author)
+        response = self.get_json(reverse("published_article-search"), {"q": "nether"})
+
+        self.assert_success_response(response, status_code=status.HTTP_200_OK, code="searched")
+        results = response.data["data"]["results"]
+        self.assertEqual(response.data["data"]["count"], 1)
+        self.assert_uuid_equal(results[0]["id"], published.id)
+        self.assertIn("<mark>nether</mark>", results[0]["headline"])
+        self.assertNotIn("content", results[0])
+
+    def test_published_article_autocomplete_suggests_published_titles_only(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PUBLISHED)
+        published = create_published_article(article, title="Nether portal guide")
+        unpublished = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.UNPUBLISHED)
+        create_published_article(unpublished, title="Nether fortress")
+
+        self.authenticate(self.author)
+        response = self.get_json(reverse("published_article-autocomplete"), {"q": "neth"})
+
+        self.assert_success_response(response, status_code=status.HTTP_200_OK, code="suggested")
+        self.assertEqual(response.data["data"], [{"id": str(published.id), "title": "Nether portal guide"}])
+
+    def test_published_article_autocomplete_forgets_unpublished_titles(self):
+        article = create_source_article(author=self.author, status=SourceArticle.ArticleStatus.PUBLISHED)
+        create_article_snapshot(article)
+        create_published_article(article, title="Nether portal guide")
+
+        self.authenticate(self.moderator)
+        response = self.get_json(reverse("published_article-autocomplete"), {"q": "neth"})
+        self.assertEqual(len(response.data["data"]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_json(reverse("source_article-unpublish", args=[article.id]), {})
+        response = self.get_json(reverse("published_article-autocomplete"), {"q": "neth"})
+
+        self.assertEqual(response.data["data"], [])
+
+    def test_published_article_autocomplete_rejects_a_limit_above_the_maximum(self):
+        self.authenticate(self.author)
+        response = self.get_json(reverse("published_article-autocomplete"), {"q": "neth", "limit": 1000})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_published_article_search_requires_a_query(self):
+        self.authenticate(self.author)
+        response = self.get_json(reverse("published_article-search"))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,320 @@
+import bisect
+import difflib
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+
+# Reading speed used for the reading time, in words per minute
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 200
+
+# CJK characters are counted as one word each, as those scripts do not separate words with spaces
+_CJK_CHARACTER = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]')
+
+# Nodes rendered as their own block, whose text is separated from the next block by a new line
+BLOCK_NODE_TYPES = frozenset({
+    'paragraph', 'heading', 'blockquote', 'codeBlock', 'listItem', 'taskItem',
+    'tableCell', 'tableHeader', 'horizontalRule',
+})
+
+
+def extract_plain_text(doc):
+    """
+    Return the text of a TipTap JSON document, one line per block,
+    without marks, images or other non-text nodes.
+    """
+    lines = []
+    current = []
+
+    def end_block():
+        if current:
+            line = "".join(current).strip()
+            if line:
+                lines.append(line)
+            current.clear()
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+            return
+        if not isinstance(node, dict):
+            return
+
+        node_type = node.get('type')
+        if node_type == 'text':
+            current.append(node.get('text') or "")
+        elif node_type == 'hardBreak':
+            current.append(" ")
+        elif isinstance(node.get('text'), str):
+            # Simplified documents storing the text on the block itself
+            current.append(node['text'])
+
+        walk(node.get('content') or node.get('blocks') or [])
+
+        if node_type in BLOCK_NODE_TYPES:
+            end_block()
+
+    walk(doc)
+    end_block()
+
+    return "\n".join(lines)
+
+
+def count_words(text):
+    cjk_count = len(_CJK_CHARACTER.findall(text))
+    return cjk_count + len(_CJK_CHARACTER.sub(" ", text).split())
+
+
+def make_excerpt(text, *, max_length=EXCERPT_LENGTH):
+    """
+    Return the beginning of a text on a single line, cut at a word boundary when possible.
+    """
+    text = " ".join(text.split())
+    if len(text) <= max_length:
+        return text
+
+    cut = text[:max_length]
+    space_index = cut.rfind(" ")
+    if space_index > max_length // 2:
+        cut = cut[:space_index]
+
+    return cut.rstrip(" ,;:.-") + "…"
+
+
+def get_reading_stats(plain_text):
+    """
+    Return the 'excerpt', 'word_count' and 'reading_time' (in minutes) of a text
+    returned by extract_plain_text().
+    """
+    word_count = count_words(plain_text)
+
+    return {
+        'excerpt': make_excerpt(plain_text),
+        'word_count': word_count,
+        'reading_time': math.ceil(word_count / WORDS_PER_MINUTE),
+    }
+
+
+def _node_key(node):
+    return json.dumps(node, sort_keys=True, separators=(',', ':'))
+
+
+def _has_children(node):
+    return isinstance(node, dict) and isinstance(node.get('content'), list)
+
+
+def diff_documents(old, new):
+    """
+    Return a structural patch turning the TipTap document 'old' into 'new', see apply_patch().
+
+    Nodes with children are patched as their own keys plus a list of operations on the children:
+    - [start, stop]: copy old['content'][start:stop]
+    - {'insert': [...]}: insert new nodes
+    - {'patch': index, 'diff': {...}}: patch old['content'][index], a node of the same type
+    Any other node is replaced: {'replace': new}.
+    """
+    if not (_has_children(old) and _has_children(new)) or old.get('type') != new.get('type'):
+        return {'replace': new}
+
+    old_children, new_children = old['content'], new['content']
+    matcher = difflib.SequenceMatcher(
+        None, [_node_key(child) for child in old_children], [_node_key(child) for child in new_children],
+        autojunk=False,
+    )
+
+    operations = []
+
+    def insert(nodes):
+        if operations and isinstance(operations[-1], dict) and 'insert' in operations[-1]:
+            operations[-1]['insert'].extend(nodes)
+        else:
+            operations.append({'insert': list(nodes)})
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            operations.append([i1, i2])
+        elif tag == 'replace' and i2 - i1 == j2 - j1:
+            # Edited in place: patch the nodes that keep their type
+            for old_index, new_child in zip(range(i1, i2), new_children[j1:j2]):
+                old_child = old_children[old_index]
+                # Children that are not nodes, e.g. strings in malformed documents, are replaced
+                if (
+                    _has_children(old_child) and _has_children(new_child)
+                    and old_child.get('type') == new_child.get('type')
+                ):
+                    operations.append({'patch': old_index, 'diff': diff_documents(old_child, new_child)})
+                else:
+                    insert([new_child])
+        elif tag in ('replace', 'insert'):
+            insert(new_children[j1:j2])
+
+    return {
+        'node': {key: value for key, value in new.items() if key != 'content'},
+        'content': operations,
+    }
+
+
+def apply_patch(base, patch):
+    """
+    Rebuild the document a diff_documents() patch was made from.
+    Unchanged nodes are shared with 'base', so neither document must be mutated afterwards.
+    """
+    if 'replace' in patch:
+        return patch['replace']
+
+    base_children = base['content']
+    children = []
+    for operation in patch['content']:
+        if isinstance(operation, list):
+            children.extend(base_children[operation[0]:operation[1]])
+        elif 'insert' in operation:
+            children.extend(operation['insert'])
+        else:
+            children.append(apply_patch(base_children[operation['patch']], operation['diff']))
+
+    return {**patch['node'], 'content': children}
+
+
+def _own_keys(node):
+    return {key: value for key, value in node.items() if key != 'content'}
+
+
+def _hash_tree(node):
+    """
+    Return the Merkle tree of a node: (digest, children trees).
+    The digest of a node with children covers its own keys and the digests of its children,
+    so identical subtrees have identical digests and each node is serialized once.
+    """
+    if not _has_children(node):
+        return hashlib.blake2b(_node_key(node).encode(), digest_size=16).digest(), ()
+
+    children = [_hash_tree(child) for child in node['content']]
+    digest = hashlib.blake2b(_node_key(_own_keys(node)).encode(), digest_size=16)
+    for child_digest, _ in children:
+        digest.update(child_digest)
+
+    return digest.digest(), children
+
+
+def diff_trees(old, new):
+    """
+    Return the node-level changes between two TipTap documents, for review.
+
+    Subtrees with the same Merkle digest are skipped without being walked.
+    Paths are lists of child indexes, in the old document ('old_path') and the new one ('new_path'):
+    - {'op': 'insert', 'new_path', 'new'}: a node added to the new document
+    - {'op': 'delete', 'old_path', 'old'}: a node removed from the old document
+    - {'op': 'update', 'old_path', 'new_path', 'old', 'new'}: the attributes of a node changed,
+      'old' and 'new' being the node without its children
+    - {'op': 'replace', 'old_path', 'new_path', 'old', 'new'}: any other changed node
+    """
+    changes = []
+    _diff_tree_nodes(old, _hash_tree(old), new, _hash_tree(new), [], [], changes)
+    return changes
+
+
+def _diff_tree_nodes(old, old_tree, new, new_tree, old_path, new_path, changes):
+    if old_tree[0] == new_tree[0]:
+        return
+
+    if not (_has_children(old) and _has_children(new)) or old.get('type') != new.get('type'):
+        changes.append({'op': 'replace', 'old_path': old_path, 'new_path': new_path, 'old': old, 'new': new})
+        return
+
+    old_keys, new_keys = _own_keys(old), _own_keys(new)
+    if old_keys != new_keys:
+        changes.append({'op': 'update', 'old_path': old_path, 'new_path': new_path, 'old': old_keys, 'new': new_keys})
+
+    old_children, new_children = old['content'], new['content']
+    matches = _match_digests([digest for digest, _ in old_tree[1]], [digest for digest, _ in new_tree[1]])
+
+    # Between two unchanged children, the nodes are edited in place, pairwise,
+    # and the rest of the longer side was deleted or inserted
+    i1 = j1 = 0
+    for i2, j2 in [*matches, (len(old_children), len(new_children))]:
+        paired = min(i2 - i1, j2 - j1)
+        for old_index, new_index in zip(range(i1, i1 + paired), range(j1, j1 + paired)):
+            _diff_tree_nodes(
+                old_children[old_index], old_tree[1][old_index], new_children[new_index], new_tree[1][new_index],
+                [*old_path, old_index], [*new_path, new_index], changes,
+            )
+        for old_index in range(i1 + paired, i2):
+            changes.append({'op': 'delete', 'old_path': [*old_path, old_index], 'old': old_children[old_index]})
+        for new_index in range(j1 + paired, j2):
+            changes.append({'op': 'insert', 'new_path': [*new_path, new_index], 'new': new_children[new_index]})
+        i1, j1 = i2 + 1, j2 + 1
+
+
+def _match_digests(old, new):
+    """
+    Return the (old index, new index) pairs of unchanged children, in order.
+
+    Patience diff over the digests: the common prefix and suffix are matched first,
+    then the digests found exactly once on both sides anchor the match (their longest
+    increasing run), and the gaps between anchors are matched the same way.
+    Unlike an LCS, this stays linear in the number of children for typical edits.
+    """
+    matches = []
+    _match_digest_range(old, new, 0, len(old), 0, len(new), matches)
+    return matches
+
+
+def _match_digest_range(old, new, i1, i2, j1, j2, matches):
+    while i1 < i2 and j1 < j2 and old[i1] == new[j1]:
+        matches.append((i1, j1))
+        i1, j1 = i1 + 1, j1 + 1
+
+    suffix = []
+    while i1 < i2 and j1 < j2 and old[i2 - 1] == new[j2 - 1]:
+        i2, j2 = i2 - 1, j2 - 1
+        suffix.append((i2, j2))
+
+    if i1 < i2 and j1 < j2:
+        anchors = _find_anchors(old, new, i1, i2, j1, j2)
+        for i, j in anchors:
+            _match_digest_range(old, new, i1, i, j1, j, matches)
+            matches.append((i, j))
+            i1, j1 = i + 1, j + 1
+        if anchors:
+            _match_digest_range(old, new, i1, i2, j1, j2, matches)
+
+    matches.extend(reversed(suffix))
+
+
+def _find_anchors(old, new, i1, i2, j1, j2):
+    """
+    Return the longest increasing run of (old index, new index) pairs
+    of the digests found exactly once in both old[i1:i2] and new[j1:j2].
+    """
+    old_counts = Counter(old[i1:i2])
+    new_counts = Counter(new[j1:j2])
+    new_indexes = {new[j]: j for j in range(j1, j2) if new_counts[new[j]] == 1}
+    pairs = [
+        (i, new_indexes[old[i]]) for i in range(i1, i2)
+        if old_counts[old[i]] == 1 and old[i] in new_indexes
+    ]
+
+    # Longest increasing subsequence of the new indexes (patience sorting)
+    tails = []          # new index ending the best run of each length
+    tail_pairs = []     # index in 'pairs' of each tail
+    previous = [None] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        length = bisect.bisect_left(tails, j)
+        if length == len(tails):
+            tails.append(j)
+            tail_pairs.append(index)
+        else:
+            tails[length] = j
+            tail_pairs[length] = index
+        previous[index] = tail_pairs[length - 1] if length else None
+
+    anchors = []
+    index = tail_pairs[-1] if tail_pairs else None
+    while index is not None:
+        anchors.append(pairs[index])
+        index = previous[index]
+
+    return anchors[::-1]
@@ -2,8 +2,16 @@ from django_filters import rest_framework as filters
 from django.db.models import OuterRef, Subquery
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
+import orjson
 
+import uuid
+
+from core.pagination import StandardOrKeysetPagination
+from core.renderers import ORJSONRenderer
+from core.serializers import AutocompleteQuerySerializer
 from core.utils.permissions import is_moderator
 from core.views.viewsets import MyModelViewSet, MyReadOnlyModelViewSet
 from .filters import SourceArticleFilter
@@ -15,9 +23,12 @@ from .permissions import (
 from .models import SourceArticle, PublishedArticle, ArticleSnapshot, ArticleEvent
 from .serializers import (
     SourceArticleReadSerializer,
+    SourceArticleListSerializer,
     SourceArticleWriteSerializer,
     ImageUploadSerializer,
     PublishedArticleSerializer,
+    PublishedArticleListSerializer,
+    PublishedArticleSearchResultSerializer,
     ArticleSnapshotSerializer,
     ArticleEventSerializer,
     ArticleActionInputSerializer,
@@ -26,12 +37,34 @@ from .serializers import (
 from .services.articles import (
     submit, withdraw, approve, reject, unpublish, soft_delete
 )
+from .services.diffs import diff_snapshot_with_published
+from .services.payloads import (
+    drop_published_article_payload,
+    get_published_article_payload,
+    is_payload_cacheable,
+    render_published_article,
+    warm_published_article_payload,
+)
+from .services.search import autocomplete_published_titles, get_search_headlines, search_published_articles
+
+
+def get_permitted_object(view, pk, fields=('pk',)):
+    """
+    Resolve an object like get_object() does, queryset scoping and object permissions included,
+    reading the given fields only. Malformed keys are not found.
+    """
+    queryset = view.filter_queryset(view.get_queryset()).select_related(None).prefetch_related(None)
+    instance = get_object_or_404(queryset.only(*fields), pk=pk)
+    view.check_object_permissions(view.request, instance)
+    return instance
 
 
 class SourceArticleViewSet(MyModelViewSet):
     queryset = SourceArticle.objects.select_related("author")
     filter_backends = [filters.DjangoFilterBackend]
     filterset_class = SourceArticleFilter
+    # The output includes snapshot and published ids, which change without touching updated_at
+    conditional_get = False
 
     permission_class_mapping = {
         'create': [IsAuthenticated],
@@ -54,6 +87,8 @@ class SourceArticleViewSet(MyModelViewSet):
         self.action: str
         if self.action in ('create', 'update', 'partial_update'):
             return SourceArticleWriteSerializer
+        if self.action == 'list':
+            return SourceArticleListSerializer
         return SourceArticleReadSerializer
 
     def get_permissions(self):
@@ -71,6 +106,10 @@ class SourceArticleViewSet(MyModelViewSet):
             return queryset.none()
 
         queryset = queryset.filter(author=user)
+        if self.action == 'list':
+            # Lists only carry the excerpt and reading stats
+            queryset = queryset.defer('content')
+
         last_snapshot_id = (
             ArticleSnapshot.objects
             .filter(source_article_id=OuterRef("pk"))
@@ -245,18 +284,136 @@ class PublishedArticleViewSet(MyReadOnlyModelViewSet):
     serializer_class = PublishedArticleSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_serializer_class(self):
+        # Lists carry the excerpt and reading stats instead of the content
+        self.action: str
+        if self.action == 'list':
+            return PublishedArticleListSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.defer('plain_text', 'search_vector')
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the payload rendered at approval from the cache, without database or serializer work.
+        On a miss the article is rendered from the database and cached if it is published.
+        '?fields=' requests always take the regular path.
+        """
+        if self.get_sparse_fieldset() is not None:
+            return super().retrieve(request, *args, **kwargs)
+
+        try:
+            published_article_id = uuid.UUID(str(kwargs[self.lookup_field]))
+        except ValueError:
+            return super().retrieve(request, *args, **kwargs)
+
+        cached = get_published_article_payload(published_article_id)
+        if cached is not None:
+            updated_at, rendered = cached
+            # The queryset scoping and the object permissions still apply to cached articles
+            permitted = get_permitted_object(self, published_article_id, fields=('pk', 'updated_at'))
+            if permitted.updated_at == updated_at:
+                return self._get_payload_response(request, published_article_id, updated_at, lambda: rendered)
+            # A payload of an older version of the article is a miss
+            drop_published_article_payload(published_article_id)
+
+        instance = self.get_object()
+
+        def render():
+            if is_payload_cacheable(instance):
+                return warm_published_article_payload(instance, overwrite=False)
+            return render_published_article(instance)
+
+        return self._get_payload_response(request, instance.pk, instance.updated_at, render)
+
+    @action(detail=False, methods=['get'], serializer_class=PublishedArticleSearchResultSerializer)
+    def search(self, request):
+        """
+        Full-text search over published articles, ranked by relevance ('q' accepts
+        "quoted phrases", -exclusions and 'or'). Results carry a highlighted headline.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': ["This query parameter is required."]})
+
+        page = self.paginate_queryset(search_published_articles(query))
+        headlines = get_search_headlines([published.pk for published in page], query)
+        for published in page:
+            published.headline = headlines.get(published.pk, "")
+
+        serializer = self.get_serializer(page, many=True)
+
+        return self.format_success_response(
+            message="searched",
+            code='searched',
+            data=self.get_paginated_response(serializer.data),
+            status_code=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Suggest published article titles starting with or resembling 'q' (at most 'limit').
+        """
+        query_serializer = AutocompleteQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        return self.format_success_response(
+            message="titles suggested",
+            code='suggested',
+            data=autocomplete_published_titles(
+                query_serializer.validated_data['q'], limit=query_serializer.validated_data['limit'],
+            ),
+            status_code=status.HTTP_200_OK,
+        )
+
+    def _get_payload_response(self, request, pk, updated_at, render):
+        validators = None
+        if self.is_conditional_get_enabled():
+            validators = {'etag': self.make_etag(pk, updated_at), 'last_modified': updated_at}
+            not_modified_response = self.get_not_modified_response(request, **validators)
+            if not_modified_response is not None:
+                return not_modified_response
+
+        response = self.format_success_response(
+            message=self.retrieve_success_message,
+            code=self.retrieve_success_code,
+            data=self._embed_payload(request, render()),
+            status_code=status.HTTP_200_OK,
+        )
+
+        if validators is not None:
+            self.set_validator_headers(response, **validators)
+
+        return response
+
+    @staticmethod
+    def _embed_payload(request, rendered):
+        if isinstance(request.accepted_renderer, ORJSONRenderer):
+            # Embedded as is
+            return orjson.Fragment(rendered)
+        # e.g. the browsable API, which cannot serialize a Fragment
+        return orjson.loads(rendered)
+
 
 class ArticleSnapshotViewSet(MyReadOnlyModelViewSet):
     queryset = ArticleSnapshot.objects.all()
     serializer_class = ArticleSnapshotSerializer
     permission_classes = [ModeratorOnly]
+    pagination_class = StandardOrKeysetPagination
 
     @action(detail=False, methods=['get'])
     def pending_ones(self, request):
         """
         Return not moderated article snapshots
         """
-        queryset = ArticleSnapshot.objects.filter(moderation_status=ArticleSnapshot.SnapshotStatus.PENDING)
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            moderation_status=ArticleSnapshot.SnapshotStatus.PENDING,
+        )
         serializer = self.get_serializer(queryset, many=True)
 
         return self.format_success_response(
@@ -266,11 +423,25 @@ class ArticleSnapshotViewSet(MyReadOnlyModelViewSet):
             status_code=status.HTTP_200_OK,
         )
 
+    @action(detail=True, methods=['get'])
+    def diff(self, request, pk=None):
+        """
+        Return the node-level changes of a snapshot against the published version of its article
+        """
+        return self.format_success_response(
+            message="article snapshot diffed",
+            code='diffed',
+            data=diff_snapshot_with_published(get_permitted_object(self, pk).pk),
+            status_code=status.HTTP_200_OK,
+        )
+
 
 class ArticleEventReadViewset(MyReadOnlyModelViewSet):
     queryset = ArticleEvent.objects.all()
     permission_classes = (ArticleEventPermission,)
     serializer_class = ArticleEventSerializer
+    pagination_class = StandardOrKeysetPagination
+    ndjson_streaming = True
 
     def get_queryset(self):
         user = self.request.user
@@ -26,7 +26,8 @@ CACHES = {
         "LOCATION": f"{REDIS_URL}/0",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            "SERIALIZER": "django_redis.serializers.json.JSONSerializer",
+            "SERIALIZER": "core.utils.cache_serializers.ORJSONSerializer",
+            "SERIALIZER_COMPRESS_MIN_LENGTH": 1024,
         },
         "KEY_PREFIX": env.str("REDIS_KEY_PREFIX"),
     }
@@ -154,6 +155,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "core.apps.CoreConfig",
     "users.apps.UsersConfig",
     "pages.apps.PagesConfig",
@@ -226,6 +228,7 @@ MEDIA_URL = "/media/"
 MIDDLEWARE = [
     "core.middleware.RequestMetaMiddleware",
     "logs.middleware.RequestLoggingMiddleware",
+    "logs.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -412,8 +415,7 @@ STATICFILES_FINDERS = [
 """Third-Party Package Settings"""
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'core.renderers.ORJSONRenderer',
     ],
     "DEFAULT_PARSER_CLASSES": [
         'rest_framework.parsers.JSONParser',
@@ -470,6 +472,41 @@ DEFAULT_AVATARS = [
     'default_avatar/Sword.webp',
 ]
 
+# Namespaces listed here are also kept in a per-process LRU cache in front of Redis.
+# Entries are invalidated across workers through Redis pub/sub,
+# and never live longer than CACHE_L1_TIMEOUT seconds in worker memory.
+CACHE_L1_NAMESPACES = ['youtube_data']
+CACHE_L1_MAX_ENTRIES = 1024
+CACHE_L1_TIMEOUT = 60
+
+# Keys of these namespaces embed a per-(namespace, entity) generation counter,
+# so invalidate_cache_namespace() drops them all in O(1) instead of a SCAN.
+CACHE_VERSIONED_NAMESPACES = ['articles']
+
+# QueryBudgetMiddleware: views may set 'query_budget', this applies to the others (None: no budget).
+# With QUERY_BUDGET_RAISE, exceeding a budget raises instead of logging a warning.
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGET_RAISE = False
+QUERY_REPEAT_THRESHOLD = 5
+
+# Text search configuration (PostgreSQL) of the published article search vectors.
+# Changing it requires rebuilding them: manage.py rebuild_article_search
+ARTICLE_SEARCH_CONFIG = "english"
+
+# Title / username autocomplete (core.utils.autocomplete)
+AUTOCOMPLETE_MAX_RESULTS = 10
+AUTOCOMPLETE_MAX_QUERY_LENGTH = 60
+AUTOCOMPLETE_CACHE_TIMEOUT = 30
+
+# Storage of the snapshot contents (articles.services.blobs):
+# "full" stores every content whole, "delta" stores structural patches against the previous
+# snapshot of the article, with a full keyframe every ARTICLE_SNAPSHOT_KEYFRAME_INTERVAL snapshots.
+ARTICLE_SNAPSHOT_STORAGE = "full"
+ARTICLE_SNAPSHOT_KEYFRAME_INTERVAL = 10
+# Contents rebuilt from deltas, kept in process
+CONTENT_BLOB_CACHE_MAX_ENTRIES = 256
+CONTENT_BLOB_CACHE_TIMEOUT = 3600
+
 SESSION_EXPIRY_REFRESH_INTERVAL = 600
 SESSION_EXPIRY_REFRESH_FIELD = 'last_expiry_refresh_at'
 
@@ -2,6 +2,11 @@ from .base import *
 
 DEBUG = True
 
+REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
+    *REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"],
+    'rest_framework.renderers.BrowsableAPIRenderer',
+]
+
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "AlienCommons Dev <noreply@localhost>"
 SERVER_EMAIL = "server@localhost"
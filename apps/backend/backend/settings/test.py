@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "pages.apps.PagesConfig",
     "logs.apps.LogsConfig",
     "articles.apps.ArticlesConfig",
@@ -45,6 +46,38 @@ DEFAULT_AVATARS = [
     "default_avatar/Sword.webp",
 ]
 
+CACHE_L1_NAMESPACES = ["youtube_data"]
+CACHE_L1_MAX_ENTRIES = 1024
+CACHE_L1_TIMEOUT = 60
+
+# Keys of these namespaces embed a per-(namespace, entity) generation counter,
+# so invalidate_cache_namespace() drops them all in O(1) instead of a SCAN.
+CACHE_VERSIONED_NAMESPACES = ["articles"]
+
+# QueryBudgetMiddleware: views may set 'query_budget', this applies to the others (None: no budget).
+# With QUERY_BUDGET_RAISE, exceeding a budget raises instead of logging a warning.
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGET_RAISE = True
+QUERY_REPEAT_THRESHOLD = 5
+
+# Text search configuration (PostgreSQL) of the published article search vectors.
+# Changing it requires rebuilding them: manage.py rebuild_article_search
+ARTICLE_SEARCH_CONFIG = "english"
+
+# Title / username autocomplete (core.utils.autocomplete)
+AUTOCOMPLETE_MAX_RESULTS = 10
+AUTOCOMPLETE_MAX_QUERY_LENGTH = 60
+AUTOCOMPLETE_CACHE_TIMEOUT = 30
+
+# Storage of the snapshot contents (articles.services.blobs):
+# "full" stores every content whole, "delta" stores structural patches against the previous
+# snapshot of the article, with a full keyframe every ARTICLE_SNAPSHOT_KEYFRAME_INTERVAL snapshots.
+ARTICLE_SNAPSHOT_STORAGE = "full"
+ARTICLE_SNAPSHOT_KEYFRAME_INTERVAL = 10
+# Contents rebuilt from deltas, kept in process
+CONTENT_BLOB_CACHE_MAX_ENTRIES = 256
+CONTENT_BLOB_CACHE_TIMEOUT = 3600
+
 SESSION_COOKIE_AGE = 1209600
 SESSION_EXPIRY_REFRESH_INTERVAL = 600
 SESSION_EXPIRY_REFRESH_FIELD = "last_expiry_refresh_at"
@@ -70,6 +103,9 @@ YOUTUBE_API_KEY = "test-api-key"
 YOUTUBE_API_URL = "https://example.com/youtube"
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+    ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
@@ -91,6 +127,7 @@ SPECTACULAR_SETTINGS = {
 
 MIDDLEWARE = [
     "core.middleware.RequestMetaMiddleware",
+    "logs.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -148,7 +185,7 @@ DATABASES = {
 
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "BACKEND": "core.cache_backends.InMemoryRedisCache",
         "LOCATION": "alien-commons-tests",
     }
 }
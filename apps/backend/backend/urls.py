@@ -11,6 +11,7 @@ urlpatterns = [
     path("api/v1/", include("pages.urls")),
     path("api/v1/", include("users.urls")),
     path("api/v1/", include("articles.urls")),
+    path("api/v1/", include("logs.urls")),
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
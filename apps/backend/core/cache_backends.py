@@ -0,0 +1,212 @@
+import re
+import threading
+import time
+import uuid
+
+from django.core.cache.backends.locmem import LocMemCache
+from redis.exceptions import LockError, LockNotOwnedError
+
+# One reentrant lock per cache name, so a pipeline can run several operations atomically
+_locks = {}
+
+
+def redis_glob_to_regex(pattern):
+    """
+    Translate a Redis glob pattern (KEYS / SCAN MATCH) into a compiled regex.
+    Supports '*', '?', '[abc]', '[^abc]', '[a-z]' and backslash escapes.
+    """
+    parts = []
+    index, length = 0, len(pattern)
+
+    while index < length:
+        char = pattern[index]
+
+        if char == "\\" and index + 1 < length:
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        elif char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[index + 1:end]
+                negate = body.startswith("^")
+                if negate:
+                    body = body[1:]
+                body = "".join("\\" + c if c in "\\]^[" else c for c in body)
+                parts.append(f"[{'^' if negate else ''}{body}]")
+                index = end
+        else:
+            parts.append(re.escape(char))
+
+        index += 1
+
+    return re.compile("".join(parts), re.DOTALL)
+
+
+class InMemoryLock:
+    """
+    A lock stored as a cache entry, with the interface of the redis-py Lock
+    returned by django-redis ``cache.lock()``.
+    """
+    def __init__(self, cache, name, *, version=None, timeout=None, sleep=0.1, blocking=True, blocking_timeout=None):
+        self.cache = cache
+        self.name = name
+        self.version = version
+        self.timeout = timeout
+        self.sleep = sleep
+        self.blocking = blocking
+        self.blocking_timeout = blocking_timeout
+        self.token = None
+
+    def __enter__(self):
+        if self.acquire():
+            return self
+        raise LockError("Unable to acquire lock within the time specified")
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def acquire(self, blocking=None, blocking_timeout=None, token=None):
+        blocking = self.blocking if blocking is None else blocking
+        blocking_timeout = self.blocking_timeout if blocking_timeout is None else blocking_timeout
+        token = token or uuid.uuid4().hex
+
+        deadline = None if blocking_timeout is None else time.monotonic() + blocking_timeout
+        while True:
+            if self.cache.add(self.name, token, timeout=self.timeout, version=self.version):
+                self.token = token
+                return True
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            time.sleep(self.sleep)
+
+    def locked(self):
+        return self.cache.has_key(self.name, version=self.version)
+
+    def owned(self):
+        return self.token is not None and self.cache.get(self.name, version=self.version) == self.token
+
+    def release(self):
+        if self.token is None:
+            raise LockError("Cannot release an unlocked lock")
+
+        token, self.token = self.token, None
+        with self.cache._lock:
+            if self.cache.get(self.name, version=self.version) != token:
+                raise LockNotOwnedError("Cannot release a lock that's no longer owned")
+            self.cache.delete(self.name, version=self.version)
+
+    def extend(self, additional_time):
+        if self.token is None:
+            raise LockError("Cannot extend an unlocked lock")
+
+        with self.cache._lock:
+            if self.cache.get(self.name, version=self.version) != self.token:
+                raise LockNotOwnedError("Cannot extend a lock that's no longer owned")
+            self.cache.expire(
+                self.name, self.cache.ttl(self.name, version=self.version) + additional_time, version=self.version
+            )
+        return True
+
+
+class InMemoryPipeline:
+    """
+    Queue cache operations and run them atomically on execute(),
+    returning their results in order.
+    """
+    def __init__(self, cache):
+        self.cache = cache
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.cache, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        with self.cache._lock:
+            return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+class InMemoryRedisCache(LocMemCache):
+    """
+    A thread-safe in-process cache that also implements the django-redis extensions
+    used in this project (delete_pattern, keys, ttl, expire, persist, lock, pipeline),
+    with real TTLs and Redis glob matching. Meant for tests and local benchmarks.
+    Data lives in the current process only.
+    """
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._lock = _locks.setdefault(name, threading.RLock())
+
+    def _iter_live_keys(self, pattern, version=None):
+        """
+        Yield the full (prefixed) keys matching a pattern, dropping expired ones.
+        """
+        regex = redis_glob_to_regex(self.make_key(pattern, version=version))
+        for key in list(self._cache):
+            if self._has_expired(key):
+                self._delete(key)
+            elif regex.fullmatch(key):
+                yield key
+
+    def delete_pattern(self, pattern, version=None, prefix=None, itersize=None):
+        with self._lock:
+            keys = list(self._iter_live_keys(pattern, version=version))
+            for key in keys:
+                self._delete(key)
+        return len(keys)
+
+    def keys(self, search, version=None):
+        """
+        Return the keys (without prefix and version) matching a glob pattern.
+        """
+        with self._lock:
+            return [key.split(":", 2)[2] for key in self._iter_live_keys(search, version=version)]
+
+    def iter_keys(self, search, itersize=None, version=None):
+        yield from self.keys(search, version=version)
+
+    def ttl(self, key, version=None):
+        """
+        Return the remaining seconds like django-redis:
+        0 if the key does not exist, None if it never expires.
+        """
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                self._delete(key)
+                return 0
+            expires_at = self._expire_info[key]
+            return None if expires_at is None else max(0, round(expires_at - time.time()))
+
+    def expire(self, key, timeout, version=None):
+        return self.touch(key, timeout=timeout, version=version)
+
+    def persist(self, key, version=None):
+        return self.touch(key, timeout=None, version=version)
+
+    def lock(self, key, version=None, timeout=None, sleep=0.1, blocking=True, blocking_timeout=None, **kwargs):
+        return InMemoryLock(
+            self, key, version=version, timeout=timeout, sleep=sleep,
+            blocking=blocking, blocking_timeout=blocking_timeout,
+        )
+
+    def pipeline(self):
+        return InMemoryPipeline(self)
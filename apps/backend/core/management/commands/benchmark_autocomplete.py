@@ -0,0 +1,96 @@
+import random
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from articles.models import PublishedArticle
+from core.utils.autocomplete import autocomplete, find_matches
+
+TARGETS = {
+    'titles': (PublishedArticle, 'title'),
+    'usernames': (get_user_model(), 'username'),
+}
+
+
+def _make_queries(values, *, count, seed=0):
+    """
+    Build queries shaped like typed input: short prefixes and prefixes with a typo.
+    """
+    rng = random.Random(seed)
+    queries = []
+
+    for value in rng.sample(values, min(count, len(values))):
+        prefix = value[:rng.randint(2, 6)]
+        queries.append(prefix)
+        if len(prefix) > 3:
+            position = rng.randrange(1, len(prefix))
+            queries.append(prefix[:position] + prefix[position + 1:])
+
+    return queries
+
+
+class Command(BaseCommand):
+    help = "Compare the trigram autocomplete with a naive icontains query"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=sorted(TARGETS), default="titles")
+        parser.add_argument("--query", action="append", dest="queries", help="Query to run, may be repeated")
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--limit", type=int, default=settings.AUTOCOMPLETE_MAX_RESULTS)
+
+    def handle(self, *args, **options):
+        model, field = TARGETS[options["target"]]
+        queryset = model._default_manager.all()
+        limit = options["limit"]
+
+        queries = options["queries"]
+        if not queries:
+            values = list(queryset.order_by("?").values_list(field, flat=True)[:200])
+            queries = _make_queries(values, count=10)
+
+        if not queries:
+            self.stdout.write(self.style.WARNING("Nothing to benchmark"))
+            return
+
+        strategies = {
+            "icontains": lambda query: list(
+                queryset.filter(**{f"{field}__icontains": query}).order_by(field).values_list("pk", field)[:limit]
+            ),
+            "trigram": lambda query: find_matches(queryset=queryset, field=field, query=query, limit=limit),
+            "trigram+cache": lambda query: autocomplete(
+                queryset=queryset, field=field, query=query, limit=limit,
+                namespace="benchmark", entity=f"{options['target']}_autocomplete",
+            ),
+        }
+
+        self.stdout.write(
+            f"{connection.vendor}, {queryset.count()} rows, {len(queries)} queries, "
+            f"{options['iterations']} iterations"
+        )
+        self.stdout.write(f"{'strategy':<16}{'mean ms':>10}{'p95 ms':>10}{'results':>10}")
+        for name, strategy in strategies.items():
+            mean, p95, results = self._measure(strategy, queries, options["iterations"])
+            self.stdout.write(f"{name:<16}{mean:>10.2f}{p95:>10.2f}{results:>10.1f}")
+
+    def _measure(self, strategy, queries, iterations):
+        """
+        Return the mean and 95th percentile time (ms) per query, and the mean number of results.
+        """
+        timings = []
+        results = 0
+
+        for _ in range(iterations):
+            for query in queries:
+                started_at = time.perf_counter()
+                results += len(strategy(query))
+                timings.append((time.perf_counter() - started_at) * 1000)
+
+        timings.sort()
+        return (
+            sum(timings) / len(timings),
+            timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            results / len(timings),
+        )
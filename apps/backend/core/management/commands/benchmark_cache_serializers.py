@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django_redis.serializers.json import JSONSerializer
+
+from articles.models import PublishedArticle
+from core.utils.benchmarks import make_tiptap_document
+from core.utils.cache_serializers import ORJSONSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare encode/decode time and size of the cache serializers on article content"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--blocks", type=int, default=200, help="Blocks per generated article")
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument(
+            "--from-db", action="store_true",
+            help="Use the latest published articles instead of generated ones",
+        )
+
+    def handle(self, *args, **options):
+        if options["from_db"]:
+            # Delta blobs store a patch, get_content() rebuilds their document
+            published_articles = PublishedArticle.objects.select_related("blob").order_by("-created_at")[:20]
+            samples = [published_article.blob.get_content() for published_article in published_articles]
+        else:
+            samples = [
+                make_tiptap_document(blocks=max(1, options["blocks"] // 20), seed=0),
+                make_tiptap_document(blocks=options["blocks"], seed=1),
+            ]
+
+        if not samples:
+            self.stdout.write(self.style.WARNING("No articles to benchmark"))
+            return
+
+        serializers = {
+            "json": JSONSerializer({}),
+            "orjson": ORJSONSerializer({"SERIALIZER_COMPRESS_MIN_LENGTH": float("inf")}),
+            "orjson+zlib": ORJSONSerializer({}),
+        }
+
+        self.stdout.write(f"{'serializer':<14}{'bytes':>12}{'encode µs':>12}{'decode µs':>12}")
+        for name, serializer in serializers.items():
+            size, encode_time, decode_time = self._measure(serializer, samples, options["iterations"])
+            self.stdout.write(f"{name:<14}{size:>12}{encode_time:>12.1f}{decode_time:>12.1f}")
+
+    def _measure(self, serializer, samples, iterations):
+        """
+        Return total encoded bytes and mean encode/decode time (µs) per sample set.
+        """
+        encoded = [serializer.dumps(sample) for sample in samples]
+
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            for sample in samples:
+                serializer.dumps(sample)
+        encode_time = (time.perf_counter() - started_at) / iterations * 1_000_000
+
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            for data in encoded:
+                serializer.loads(data)
+        decode_time = (time.perf_counter() - started_at) / iterations * 1_000_000
+
+        return sum(len(data) for data in encoded), encode_time, decode_time
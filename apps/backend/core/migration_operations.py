@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+class AddIndexOnPostgres(migrations.operations.base.Operation):
+    """
+    Create an index of a PostgreSQL-only type (GIN, pg_trgm operator classes...) on PostgreSQL only.
+
+    The index is deliberately kept out of the model state (and of Meta.indexes):
+    SQLite (tests) recreates all the indexes of the state whenever it rebuilds a table,
+    which would fail on these index types.
+    """
+    reversible = True
+
+    def __init__(self, model_name, index):
+        self.model_name = model_name
+        self.index = index
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.add_index(to_state.apps.get_model(app_label, self.model_name), self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.remove_index(from_state.apps.get_model(app_label, self.model_name), self.index)
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {'model_name': self.model_name, 'index': self.index}
+
+    def describe(self):
+        return f"Create index {self.index.name} on {self.model_name} (PostgreSQL only)"
+
+    @property
+    def migration_name_fragment(self):
+        return f"{self.model_name.lower()}_{self.index.name.lower()}"
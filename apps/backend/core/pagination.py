@@ -1,4 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.settings import api_settings
 
 
 class StandardPagination(PageNumberPagination):
@@ -10,3 +20,210 @@ class StandardPagination(PageNumberPagination):
             "page_size": self.get_page_size(self.request),
             "results": data
         }
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique ordering, by default (-created_at, -id).
+    Pages are fetched with "WHERE (created_at, id) < (...)" instead of OFFSET,
+    and no COUNT(*) runs, so deep pages cost the same as the first one.
+
+    Set 'approximate_count' to also return the planner's row estimate of the table
+    (pg_class.reltuples). It ignores filters and is only a rough total.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    approximate_count = False
+
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.total = self.get_approximate_count(queryset) if self.approximate_count else None
+
+        values, reverse = self.decode_cursor(request, queryset.model)
+        ordering = [self._invert(field) for field in self.ordering] if reverse else list(self.ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._build_keyset_filter(ordering, values))
+
+        # One extra row tells whether there is another page in this direction
+        page = list(queryset[:self.page_size_value + 1])
+        has_more = len(page) > self.page_size_value
+        page = page[:self.page_size_value]
+
+        if reverse:
+            page.reverse()
+            has_next, has_previous = values is not None, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        self.next_cursor = self.encode_cursor(page[-1], reverse=False) if page and has_next else None
+        self.previous_cursor = self.encode_cursor(page[0], reverse=True) if page and has_previous else None
+
+        return page
+
+    def get_paginated_response(self, data):
+        payload = {
+            "page_size": self.page_size_value,
+            "next": self.next_cursor,
+            "previous": self.previous_cursor,
+            "results": data,
+        }
+        if self.approximate_count:
+            payload["approximate_count"] = self.total
+
+        return payload
+
+    def get_paginated_response_schema(self, schema):
+        properties = {
+            "page_size": {"type": "integer"},
+            "next": {"type": "string", "nullable": True},
+            "previous": {"type": "string", "nullable": True},
+            "results": schema,
+        }
+        if self.approximate_count:
+            properties["approximate_count"] = {"type": "integer", "nullable": True}
+
+        return {"type": "object", "required": ["results"], "properties": properties}
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "The pagination cursor value.",
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "Number of results to return per page.",
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return max(1, min(page_size, self.max_page_size))
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _build_keyset_filter(ordering, values):
+        """
+        Build the lexicographic "row comes after the cursor" condition, e.g. for (-a, -b):
+        a < x OR (a = x AND b < y)
+        """
+        condition = Q()
+        equal_prefix = {}
+
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal_prefix, **{f'{name}__{lookup}': value})
+            equal_prefix[name] = value
+
+        return condition
+
+    def encode_cursor(self, instance, *, reverse):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            values.append(value.isoformat() if isinstance(value, datetime.datetime) else str(value))
+
+        raw = json.dumps({"v": values, "r": reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        """
+        Return the ordering values and direction of the cursor, or (None, False) without one.
+        Values are converted with the model fields, so a tampered cursor is a 404 rather than a failed query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            cursor = json.loads(raw)
+            values, reverse = cursor["v"], bool(cursor["r"])
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            # created_at-like values come back as strings, compare them as datetimes
+            values = [
+                self._get_ordering_field(model, field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values, reverse
+
+    @staticmethod
+    def _get_ordering_field(model, field):
+        name = field.lstrip('-')
+        return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+
+    @staticmethod
+    def get_approximate_count(queryset):
+        """
+        Return the planner's estimate of the table size on PostgreSQL,
+        or an exact count elsewhere (e.g. sqlite in development and tests).
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return row[0] if row and row[0] >= 0 else None
+
+
+class StandardOrKeysetPagination(StandardPagination):
+    """
+    StandardPagination (count, total_pages, current_page) by default,
+    KeysetPagination once the client passes '?cursor=' (empty for the first page),
+    so existing clients keep their response shape.
+    """
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_pagination_class.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = self.keyset_pagination_class()
+        page = self.keyset.paginate_queryset(queryset, request, view)
+        self.next_cursor, self.previous_cursor = self.keyset.next_cursor, self.keyset.previous_cursor
+        return page
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            *self.keyset_pagination_class().get_schema_operation_parameters(view),
+        ]
@@ -0,0 +1,53 @@
+import datetime
+
+import orjson
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Dates and times are passed to encode_default(), so they are formatted like the serializer fields
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Unbound, so they read REST_FRAMEWORK["DATETIME_FORMAT"] and co. on every call
+_DATETIME_FIELD = serializers.DateTimeField()
+_DATE_FIELD = serializers.DateField()
+_TIME_FIELD = serializers.TimeField()
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    The 'default' hook of orjson.dumps() with ORJSON_OPTIONS.
+    Dates and times are formatted like DRF's fields, whether they come from a serializer or a raw dict,
+    the types orjson does not know (Decimal, lazy translations, querysets...) fall back to DRF's JSONEncoder.
+    """
+    if isinstance(obj, datetime.datetime):
+        return _DATETIME_FIELD.to_representation(obj)
+    if isinstance(obj, datetime.date):
+        return _DATE_FIELD.to_representation(obj)
+    if isinstance(obj, datetime.time):
+        return _TIME_FIELD.to_representation(obj)
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    A JSONRenderer using orjson, several times faster on large payloads such as article content.
+    Dates, times and the types orjson does not know go through encode_default().
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        option = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context):
+            # orjson only supports an indent of 2
+            option |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=encode_default, option=option)
+
+        # Escape U+2028 and U+2029 like JSONRenderer,
+        # so the output stays a strict javascript subset
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
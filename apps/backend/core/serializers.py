@@ -0,0 +1,337 @@
+import operator
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    A ListSerializer that writes all items with a single bulk_create() or bulk_update().
+
+    For updates, 'instance' is a dict of the instances by primary key (as a string)
+    and every item must carry its 'id'.
+    Model.save() is not called, so no pre_save / post_save signals are sent,
+    and many-to-many fields are not supported.
+    """
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            instance = self.instance.get(str(data.get('id'))) if isinstance(data, dict) else None
+            if instance is None:
+                raise serializers.ValidationError({'id': ["Not found."]}, code='not_found')
+            self.child.instance = instance
+            self.child.initial_data = data
+
+        return super().run_child_validation(data)
+
+    def to_representation(self, data):
+        if isinstance(data, dict):
+            data = list(data.values())
+        return super().to_representation(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = [model(**attrs) for attrs in validated_data]
+
+        return model._default_manager.bulk_create(objs)
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        objs = []
+        fields = set()
+
+        for item, attrs in zip(self.initial_data, validated_data):
+            obj = instance[str(item['id'])]
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+            fields.update(attrs)
+            objs.append(obj)
+
+        if fields:
+            # bulk_update() does not refresh auto_now fields such as 'updated_at'
+            for field in model._meta.concrete_fields:
+                if getattr(field, 'auto_now', False):
+                    for obj in objs:
+                        field.pre_save(obj, add=False)
+                    fields.add(field.name)
+
+            model._default_manager.bulk_update(objs, fields=sorted(fields))
+
+        return objs
+
+
+def parse_primary_keys(model, values):
+    """
+    Return the valid primary keys among 'values', converted to python values.
+    """
+    pk_field = model._meta.pk
+    primary_keys = []
+
+    for value in values:
+        try:
+            primary_keys.append(pk_field.to_python(value))
+        except DjangoValidationError:
+            continue
+
+    return primary_keys
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the autocomplete endpoints (core.utils.autocomplete).
+    """
+    q = serializers.CharField(max_length=settings.AUTOCOMPLETE_MAX_QUERY_LENGTH)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.AUTOCOMPLETE_MAX_RESULTS, default=settings.AUTOCOMPLETE_MAX_RESULTS,
+    )
+
+
+# Field readers, by serializer class and readable field layout
+_field_readers = {}
+
+
+def _represent_field(field, instance, ret):
+    """
+    Represent one field exactly like Serializer.to_representation().
+    """
+    try:
+        attribute = field.get_attribute(instance)
+    except SkipField:
+        return
+
+    check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+    ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+
+
+def _get_model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _get_concrete_field_by_attname(model, attname):
+    for model_field in model._meta.concrete_fields:
+        if model_field.attname == attname:
+            return model_field
+    return None
+
+
+def _get_instance(instance):
+    return instance
+
+
+def _make_field_reader(field, model):
+    """
+    Return (field name, attribute getter, to_representation) for one field.
+    The getter is None for fields read through the generic path,
+    to_representation is None for values represented as they are,
+    otherwise it is called unbound, with the field.
+    """
+    name = field.field_name
+    generic = (name, None, None)
+
+    if isinstance(field, serializers.SerializerMethodField):
+        return name, _get_instance, serializers.SerializerMethodField.to_representation
+
+    if field.source == '*' or len(field.source_attrs) != 1:
+        return generic
+
+    attr = field.source_attrs[0]
+    if attr.startswith('get_') and attr.endswith('_display'):
+        model_field = _get_model_field(model, attr[4:-8])
+        if model_field is not None and model_field.choices and type(field) is serializers.CharField:
+            return name, operator.methodcaller(attr), serializers.CharField.to_representation
+        return generic
+
+    model_field = _get_model_field(model, attr)
+    if model_field is None or not model_field.concrete:
+        return generic
+
+    if model_field.many_to_one or model_field.one_to_one:
+        # Same as the pk-only optimization of PrimaryKeyRelatedField
+        if type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None:
+            return name, operator.attrgetter(model_field.attname), None
+        return generic
+
+    if model_field.is_relation:
+        return generic
+
+    if type(field) is serializers.JSONField and not field.binary:
+        return name, operator.attrgetter(attr), None
+
+    return name, operator.attrgetter(attr), type(field).to_representation
+
+
+def get_field_readers(serializer_class, fields):
+    """
+    Return the readers of the given readable fields, see _make_field_reader().
+    """
+    model = serializer_class.Meta.model
+    return [_make_field_reader(field, model) for field in fields]
+
+
+class FlatRepresentationMixin:
+    """
+    Replace the generic field loop of to_representation() with a loop over field readers
+    precomputed once per serializer class, for read-heavy serializers.
+
+    Plain model columns, foreign keys as primary keys, SerializerMethodFields and
+    'get_<field>_display' sources are read directly, anything else (dotted sources,
+    nested serializers, files...) falls back to the field's own get_attribute().
+    The output is identical to Serializer.to_representation().
+    This should always be used with ModelSerializer.
+    """
+    def to_representation(self, instance):
+        if not isinstance(instance, self.Meta.model):
+            # e.g. a dict, which the attribute getters cannot read
+            return super().to_representation(instance)
+
+        prepared = self.__dict__.get('_field_readers')
+        if prepared is None:
+            fields = list(self._readable_fields)
+            key = (type(self), tuple((field.field_name, type(field), field.source) for field in fields))
+            readers = _field_readers.get(key)
+            if readers is None:
+                readers = _field_readers[key] = get_field_readers(type(self), fields)
+            prepared = self._field_readers = list(zip(fields, readers))
+
+        ret = {}
+        for field, (name, getter, to_representation) in prepared:
+            if getter is None:
+                _represent_field(field, instance, ret)
+                continue
+
+            value = getter(instance)
+            ret[name] = value if value is None or to_representation is None else to_representation(field, value)
+
+        return ret
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class QueryPlan:
+    select_related: tuple
+    prefetch_related: tuple
+    deferred: tuple
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.deferred:
+            queryset = queryset.defer(*self.deferred)
+        return queryset
+
+
+class _QueryPlanner:
+    """
+    Walk the readable fields of a serializer (and of its nested serializers)
+    and resolve their sources against the model.
+    """
+    def __init__(self):
+        self.select = {}        # path -> related model
+        self.prefetch = set()
+        self.used = {}          # selected path -> columns read on it
+        self.opaque = set()     # selected paths whose columns are unknown
+
+    def walk(self, serializer, model, prefix=''):
+        method_field_sources = getattr(getattr(serializer, 'Meta', None), 'method_field_sources', {})
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if name in method_field_sources or isinstance(field, serializers.SerializerMethodField):
+                if name not in method_field_sources:
+                    # It may read anything on the related objects
+                    self.opaque.add(prefix)
+                for source in method_field_sources.get(name, ()):
+                    self.resolve(source.split('.'), None, model, prefix)
+                continue
+
+            if field.source == '*':
+                if isinstance(field, serializers.BaseSerializer):
+                    self.walk(field, model, prefix)
+                continue
+
+            self.resolve(field.source_attrs, field, model, prefix)
+
+    def resolve(self, attrs, field, model, prefix):
+        path = prefix
+        for index, attr in enumerate(attrs):
+            is_last = index == len(attrs) - 1
+            model_field = _get_model_field(model, attr) or _get_concrete_field_by_attname(model, attr)
+            if model_field is None:
+                # A property or a method, which may read anything
+                self.opaque.add(path)
+                return
+
+            if not model_field.is_relation or attr == getattr(model_field, 'attname', attr) != model_field.name:
+                # A column, including a foreign key read as '<name>_id'
+                if path:
+                    self.used.setdefault(path, set()).add(model_field.attname)
+                return
+
+            related_path = f"{path}__{attr}" if path else attr
+            if model_field.many_to_many or model_field.one_to_many:
+                self.prefetch.add(related_path)
+                return
+
+            if is_last and type(field) is serializers.PrimaryKeyRelatedField and model_field.concrete:
+                # Only the foreign key column is read
+                if path:
+                    self.used.setdefault(path, set()).add(model_field.attname)
+                return
+
+            if path:
+                self.used.setdefault(path, set()).add(model_field.attname)
+            self.select[related_path] = model_field.related_model
+            path, model = related_path, model_field.related_model
+
+        if isinstance(field, serializers.BaseSerializer) and not isinstance(field, serializers.ListSerializer):
+            self.walk(field, model, path)
+        elif path:
+            # e.g. a StringRelatedField or a SlugRelatedField on the related object
+            self.opaque.add(path)
+
+    def plan(self):
+        deferred = []
+        for path, model in self.select.items():
+            if path in self.opaque or any(path.startswith(f"{opaque}__") for opaque in self.opaque if opaque):
+                continue
+            used = self.used.get(path, set())
+            for model_field in model._meta.concrete_fields:
+                if model_field.primary_key or model_field.is_relation or model_field.attname in used:
+                    continue
+                deferred.append(f"{path}__{model_field.name}")
+
+        return QueryPlan(
+            select_related=tuple(sorted(self.select)),
+            prefetch_related=tuple(sorted(self.prefetch)),
+            deferred=tuple(deferred),
+        )
+
+
+def plan_queryset(serializer):
+    """
+    Return the QueryPlan of a ModelSerializer: the relations its fields traverse
+    (select_related for forward relations, prefetch_related for many relations),
+    and the columns of the joined models none of its fields read (deferred).
+
+    SerializerMethodFields declare what they read in 'Meta.method_field_sources',
+    dotted paths included (e.g. 'author.username'). When they do not, the columns
+    of the joined models are all kept. Fields whose source is a property or a method
+    may declare their reads there too.
+    """
+    planner = _QueryPlanner()
+    planner.walk(serializer, serializer.Meta.model)
+    if '' in planner.opaque:
+        # Undeclared method fields at the top level may read the joined models too
+        planner.opaque.update(planner.select)
+
+    return planner.plan()
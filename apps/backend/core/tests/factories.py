@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 
 from articles.models import ArticleSnapshot, PublishedArticle, SourceArticle
-from articles.services.articles import ArticleWorkflow
+from articles.services.blobs import acquire_content_blob
 
 from .helpers import unique_suffix
 
@@ -38,14 +38,12 @@ def create_source_article(**kwargs):
 
 
 def create_article_snapshot(article, **kwargs):
+    title = kwargs.pop("title", article.title)
+    content = kwargs.pop("content", article.content)
     defaults = {
         "source_article": article,
-        "title": article.title,
-        "content": article.content,
-        "content_hash": ArticleWorkflow._hash_and_normalize(
-            article.title,
-            article.content,
-        ),
+        "title": title,
+        "blob": acquire_content_blob(title=title, content=content),
         "moderation_status": ArticleSnapshot.SnapshotStatus.PENDING,
     }
     defaults.update(kwargs)
@@ -53,10 +51,12 @@ def create_article_snapshot(article, **kwargs):
 
 
 def create_published_article(article, **kwargs):
+    title = kwargs.pop("title", article.title)
+    content = kwargs.pop("content", article.content)
     defaults = {
         "source_article": article,
-        "title": article.title,
-        "content": article.content,
+        "title": title,
+        "blob": acquire_content_blob(title=title, content=content),
     }
     defaults.update(kwargs)
     return PublishedArticle.objects.create(**defaults)
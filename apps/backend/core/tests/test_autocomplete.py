@@ -0,0 +1,34 @@
+from core.tests.factories import create_user
+from core.tests.testcases import BaseTestCase
+from core.utils.autocomplete import autocomplete, find_matches
+from users.models import User
+
+
+class AutocompleteTests(BaseTestCase):
+    def setUp(self):
+        self.steve = create_user(username="Steve")
+        self.steven = create_user(username="steven_builds")
+        self.old_steve = create_user(username="old_steve")
+        create_user(username="alex")
+
+    def test_prefix_matches_come_first_and_case_is_ignored(self):
+        results = find_matches(queryset=User.objects.all(), field="username", query="STEVE", limit=10)
+
+        self.assertEqual(
+            [result["username"] for result in results], ["Steve", "steven_builds", "old_steve"],
+        )
+        self.assertEqual(results[0], {"id": str(self.steve.id), "username": "Steve"})
+
+    def test_blank_query_matches_nothing(self):
+        self.assertEqual(find_matches(queryset=User.objects.all(), field="username", query="  ", limit=10), [])
+
+    def test_results_are_bounded_and_cached(self):
+        kwargs = {"queryset": User.objects.all(), "field": "username", "namespace": "users", "entity": "test"}
+
+        results = autocomplete(query="steve", limit=1000, **kwargs)
+        self.assertEqual(len(results), 3)
+
+        self.assertEqual(autocomplete(query="ste", limit=2, **kwargs), results[:2])
+        create_user(username="stevedore")
+        with self.assertNumQueries(0):
+            self.assertEqual(autocomplete(query=" Steve ", limit=1000, **kwargs), results)
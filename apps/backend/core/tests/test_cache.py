@@ -0,0 +1,240 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from redis.exceptions import LockNotOwnedError
+
+from core.tests.testcases import BaseTestCase
+from core.utils.cache import (
+    delete_cache,
+    delete_many_cache,
+    get_cache,
+    get_key,
+    get_many_cache,
+    get_or_set_cache,
+    invalidate_cache_namespace,
+    set_cache,
+    set_many_cache,
+)
+from core.utils.local_cache import LRUCache
+
+
+class LRUCacheTests(BaseTestCase):
+    def test_least_recently_used_entry_is_evicted_when_full(self):
+        lru = LRUCache(max_entries=2, timeout=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+
+        lru.set("c", 3)
+
+        self.assertEqual(lru.get("a"), 1)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("c"), 3)
+
+    def test_entry_expires_after_its_timeout(self):
+        lru = LRUCache(max_entries=10, timeout=60)
+
+        with patch("core.utils.local_cache.time.monotonic", return_value=100):
+            lru.set("a", 1, timeout=5)
+        with patch("core.utils.local_cache.time.monotonic", return_value=104):
+            self.assertEqual(lru.get("a"), 1)
+        with patch("core.utils.local_cache.time.monotonic", return_value=105):
+            self.assertIsNone(lru.get("a"))
+
+    def test_timeout_is_capped_by_cache_timeout(self):
+        lru = LRUCache(max_entries=10, timeout=10)
+
+        with patch("core.utils.local_cache.time.monotonic", return_value=0):
+            lru.set("a", 1, timeout=3600)
+        with patch("core.utils.local_cache.time.monotonic", return_value=10):
+            self.assertIsNone(lru.get("a"))
+
+
+@override_settings(CACHE_L1_NAMESPACES=["hot"])
+class LocalCacheTierTests(BaseTestCase):
+    def test_hot_namespace_is_served_from_worker_memory(self):
+        set_cache(namespace="hot", entity="item", identifier=1, value={"v": 1})
+        self.assertEqual(get_cache(namespace="hot", entity="item", identifier=1), {"v": 1})
+
+        # Bypass the helpers so only the local tier still knows the value
+        cache.delete(get_key("hot", "item", 1))
+
+        self.assertEqual(get_cache(namespace="hot", entity="item", identifier=1), {"v": 1})
+
+    def test_set_cache_invalidates_local_entry(self):
+        set_cache(namespace="hot", entity="item", identifier=1, value="old")
+        get_cache(namespace="hot", entity="item", identifier=1)
+
+        set_cache(namespace="hot", entity="item", identifier=1, value="new")
+
+        self.assertEqual(get_cache(namespace="hot", entity="item", identifier=1), "new")
+
+    def test_delete_cache_invalidates_local_entry(self):
+        set_cache(namespace="hot", entity="item", identifier=1, value="old")
+        get_cache(namespace="hot", entity="item", identifier=1)
+
+        delete_cache(namespace="hot", entity="item", identifier=1)
+
+        self.assertIsNone(get_cache(namespace="hot", entity="item", identifier=1))
+
+    def test_get_or_set_cache_only_calls_creator_once(self):
+        calls = []
+
+        def creator():
+            calls.append(1)
+            return "value"
+
+        for _ in range(3):
+            value = get_or_set_cache(namespace="hot", entity="item", identifier=1, creator=creator)
+
+        self.assertEqual(value, "value")
+        self.assertEqual(len(calls), 1)
+
+    def test_cold_namespace_is_not_kept_in_worker_memory(self):
+        set_cache(namespace="cold", entity="item", identifier=1, value="value")
+        get_cache(namespace="cold", entity="item", identifier=1)
+
+        cache.delete(get_key("cold", "item", 1))
+
+        self.assertIsNone(get_cache(namespace="cold", entity="item", identifier=1))
+
+
+class ManyCacheTests(BaseTestCase):
+    def test_set_many_and_get_many_are_keyed_by_identifier(self):
+        set_many_cache(namespace="articles", entity="item", values={1: "a", 2: "b"})
+
+        self.assertEqual(cache.get(get_key("articles", "item", 1)), "a")
+        self.assertEqual(
+            get_many_cache(namespace="articles", entity="item", identifiers=[1, 2, 3]),
+            {1: "a", 2: "b"},
+        )
+
+    def test_delete_many_removes_only_given_identifiers(self):
+        set_many_cache(namespace="articles", entity="item", values={1: "a", 2: "b"})
+
+        delete_many_cache(namespace="articles", entity="item", identifiers=[1])
+
+        self.assertEqual(
+            get_many_cache(namespace="articles", entity="item", identifiers=[1, 2]),
+            {2: "b"},
+        )
+
+    def test_get_many_uses_a_single_round_trip(self):
+        with patch("core.utils.cache.cache.get_many", return_value={}) as get_many_mock:
+            get_many_cache(namespace="articles", entity="item", identifiers=[1, 2, 3])
+
+        get_many_mock.assert_called_once_with(
+            [get_key("articles", "item", 1), get_key("articles", "item", 2), get_key("articles", "item", 3)]
+        )
+
+    @override_settings(CACHE_L1_NAMESPACES=["hot"])
+    def test_get_many_only_fetches_keys_missing_from_worker_memory(self):
+        set_many_cache(namespace="hot", entity="item", values={1: "a", 2: "b"})
+        get_cache(namespace="hot", entity="item", identifier=1)
+
+        with patch("core.utils.cache.cache.get_many", return_value={}) as get_many_mock:
+            result = get_many_cache(namespace="hot", entity="item", identifiers=[1, 2])
+
+        get_many_mock.assert_called_once_with([get_key("hot", "item", 2)])
+        self.assertEqual(result, {1: "a"})
+
+
+@override_settings(CACHE_VERSIONED_NAMESPACES=["versioned"])
+class VersionedNamespaceTests(BaseTestCase):
+    def test_key_embeds_generation_only_for_versioned_namespaces(self):
+        self.assertRegex(get_key("versioned", "item", 1), r"^versioned:item:v\d+:1$")
+        self.assertEqual(get_key("plain", "item", 1), "plain:item:1")
+
+    def test_invalidation_hides_every_key_of_the_entity(self):
+        set_many_cache(namespace="versioned", entity="item", values={1: "a", 2: "b"}, timeout=60)
+        set_cache(namespace="versioned", entity="other", identifier=1, value="c", timeout=60)
+
+        invalidate_cache_namespace(namespace="versioned", entity="item")
+
+        self.assertEqual(get_many_cache(namespace="versioned", entity="item", identifiers=[1, 2]), {})
+        self.assertEqual(get_cache(namespace="versioned", entity="other", identifier=1), "c")
+
+    def test_values_set_after_invalidation_are_readable(self):
+        invalidate_cache_namespace(namespace="versioned", entity="item")
+        set_cache(namespace="versioned", entity="item", identifier=1, value="new", timeout=60)
+
+        self.assertEqual(get_cache(namespace="versioned", entity="item", identifier=1), "new")
+
+    def test_invalidating_unversioned_namespace_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            invalidate_cache_namespace(namespace="plain", entity="item")
+
+
+class SingleFlightTests(BaseTestCase):
+    def make_lock(self, *, acquired):
+        lock = Mock()
+        lock.acquire.return_value = acquired
+        return lock
+
+    def get_or_set(self, creator, **kwargs):
+        return get_or_set_cache(
+            namespace="articles", entity="hot", identifier=1, creator=creator,
+            timeout=60, single_flight=True, **kwargs
+        )
+
+    @patch("core.utils.cache.get_cache_lock")
+    def test_lock_holder_rebuilds_missing_value_once(self, get_cache_lock_mock):
+        get_cache_lock_mock.return_value = self.make_lock(acquired=True)
+        creator = Mock(return_value="fresh")
+
+        self.assertEqual(self.get_or_set(creator), "fresh")
+        self.assertEqual(self.get_or_set(creator), "fresh")
+
+        creator.assert_called_once()
+        get_cache_lock_mock.return_value.release.assert_called_once()
+
+    @patch("core.utils.cache.get_cache_lock")
+    def test_expired_lock_release_is_tolerated_but_not_programming_errors(self, get_cache_lock_mock):
+        lock = get_cache_lock_mock.return_value = self.make_lock(acquired=True)
+        lock.release.side_effect = LockNotOwnedError("expired")
+
+        self.assertEqual(self.get_or_set(Mock(return_value="fresh")), "fresh")
+
+        cache.clear()
+        lock.release.side_effect = TypeError("bug")
+        with self.assertRaises(TypeError):
+            self.get_or_set(Mock(return_value="fresh"))
+
+    @patch("core.utils.cache.get_cache_lock")
+    def test_stale_value_is_served_while_another_worker_rebuilds(self, get_cache_lock_mock):
+        cache.set(
+            get_key("articles", "hot", 1),
+            {"value": "stale", "delta": 1, "expires_at": 0},
+        )
+        get_cache_lock_mock.return_value = self.make_lock(acquired=False)
+        creator = Mock(return_value="fresh")
+
+        self.assertEqual(self.get_or_set(creator), "stale")
+        creator.assert_not_called()
+
+    @patch("core.utils.cache.get_cache_lock")
+    def test_cold_miss_computes_after_waiting_for_slow_lock_holder(self, get_cache_lock_mock):
+        get_cache_lock_mock.return_value = self.make_lock(acquired=False)
+        creator = Mock(return_value="fresh")
+
+        self.assertEqual(self.get_or_set(creator, wait_timeout=0), "fresh")
+        creator.assert_called_once()
+
+    @patch("core.utils.cache.get_cache_lock")
+    def test_hot_key_is_recomputed_before_it_expires(self, get_cache_lock_mock):
+        get_cache_lock_mock.return_value = self.make_lock(acquired=True)
+        self.get_or_set(Mock(return_value="old"))
+        envelope = cache.get(get_key("articles", "hot", 1))
+        envelope["delta"] = 10
+        cache.set(get_key("articles", "hot", 1), envelope)
+        creator = Mock(return_value="new")
+
+        # random() close to 1 makes -log(1 - random()) large enough to trigger a refresh
+        with patch("core.utils.cache.random.random", return_value=0.999999):
+            self.assertEqual(self.get_or_set(creator), "new")
+        with patch("core.utils.cache.random.random", return_value=0.0):
+            self.assertEqual(self.get_or_set(creator), "new")
+
+        creator.assert_called_once()
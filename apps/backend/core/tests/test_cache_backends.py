@@ -0,0 +1,97 @@
+from unittest.mock import patch
+
+from redis.exceptions import LockNotOwnedError
+
+from core.cache_backends import InMemoryRedisCache, redis_glob_to_regex
+from core.tests.testcases import BaseTestCase
+from core.utils.cache import delete_cache_pattern, get_cache, set_cache
+
+
+class RedisGlobTests(BaseTestCase):
+    def test_glob_matches_like_redis(self):
+        cases = [
+            ("h?llo", "hello", True),
+            ("h*llo", "heeeello", True),
+            ("h[ae]llo", "hallo", True),
+            ("h[ae]llo", "hillo", False),
+            ("h[^e]llo", "hallo", True),
+            ("h[^e]llo", "hello", False),
+            ("h[a-b]llo", "hbllo", True),
+            ("h\\*llo", "h*llo", True),
+            ("h\\*llo", "hello", False),
+            ("a.b", "axb", False),
+        ]
+        for pattern, key, expected in cases:
+            with self.subTest(pattern=pattern, key=key):
+                self.assertEqual(bool(redis_glob_to_regex(pattern).fullmatch(key)), expected)
+
+
+class InMemoryRedisCacheTests(BaseTestCase):
+    def setUp(self):
+        self.cache = InMemoryRedisCache("in-memory-redis-tests", {"KEY_PREFIX": "prefix"})
+        self.addCleanup(self.cache.clear)
+
+    def test_delete_pattern_only_removes_matching_keys(self):
+        self.cache.set("articles:item:1", 1)
+        self.cache.set("articles:item:2", 2)
+        self.cache.set("articles:other:1", 3)
+
+        self.assertEqual(self.cache.delete_pattern("articles:item:*"), 2)
+        self.assertEqual(self.cache.keys("articles:*"), ["articles:other:1"])
+
+    def test_ttl_expire_and_persist(self):
+        with patch("django.core.cache.backends.base.time.time", return_value=1000), \
+                patch("core.cache_backends.time.time", return_value=1000):
+            self.cache.set("key", 1, timeout=60)
+            self.assertEqual(self.cache.ttl("key"), 60)
+
+            self.cache.expire("key", 10)
+            self.assertEqual(self.cache.ttl("key"), 10)
+
+            self.cache.persist("key")
+            self.assertIsNone(self.cache.ttl("key"))
+
+        self.assertEqual(self.cache.ttl("missing"), 0)
+
+    def test_incr_keeps_ttl(self):
+        with patch("django.core.cache.backends.base.time.time", return_value=1000), \
+                patch("core.cache_backends.time.time", return_value=1000):
+            self.cache.set("counter", 1, timeout=60)
+            self.cache.incr("counter")
+            self.assertEqual(self.cache.ttl("counter"), 60)
+
+    def test_lock_is_exclusive_until_released(self):
+        first = self.cache.lock("lock", timeout=10)
+        second = self.cache.lock("lock", timeout=10)
+
+        self.assertTrue(first.acquire(blocking=False))
+        self.assertFalse(second.acquire(blocking=False))
+        self.assertTrue(first.owned())
+
+        first.release()
+        self.assertTrue(second.acquire(blocking=False))
+
+    def test_releasing_lock_taken_over_by_another_owner_fails(self):
+        lock = self.cache.lock("lock", timeout=10)
+        lock.acquire(blocking=False)
+        self.cache.delete("lock")
+        self.cache.lock("lock", timeout=10).acquire(blocking=False)
+
+        with self.assertRaises(LockNotOwnedError):
+            lock.release()
+
+    def test_pipeline_returns_results_in_order(self):
+        with self.cache.pipeline() as pipeline:
+            pipeline.set("key", 1).incr("key").get("key")
+            self.assertEqual(pipeline.execute(), [None, 2, 2])
+
+
+class DeleteCachePatternTests(BaseTestCase):
+    def test_delete_cache_pattern_works_with_test_cache(self):
+        set_cache(namespace="articles", entity="item", identifier=1, value="a")
+        set_cache(namespace="articles", entity="item", identifier=2, value="b")
+
+        delete_cache_pattern(namespace="articles", entity="item", identifier="*")
+
+        self.assertIsNone(get_cache(namespace="articles", entity="item", identifier=1))
+        self.assertIsNone(get_cache(namespace="articles", entity="item", identifier=2))
@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from core.tests.testcases import BaseTestCase
+from core.utils.cache import get_cache, get_many_cache, get_or_set_cache, set_cache
+from core.utils.cache_metrics import (
+    clear_request_tally,
+    get_cache_metrics,
+    get_request_tally,
+    start_request_tally,
+)
+
+
+class CacheMetricsTests(BaseTestCase):
+    def test_hits_and_misses_are_labelled_by_namespace_and_entity(self):
+        set_cache(namespace="articles", entity="item", identifier=1, value="a")
+
+        get_cache(namespace="articles", entity="item", identifier=1)
+        get_cache(namespace="articles", entity="item", identifier=2)
+        get_many_cache(namespace="articles", entity="item", identifiers=[1, 2, 3])
+
+        metrics = get_cache_metrics()["articles"]["item"]
+        self.assertEqual(metrics["hits"], 2)
+        self.assertEqual(metrics["misses"], 3)
+        self.assertEqual(metrics["hit_ratio"], 0.4)
+        self.assertEqual(metrics["latency"]["count"], 4)
+        self.assertEqual(sum(metrics["latency"]["buckets"].values()), 4)
+
+    def test_get_or_set_counts_a_miss_only_when_creator_runs(self):
+        for _ in range(3):
+            get_or_set_cache(namespace="articles", entity="item", identifier=1, creator=lambda: "a")
+
+        metrics = get_cache_metrics()["articles"]["item"]
+        self.assertEqual(metrics["hits"], 2)
+        self.assertEqual(metrics["misses"], 1)
+
+    @override_settings(CACHE_L1_NAMESPACES=["hot"])
+    def test_local_hits_are_counted_separately(self):
+        set_cache(namespace="hot", entity="item", identifier=1, value="a")
+
+        get_cache(namespace="hot", entity="item", identifier=1)
+        get_cache(namespace="hot", entity="item", identifier=1)
+
+        metrics = get_cache_metrics()["hot"]["item"]
+        self.assertEqual(metrics["hits"], 2)
+        self.assertEqual(metrics["local_hits"], 1)
+
+    @patch("core.utils.cache.cache.get", side_effect=ConnectionError)
+    def test_errors_are_counted_and_reraised(self, get_mock):
+        with self.assertRaises(ConnectionError):
+            get_cache(namespace="articles", entity="item", identifier=1)
+
+        self.assertEqual(get_cache_metrics()["articles"]["item"]["errors"], 1)
+
+    def test_request_tally_counts_calls_of_the_current_request(self):
+        get_cache(namespace="articles", entity="item", identifier=1)
+        start_request_tally()
+        self.addCleanup(clear_request_tally)
+
+        set_cache(namespace="articles", entity="item", identifier=1, value="a")
+        get_cache(namespace="articles", entity="item", identifier=1)
+
+        tally = get_request_tally()
+        self.assertEqual(tally["cache_calls"], 2)
+        self.assertEqual(tally["cache_hits"], 1)
+        self.assertEqual(tally["cache_misses"], 0)
@@ -0,0 +1,52 @@
+import json
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis.serializers.json import JSONSerializer
+
+from core.tests.testcases import BaseTestCase
+from core.utils.cache_serializers import (
+    HEADER_ORJSON,
+    HEADER_ORJSON_ZLIB,
+    ORJSONSerializer,
+)
+
+
+class ORJSONSerializerTests(BaseTestCase):
+    def setUp(self):
+        self.serializer = ORJSONSerializer({"SERIALIZER_COMPRESS_MIN_LENGTH": 100})
+
+    def test_small_value_is_not_compressed(self):
+        data = self.serializer.dumps({"a": 1})
+
+        self.assertTrue(data.startswith(HEADER_ORJSON))
+        self.assertEqual(self.serializer.loads(data), {"a": 1})
+
+    def test_large_value_is_compressed(self):
+        value = {"type": "doc", "content": [{"type": "paragraph", "text": "hello world"}] * 50}
+
+        data = self.serializer.dumps(value)
+
+        self.assertTrue(data.startswith(HEADER_ORJSON_ZLIB))
+        self.assertLess(len(data), len(json.dumps(value)))
+        self.assertEqual(self.serializer.loads(data), value)
+
+    def test_legacy_json_entries_are_still_readable(self):
+        legacy = JSONSerializer({}).dumps({"a": [1, "b"]})
+
+        self.assertEqual(self.serializer.loads(legacy), {"a": [1, "b"]})
+
+    def test_round_trip_matches_json_serializer(self):
+        value = {
+            "id": uuid.uuid4(),
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+            "price": Decimal("1.50"),
+            1: "non-string key",
+        }
+
+        self.assertEqual(
+            self.serializer.loads(self.serializer.dumps(value)),
+            json.loads(json.dumps(value, cls=DjangoJSONEncoder)),
+        )
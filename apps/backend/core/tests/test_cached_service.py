@@ -0,0 +1,47 @@
+from unittest.mock import Mock
+
+from core.tests.testcases import BaseTestCase
+from core.utils.cached_service import cached_service
+
+
+class CachedServiceTests(BaseTestCase):
+    def make_service(self, return_value, **kwargs):
+        lookup = Mock(return_value=return_value)
+
+        @cached_service(namespace="tests", timeout=60, **kwargs)
+        def get_value(user_id, *, verbose=False):
+            return lookup(user_id, verbose=verbose)
+
+        return get_value, lookup
+
+    def test_result_is_cached_by_arguments(self):
+        get_value, lookup = self.make_service("value")
+
+        self.assertEqual(get_value(1), "value")
+        self.assertEqual(get_value(1), "value")
+        self.assertEqual(get_value(1, verbose=True), "value")
+
+        self.assertEqual(lookup.call_count, 2)
+        self.assertEqual(get_value.cache_key(1), "tests:get_value:1:False")
+
+    def test_none_is_only_cached_with_negative_timeout(self):
+        get_value, lookup = self.make_service(None)
+        get_value(1)
+        get_value(1)
+        self.assertEqual(lookup.call_count, 2)
+
+        get_value, lookup = self.make_service(None, negative_timeout=60)
+        self.assertIsNone(get_value(1))
+        self.assertIsNone(get_value(1))
+        self.assertEqual(lookup.call_count, 1)
+
+    def test_invalidate_drops_one_call(self):
+        get_value, lookup = self.make_service("value")
+        get_value(1)
+        get_value(2)
+
+        get_value.invalidate(1)
+        get_value(1)
+        get_value(2)
+
+        self.assertEqual(lookup.call_count, 3)
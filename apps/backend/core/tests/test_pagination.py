@@ -1,6 +1,21 @@
+import base64
+import json
+from datetime import timedelta
 from types import SimpleNamespace
+from unittest.mock import patch
 
-from core.pagination import StandardPagination
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from articles.models import ArticleSnapshot
+from core.pagination import (
+    KeysetPagination,
+    StandardOrKeysetPagination,
+    StandardPagination,
+)
+from core.tests.factories import create_article_snapshot, create_source_article
 from core.tests.testcases import BaseTestCase
 
 
@@ -26,3 +41,94 @@ class StandardPaginationTests(BaseTestCase):
                 "results": [{"id": 1}, {"id": 2}],
             },
         )
+
+
+class KeysetPaginationTests(BaseTestCase):
+    def setUp(self):
+        article = create_source_article()
+        self.snapshots = [create_article_snapshot(article) for _ in range(5)]
+        # Two snapshots share a timestamp, so the id has to break the tie
+        now = timezone.now()
+        for offset, snapshot in zip((0, 1, 1, 2, 3), self.snapshots):
+            ArticleSnapshot.objects.filter(pk=snapshot.pk).update(created_at=now - timedelta(minutes=offset))
+        self.expected = list(ArticleSnapshot.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def paginate(self, **params):
+        paginator = KeysetPagination()
+        request = Request(APIRequestFactory().get('/', params))
+        page = paginator.paginate_queryset(ArticleSnapshot.objects.all(), request)
+        return [snapshot.id for snapshot in page], paginator.get_paginated_response([])
+
+    def test_walks_forward_and_backward_without_gaps(self):
+        first, payload = self.paginate(page_size=2)
+        self.assertEqual(first, self.expected[:2])
+        self.assertIsNone(payload["previous"])
+
+        second, payload = self.paginate(page_size=2, cursor=payload["next"])
+        self.assertEqual(second, self.expected[2:4])
+
+        third, last_payload = self.paginate(page_size=2, cursor=payload["next"])
+        self.assertEqual(third, self.expected[4:])
+        self.assertIsNone(last_payload["next"])
+
+        back, payload = self.paginate(page_size=2, cursor=last_payload["previous"])
+        self.assertEqual(back, self.expected[2:4])
+
+        back, payload = self.paginate(page_size=2, cursor=payload["previous"])
+        self.assertEqual(back, self.expected[:2])
+        self.assertIsNone(payload["previous"])
+
+    def test_response_keeps_the_envelope_shape(self):
+        _, payload = self.paginate(page_size=2)
+
+        self.assertEqual(set(payload), {"results", "page_size", "next", "previous"})
+        self.assertEqual(payload["page_size"], 2)
+
+    def test_approximate_count_falls_back_to_exact_count_outside_postgres(self):
+        with patch.object(KeysetPagination, 'approximate_count', True):
+            _, payload = self.paginate()
+
+        self.assertEqual(payload["approximate_count"], 5)
+
+    def test_invalid_cursor_raises_not_found(self):
+        with self.assertRaises(NotFound):
+            self.paginate(cursor="not-a-cursor")
+
+    def test_malformed_cursor_values_raise_not_found(self):
+        for values in (
+            [5, str(self.expected[0])],
+            ["2024-13-45T00:00:00+00:00", str(self.expected[0])],
+            [timezone.now().isoformat(), "not-a-uuid"],
+        ):
+            raw = json.dumps({"v": values, "r": False}).encode()
+            with self.subTest(values=values), self.assertRaises(NotFound):
+                self.paginate(cursor=base64.urlsafe_b64encode(raw).decode())
+
+
+class StandardOrKeysetPaginationTests(BaseTestCase):
+    def setUp(self):
+        article = create_source_article()
+        for _ in range(3):
+            create_article_snapshot(article)
+
+    def paginate(self, **params):
+        paginator = StandardOrKeysetPagination()
+        request = Request(APIRequestFactory().get('/', params))
+        page = paginator.paginate_queryset(ArticleSnapshot.objects.order_by('created_at'), request)
+        return page, paginator.get_paginated_response([])
+
+    def test_pages_by_number_without_a_cursor(self):
+        _, payload = self.paginate()
+
+        self.assertEqual(set(payload), {"count", "total_pages", "current_page", "page_size", "results"})
+        self.assertEqual(payload["count"], 3)
+
+    def test_pages_by_keyset_with_a_cursor(self):
+        page, payload = self.paginate(cursor="", page_size=2)
+
+        self.assertEqual(set(payload), {"results", "page_size", "next", "previous"})
+        self.assertEqual(len(page), 2)
+
+        page, payload = self.paginate(cursor=payload["next"], page_size=2)
+        self.assertEqual(len(page), 1)
+        self.assertIsNone(payload["next"])
@@ -0,0 +1,70 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+
+from core.tests.testcases import BaseTestCase
+from core.utils.cache import INCR_WITH_TTL_SCRIPT, get_key, incr_cache
+from core.utils.rate_limit import hit_sliding_window, take_token
+
+
+class IncrCacheTests(BaseTestCase):
+    def test_missing_key_is_created_with_timeout(self):
+        self.assertEqual(incr_cache(namespace="tests", entity="counter", identifier=1, timeout=60), 1)
+        self.assertEqual(incr_cache(namespace="tests", entity="counter", identifier=1, timeout=60), 2)
+
+    @patch.dict("core.utils.cache._lua_scripts", clear=True)
+    @patch("core.utils.cache.get_redis_client")
+    def test_redis_uses_one_atomic_script_call(self, get_redis_client_mock):
+        client = get_redis_client_mock.return_value
+        script = client.register_script.return_value = Mock(return_value=3)
+
+        value = incr_cache(namespace="tests", entity="counter", identifier=1, delta=2, timeout=60)
+
+        self.assertEqual(value, 3)
+        client.register_script.assert_called_once_with(INCR_WITH_TTL_SCRIPT)
+        script.assert_called_once_with(
+            keys=[str(cache.make_key(get_key("tests", "counter", 1)))], args=[2, 60], client=client,
+        )
+
+
+@patch("core.utils.rate_limit.time.time")
+class SlidingWindowTests(BaseTestCase):
+    def hit(self):
+        return hit_sliding_window(namespace="tests", entity="login", identifier="a", limit=3, window=60)
+
+    def test_hits_over_limit_are_rejected(self, time_mock):
+        time_mock.return_value = 600
+
+        results = [self.hit() for _ in range(4)]
+
+        self.assertEqual([result.allowed for result in results], [True, True, True, False])
+        self.assertEqual(results[2].remaining, 0)
+        self.assertEqual(results[3].retry_after, 60)
+
+    def test_previous_window_is_weighted_by_overlap(self, time_mock):
+        time_mock.return_value = 600
+        for _ in range(3):
+            self.hit()
+
+        # Halfway through the next window, 1.5 of the previous hits still count
+        time_mock.return_value = 690
+        self.assertTrue(self.hit().allowed)
+        self.assertFalse(self.hit().allowed)
+
+
+@patch("core.utils.rate_limit.time.time")
+class TokenBucketTests(BaseTestCase):
+    def take(self):
+        return take_token(namespace="tests", entity="upload", identifier="a", capacity=2, refill_rate=0.5)
+
+    def test_bucket_empties_then_refills(self, time_mock):
+        time_mock.return_value = 100
+        self.assertTrue(self.take().allowed)
+        self.assertTrue(self.take().allowed)
+
+        rejected = self.take()
+        self.assertFalse(rejected.allowed)
+        self.assertEqual(rejected.retry_after, 2)
+
+        time_mock.return_value = 102
+        self.assertTrue(self.take().allowed)
@@ -0,0 +1,57 @@
+import json
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+from core.tests.testcases import BaseTestCase
+
+
+class ORJSONRendererTests(BaseTestCase):
+    def setUp(self):
+        self.renderer = ORJSONRenderer()
+
+    def test_output_matches_json_renderer_for_plain_data(self):
+        data = {"success": True, "data": {"results": [{"title": "标题", "count": 1, "ratio": 0.5}]}}
+
+        self.assertEqual(
+            json.loads(self.renderer.render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_uuid_is_serialized_natively(self):
+        value = uuid.uuid4()
+
+        self.assertEqual(json.loads(self.renderer.render({"id": value})), {"id": str(value)})
+
+    def test_raw_datetimes_use_the_serializer_field_format(self):
+        value = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=UTC)
+        data = {"timestamp": value, "day": value.date()}
+
+        self.assertEqual(
+            json.loads(self.renderer.render(data)),
+            {"timestamp": serializers.DateTimeField().to_representation(value), "day": "2024-01-02"},
+        )
+        self.assertEqual(json.loads(self.renderer.render(data))["timestamp"], "2024-01-02T03:04:05+0000")
+
+    def test_unknown_types_fall_back_to_drf_encoder(self):
+        data = {"price": Decimal("1.5"), "label": _("user")}
+
+        self.assertEqual(json.loads(self.renderer.render(data)), {"price": 1.5, "label": "user"})
+
+    def test_line_and_paragraph_separators_are_escaped(self):
+        rendered = self.renderer.render({"text": "a b c"})
+
+        self.assertEqual(rendered, b'{"text":"a\\u2028b\\u2029c"}')
+
+    def test_indent_is_applied_when_requested(self):
+        rendered = self.renderer.render({"a": 1}, accepted_media_type="application/json; indent=4")
+
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(self.renderer.render(None), b"")
@@ -0,0 +1,153 @@
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from articles.models import ArticleEvent, SourceArticle
+from articles.serializers import (
+    ArticleEventSerializer,
+    ArticleSnapshotSerializer,
+    PublishedArticleSerializer,
+    SourceArticleReadSerializer,
+)
+from core.serializers import FlatRepresentationMixin, QueryPlan, plan_queryset
+from core.tests.factories import (
+    create_article_snapshot,
+    create_moderator,
+    create_published_article,
+    create_source_article,
+    create_user,
+)
+from core.tests.testcases import BaseTestCase
+from users.serializers import UserListSerializer
+
+User = get_user_model()
+
+
+class _ArticleSerializer(FlatRepresentationMixin, serializers.ModelSerializer):
+    author_username = serializers.CharField(source="author.username", read_only=True)
+    status_label = serializers.CharField(source="get_status_display", read_only=True)
+    status_display = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SourceArticle
+        fields = "__all__"
+
+    def get_status_display(self, obj):
+        return obj.get_status_display()
+
+
+class FlatRepresentationTests(BaseTestCase):
+    def setUp(self):
+        self.moderator = create_moderator()
+        self.article = create_source_article(last_moderation_at=None)
+        self.snapshot = create_article_snapshot(self.article)
+        self.published = create_published_article(self.article)
+        self.events = [
+            ArticleEvent.objects.create(
+                source_article=self.article,
+                article_snapshot=self.snapshot,
+                event_type=ArticleEvent.EventType.APPROVE,
+                actor=self.moderator,
+                annotation="Looks good",
+            ),
+            # Nullable foreign keys and fields
+            ArticleEvent.objects.create(
+                source_article=self.article,
+                event_type=ArticleEvent.EventType.DELETE,
+                actor=self.article.author,
+            ),
+        ]
+        request = Request(APIRequestFactory().get("/"))
+        request.user = self.moderator
+        self.context = {"request": request}
+
+    def assert_same_as_drf(self, serializer_class, instances):
+        serializer = serializer_class(instances, many=True, context=self.context)
+        expected = [
+            serializers.ModelSerializer.to_representation(serializer.child, instance)
+            for instance in instances
+        ]
+
+        self.assertEqual(serializer.data, expected)
+        # Types matter too, e.g. UUIDs rendered as strings or kept as UUID objects
+        for flat_item, expected_item in zip(serializer.data, expected):
+            for key, value in expected_item.items():
+                self.assertIs(type(flat_item[key]), type(value), key)
+
+    def test_output_is_identical_for_the_read_only_serializers(self):
+        self.assert_same_as_drf(PublishedArticleSerializer, [self.published])
+        self.assert_same_as_drf(ArticleSnapshotSerializer, [self.snapshot])
+        self.assert_same_as_drf(ArticleEventSerializer, self.events)
+        self.assert_same_as_drf(UserListSerializer, [self.moderator, create_user(signature="")])
+
+    def test_fields_it_cannot_compile_fall_back_to_drf(self):
+        self.assert_same_as_drf(_ArticleSerializer, [self.article])
+
+    def test_mappings_use_the_generic_path(self):
+        data = {"id": self.snapshot.id, "title": "From a dict"}
+
+        representation = PublishedArticleSerializer(context=self.context).to_representation(data)
+
+        self.assertEqual(representation["title"], "From a dict")
+
+
+class _AuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ("id", "username")
+
+
+class _NestedArticleSerializer(serializers.ModelSerializer):
+    author = _AuthorSerializer(read_only=True)
+    article_snapshots = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = SourceArticle
+        fields = ("id", "title", "author", "article_snapshots")
+
+
+class _OpaqueArticleSerializer(serializers.ModelSerializer):
+    author_username = serializers.CharField(source="author.username", read_only=True)
+    teaser = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SourceArticle
+        fields = ("id", "author_username", "teaser")
+
+    def get_teaser(self, obj):
+        return f"{obj.title} by {obj.author.email}"
+
+
+class PlanQuerysetTests(BaseTestCase):
+    def test_dotted_sources_are_joined_with_only_the_read_columns(self):
+        plan = plan_queryset(SourceArticleReadSerializer())
+
+        self.assertEqual(plan.select_related, ("author",))
+        self.assertEqual(plan.prefetch_related, ())
+        self.assertIn("author__password", plan.deferred)
+        self.assertNotIn("author__username", plan.deferred)
+
+    def test_foreign_keys_read_as_primary_keys_are_not_joined(self):
+        plan = plan_queryset(ArticleEventSerializer())
+
+        self.assertEqual(plan, QueryPlan(select_related=(), prefetch_related=(), deferred=()))
+
+    def test_snapshot_content_is_joined_from_its_blob(self):
+        plan = plan_queryset(ArticleSnapshotSerializer())
+
+        self.assertEqual(plan.select_related, ("blob",))
+        self.assertEqual(set(plan.deferred), {"blob__ref_count", "blob__created_at", "blob__depth"})
+
+    def test_nested_serializers_are_joined_and_many_relations_prefetched(self):
+        plan = plan_queryset(_NestedArticleSerializer())
+
+        self.assertEqual(plan.select_related, ("author",))
+        self.assertEqual(plan.prefetch_related, ("article_snapshots",))
+        self.assertNotIn("author__username", plan.deferred)
+
+    def test_undeclared_method_fields_keep_every_joined_column(self):
+        plan = plan_queryset(_OpaqueArticleSerializer())
+
+        self.assertEqual(plan.select_related, ("author",))
+        self.assertEqual(plan.deferred, ())
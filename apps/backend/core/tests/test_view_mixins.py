@@ -1,15 +1,33 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.http import StreamingHttpResponse
 from django.urls import path
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
 
 from rest_framework import serializers, status
 from rest_framework.test import APIRequestFactory
 from rest_framework.viewsets import GenericViewSet
 
+import json
+import time
+from typing import ClassVar
+from unittest.mock import patch
+
 from articles.models import SourceArticle
 from core.pagination import StandardPagination
+from core.tests.factories import create_source_article, create_user
 from core.tests.testcases import BaseTestCase
-from core.views.mixins import FormattedResponseMixin, MyListModelMixin
+from core.views.mixins import (
+    FormattedResponseMixin,
+    MyBulkModelMixin,
+    MyListModelMixin,
+    MyRetrieveModelMixin,
+    QueryPlanningMixin,
+    SparseFieldsetMixin,
+)
 
 
 User = get_user_model()
@@ -30,6 +48,24 @@ class _PaginatedArticleViewSet(FormattedResponseMixin, MyListModelMixin, Generic
         return SourceArticle.objects.order_by("created_at")
 
 
+class _ConditionalArticleViewSet(FormattedResponseMixin, MyListModelMixin, MyRetrieveModelMixin, GenericViewSet):
+    serializer_class = _SourceArticleSerializer
+    permission_classes = ()
+    queryset = SourceArticle.objects.order_by("created_at")
+
+
+class _UnconditionalArticleViewSet(_ConditionalArticleViewSet):
+    conditional_get = False
+
+
+class _SingleArticlePagination(StandardPagination):
+    page_size = 1
+
+
+class _SingleArticlePageViewSet(_ConditionalArticleViewSet):
+    pagination_class = _SingleArticlePagination
+
+
 urlpatterns = [
     path(
         "test-articles/",
@@ -64,3 +100,348 @@ class MyListModelMixinTests(BaseTestCase):
         self.assertEqual(response.data["data"]["count"], 25)
         self.assertEqual(response.data["data"]["current_page"], 2)
         self.assertEqual(len(response.data["data"]["results"]), 5)
+
+
+class ConditionalGetTests(BaseTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="viewer", password="secret123")
+        self.article = SourceArticle.objects.create(author=self.user, title="Article", content={})
+
+    def get(self, viewset=_ConditionalArticleViewSet, action="list", path="/test-articles/", user=None, **headers):
+        request = self.factory.get(path, headers=headers)
+        request.user = user or self.user
+        kwargs = {} if action == "list" else {"pk": self.article.pk}
+        return viewset.as_view({"get": action})(request, **kwargs)
+
+    def test_unchanged_list_returns_304_without_serializing(self):
+        etag = self.get()["ETag"]
+
+        # The page's count and rows, the ETag is built from them
+        with self.assertNumQueries(2):
+            response = self.get(**{"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_list_etag_costs_no_extra_query(self):
+        with CaptureQueriesContext(connection) as plain:
+            self.get(viewset=_UnconditionalArticleViewSet)
+        with CaptureQueriesContext(connection) as conditional:
+            response = self.get()
+
+        self.assertIn("ETag", response)
+        self.assertEqual(len(conditional), len(plain))
+
+    def test_list_etag_changes_when_a_row_on_another_page_is_deleted(self):
+        SourceArticle.objects.create(author=self.user, title="Newer", content={})
+        etag = self.get(viewset=_SingleArticlePageViewSet)["ETag"]
+        SourceArticle.objects.exclude(pk=self.article.pk).hard_delete()
+
+        response = self.get(viewset=_SingleArticlePageViewSet, **{"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_when_a_row_changes(self):
+        etag = self.get()["ETag"]
+        self.article.title = "Changed"
+        self.article.save()
+
+        response = self.get(**{"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_changes_when_a_row_is_deleted(self):
+        SourceArticle.objects.create(author=self.user, title="Older", content={})
+        etag = self.get()["ETag"]
+        SourceArticle.objects.exclude(pk=self.article.pk).hard_delete()
+
+        self.assertEqual(self.get(**{"If-None-Match": etag}).status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_the_path_and_the_user(self):
+        etag = self.get()["ETag"]
+
+        self.assertEqual(
+            self.get(path="/test-articles/?page_size=1", **{"If-None-Match": etag}).status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(self.get(user=AnonymousUser(), **{"If-None-Match": etag}).status_code, status.HTTP_200_OK)
+
+    def test_list_ignores_if_modified_since(self):
+        response = self.get()
+        self.assertNotIn("Last-Modified", response)
+
+        response = self.get(**{"If-Modified-Since": http_date(time.time() + 60)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unchanged_object_returns_304_for_if_modified_since(self):
+        last_modified = self.get(action="retrieve")["Last-Modified"]
+
+        response = self.get(action="retrieve", **{"If-Modified-Since": last_modified})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["Last-Modified"], last_modified)
+        self.assertIn("ETag", response)
+
+    def test_views_can_opt_out(self):
+        response = self.get(viewset=_UnconditionalArticleViewSet, action="retrieve")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", response)
+
+
+class _FullSourceArticleSerializer(serializers.ModelSerializer):
+    status_display = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SourceArticle
+        fields = ("id", "title", "content", "status", "status_display")
+        method_field_sources: ClassVar[dict[str, list[str]]] = {"status_display": ["status"]}
+
+    def get_status_display(self, obj):
+        return obj.get_status_display()
+
+
+class _SparseArticleViewSet(SparseFieldsetMixin, _ConditionalArticleViewSet):
+    serializer_class = _FullSourceArticleSerializer
+
+
+class SparseFieldsetTests(BaseTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="viewer", password="secret123")
+        self.article = SourceArticle.objects.create(author=self.user, title="Article", content={"big": "doc"})
+
+    def get(self, query, action="list"):
+        request = self.factory.get(f"/test-articles/?{query}")
+        request.user = self.user
+        kwargs = {} if action == "list" else {"pk": self.article.pk}
+        with CaptureQueriesContext(connection) as queries:
+            response = _SparseArticleViewSet.as_view({"get": action})(request, **kwargs)
+        return response, " ".join(query["sql"] for query in queries)
+
+    def test_fields_prunes_the_representation_and_the_columns(self):
+        response, sql = self.get("fields=id,title")
+
+        self.assertEqual(set(response.data["data"]["results"][0]), {"id", "title"})
+        self.assertNotIn('"content"', sql)
+
+    def test_exclude_keeps_columns_read_by_method_fields(self):
+        response, sql = self.get("exclude=content,status", action="retrieve")
+
+        self.assertEqual(set(response.data["data"]), {"id", "title", "status_display"})
+        self.assertEqual(response.data["data"]["status_display"], self.article.get_status_display())
+        self.assertNotIn('"content"', sql)
+
+    def test_unknown_field_is_rejected(self):
+        response, _ = self.get("fields=id,nope")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class _StreamingArticleViewSet(_ConditionalArticleViewSet):
+    ndjson_streaming = True
+    ndjson_chunk_size = 2
+
+
+class NDJSONStreamingTests(BaseTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="viewer", password="secret123")
+        for index in range(5):
+            SourceArticle.objects.create(author=self.user, title=f"Article {index}", content={})
+
+    def get(self, viewset, query):
+        request = self.factory.get(f"/test-articles/?{query}")
+        request.user = self.user
+        return viewset.as_view({"get": "list"})(request)
+
+    def test_streams_every_row_in_chunks(self):
+        response = self.get(_StreamingArticleViewSet, "stream=ndjson")
+
+        chunks = list(response.streaming_content)
+        titles = [json.loads(line)["title"] for line in b"".join(chunks).splitlines()]
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(titles, [f"Article {index}" for index in range(5)])
+
+    def test_streaming_is_opt_in(self):
+        response = self.get(_ConditionalArticleViewSet, "stream=ndjson")
+
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertIn("data", response.data)
+
+
+class _BulkArticleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SourceArticle
+        fields = ("id", "title", "content", "updated_at")
+        read_only_fields = ("updated_at",)
+
+
+class _BulkArticleViewSet(MyBulkModelMixin, FormattedResponseMixin, GenericViewSet):
+    serializer_class = _BulkArticleSerializer
+    permission_classes = ()
+
+    def get_queryset(self):
+        return SourceArticle.objects.filter(author=self.request.user)
+
+    def perform_bulk_create(self, serializer):
+        serializer.save(author=self.request.user)
+
+
+class MyBulkModelMixinTests(BaseTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username="viewer", password="secret123")
+        self.other_user = User.objects.create_user(username="other", password="secret123")
+        self.articles = [
+            SourceArticle.objects.create(author=self.user, title=f"Article {index}", content={})
+            for index in range(2)
+        ]
+
+    def call(self, method, action, data):
+        request = getattr(self.factory, method)("/test-articles/", data, format="json")
+        request.user = self.user
+        with CaptureQueriesContext(connection) as queries:
+            response = _BulkArticleViewSet.as_view({method: action})(request)
+        return response, [query["sql"].split()[0] for query in queries]
+
+    def test_bulk_create_inserts_every_item_in_one_query(self):
+        response, statements = self.call(
+            "post", "bulk_create", [{"title": "New 1", "content": {}}, {"title": "New 2", "content": {}}],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["code"], "bulk_created")
+        self.assertEqual([item["title"] for item in response.data["data"]], ["New 1", "New 2"])
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertEqual(SourceArticle.objects.filter(author=self.user).count(), 4)
+
+    def test_bulk_create_reports_errors_per_item_and_writes_nothing(self):
+        response, _ = self.call(
+            "post", "bulk_create", [{"title": "Valid", "content": {}}, {"title": "x" * 61, "content": {}}],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0], {})
+        self.assertIn("title", response.data["errors"][1])
+        self.assertEqual(SourceArticle.objects.count(), 2)
+
+    def test_bulk_update_writes_every_item_in_one_query(self):
+        previous_updated_at = self.articles[0].updated_at
+
+        response, statements = self.call(
+            "patch", "bulk_update",
+            [{"id": str(article.id), "title": f"Renamed {index}"} for index, article in enumerate(self.articles)],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.articles[0].refresh_from_db()
+        self.assertEqual(self.articles[0].title, "Renamed 0")
+        self.assertGreater(self.articles[0].updated_at, previous_updated_at)
+
+    def test_bulk_update_rejects_objects_outside_the_queryset(self):
+        foreign = SourceArticle.objects.create(author=self.other_user, title="Foreign", content={})
+
+        response, _ = self.call(
+            "patch", "bulk_update",
+            [{"id": str(self.articles[0].id), "title": "Renamed"}, {"id": str(foreign.id), "title": "Stolen"}],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.title, "Foreign")
+
+    def test_bulk_delete_reports_per_item_results(self):
+        foreign = SourceArticle.objects.create(author=self.other_user, title="Foreign", content={})
+
+        response, _ = self.call("post", "bulk_delete", [str(self.articles[0].id), str(foreign.id), "not-an-id"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["deleted"] for item in response.data["data"]], [True, False, False])
+        self.assertFalse(SourceArticle.objects.filter(pk=self.articles[0].pk).exists())
+        self.assertTrue(SourceArticle.objects.filter(pk=foreign.pk).exists())
+
+    def test_bulk_delete_reports_non_canonical_uuids_as_deleted(self):
+        primary_key = self.articles[0].id.hex.upper()
+
+        response, _ = self.call("post", "bulk_delete", [primary_key])
+
+        self.assertEqual(response.data["data"], [{"id": primary_key, "deleted": True}])
+        self.assertFalse(SourceArticle.objects.filter(pk=self.articles[0].pk).exists())
+
+    def test_bulk_create_rejects_too_many_items(self):
+        with patch.object(_BulkArticleViewSet, "bulk_max_items", 1):
+            response, _ = self.call(
+                "post", "bulk_create", [{"title": "New 1", "content": {}}, {"title": "New 2", "content": {}}],
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(SourceArticle.objects.count(), 2)
+
+
+class _PlannedArticleSerializer(serializers.ModelSerializer):
+    author_username = serializers.CharField(source="author.username", read_only=True)
+
+    class Meta:
+        model = SourceArticle
+        fields = ("id", "title", "author_username")
+
+
+class _PlannedArticleViewSet(QueryPlanningMixin, FormattedResponseMixin, MyListModelMixin, GenericViewSet):
+    serializer_class = _PlannedArticleSerializer
+    permission_classes = ()
+    queryset = SourceArticle.objects.all()
+    conditional_get = False
+
+
+class QueryPlanningTests(BaseTestCase):
+    def list(self):
+        request = APIRequestFactory().get("/test-articles/")
+        request.user = AnonymousUser()
+        return _PlannedArticleViewSet.as_view({"get": "list"})(request)
+
+    def test_list_runs_a_constant_number_of_queries(self):
+        for index in range(2):
+            create_source_article(author=create_user(), title=f"Article {index}")
+        with CaptureQueriesContext(connection) as few:
+            self.list()
+
+        for index in range(5):
+            create_source_article(author=create_user(), title=f"More {index}")
+        with CaptureQueriesContext(connection) as many:
+            response = self.list()
+
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(len(response.data["data"]["results"]), 7)
+        self.assertTrue(response.data["data"]["results"][0]["author_username"].startswith("user-"))
+
+    def test_plans_follow_the_fields_of_each_request(self):
+        class UserDependentSerializer(_PlannedArticleSerializer):
+            def get_fields(self):
+                fields = super().get_fields()
+                if not self.context["request"].user.is_authenticated:
+                    fields.pop("author_username")
+                return fields
+
+        class UserDependentViewSet(_PlannedArticleViewSet):
+            serializer_class = UserDependentSerializer
+
+        def list_as(user):
+            request = APIRequestFactory().get("/test-articles/")
+            request.user = user
+            return UserDependentViewSet.as_view({"get": "list"})(request)
+
+        for index in range(3):
+            create_source_article(author=create_user(), title=f"Article {index}")
+        self.assertNotIn("author_username", list_as(AnonymousUser()).data["data"]["results"][0])
+
+        user = create_user()
+        with CaptureQueriesContext(connection) as queries:
+            response = list_as(user)
+
+        self.assertTrue(response.data["data"]["results"][0]["author_username"].startswith("user-"))
+        # The author is joined rather than fetched once per article
+        self.assertLess(len(queries), 3)
@@ -2,6 +2,8 @@ from django.test import TestCase
 from django.core.cache import cache
 from rest_framework.test import APITestCase
 
+from core.utils.cache_metrics import reset_cache_metrics
+from core.utils.local_cache import clear_local_cache
 from .mixins import (
     APIClientMixin,
     StandardResponseAssertionsMixin,
@@ -17,6 +19,8 @@ class BaseTestCase(UUIDAssertionsMixin,
     def _pre_setup(self):
         super()._pre_setup()
         cache.clear()
+        clear_local_cache()
+        reset_cache_metrics()
 
 
 class BaseAPITestCase(UUIDAssertionsMixin,
@@ -29,3 +33,5 @@ class BaseAPITestCase(UUIDAssertionsMixin,
     def _pre_setup(self):
         super()._pre_setup()
         cache.clear()
+        clear_local_cache()
+        reset_cache_metrics()
@@ -0,0 +1,69 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Length, Upper
+
+from .cache import get_or_set_cache
+
+
+def _normalize_query(query):
+    return " ".join(query.split())[:settings.AUTOCOMPLETE_MAX_QUERY_LENGTH]
+
+
+def find_matches(*, queryset, field, query, limit):
+    """
+    Return up to 'limit' rows as {'id', <field>} dicts, prefix matches first.
+
+    On PostgreSQL, both the prefix match (LIKE) and the fuzzy match (pg_trgm '%')
+    on UPPER(<field>) are served by a 'gin_trgm_ops' index on that expression,
+    and fuzzy matches are ranked by trigram similarity.
+    """
+    query = _normalize_query(query)
+    if not query:
+        return []
+
+    needle = query.upper()
+    queryset = queryset.annotate(autocomplete_value=Upper(field))
+    is_prefix = Case(
+        When(autocomplete_value__startswith=needle, then=Value(1)), default=Value(0), output_field=IntegerField(),
+    )
+
+    if connections[queryset.db].vendor == 'postgresql':
+        queryset = queryset.filter(
+            Q(autocomplete_value__startswith=needle) | Q(autocomplete_value__trigram_similar=needle)
+        ).annotate(
+            is_prefix=is_prefix, similarity=TrigramSimilarity('autocomplete_value', needle),
+        ).order_by('-is_prefix', '-similarity', Length(field), field)
+    else:
+        queryset = queryset.filter(autocomplete_value__contains=needle).annotate(
+            is_prefix=is_prefix,
+        ).order_by('-is_prefix', Length(field), field)
+
+    return [
+        {'id': str(pk), field: value}
+        for pk, value in queryset.values_list('pk', field)[:limit]
+    ]
+
+
+def autocomplete(*, queryset, field, query, limit, namespace, entity):
+    """
+    find_matches(), cached for AUTOCOMPLETE_CACHE_TIMEOUT seconds per (query, limit),
+    so popular prefixes typed by many users at once hit the database once.
+    The queryset must not depend on the user.
+    """
+    limit = max(1, min(limit, settings.AUTOCOMPLETE_MAX_RESULTS))
+    query = _normalize_query(query)
+    if not query:
+        return []
+
+    # User input may contain anything, hash it into a safe key
+    identifier = hashlib.blake2b(f"{limit}:{query.upper()}".encode(), digest_size=16).hexdigest()
+
+    return get_or_set_cache(
+        namespace=namespace, entity=entity, identifier=identifier,
+        creator=lambda: find_matches(queryset=queryset, field=field, query=query, limit=limit),
+        timeout=settings.AUTOCOMPLETE_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,50 @@
+import random
+
+WORDS = [
+    "alien", "commons", "server", "world", "block", "redstone", "farm", "build", "chunk", "mob", "spawn", "player",
+    "village", "trade", "potion", "enchant", "tower", "bridge", "castle", "railway", "portal", "nether", "end",
+]
+
+
+def make_paragraph(rng):
+    """
+    Build a paragraph of 20 to 80 random words.
+    """
+    text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 80)))
+    return {"type": "paragraph", "content": [{"type": "text", "text": text}]}
+
+
+def make_tiptap_document(*, blocks, seed=0):
+    """
+    Build a TipTap document shaped like a typical article:
+    headings, formatted paragraphs, images and lists.
+    """
+    rng = random.Random(seed)
+    content = []
+
+    for index in range(blocks):
+        kind = index % 10
+        if kind == 0:
+            content.append({
+                "type": "heading",
+                "attrs": {"level": 2},
+                "content": [{"type": "text", "text": " ".join(rng.sample(WORDS, 4))}],
+            })
+        elif kind == 5:
+            content.append({
+                "type": "image",
+                "attrs": {"src": f"/media/articles/{rng.getrandbits(64):016x}.png", "alt": None, "title": None},
+            })
+        elif kind == 7:
+            content.append({
+                "type": "bulletList",
+                "content": [{"type": "listItem", "content": [make_paragraph(rng)]} for _ in range(3)],
+            })
+        else:
+            paragraph = make_paragraph(rng)
+            paragraph["content"].append({
+                "type": "text", "marks": [{"type": "bold"}], "text": rng.choice(WORDS),
+            })
+            content.append(paragraph)
+
+    return {"type": "doc", "content": content}
@@ -1,25 +1,154 @@
+import math
+import random
+import time
+
+from django.conf import settings
 from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from redis.exceptions import LockNotOwnedError, RedisError
+
+from logs.logging import get_logger
+
+from .cache_metrics import instrument_cache_helper, record_lookups
+from .local_cache import (
+    get_local_cache,
+    get_redis_client,
+    publish_invalidation,
+    uses_local_cache,
+)
+
+logger = get_logger(__name__)
+
+# INCRBY, and set the TTL only if the key has none yet (i.e. it was just created)
+INCR_WITH_TTL_SCRIPT = """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if tonumber(ARGV[2]) > 0 and redis.call('TTL', KEYS[1]) == -1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return value
+"""
+
+_lua_scripts = {}
+
+
+def _uses_generations(namespace):
+    """
+    Check whether keys of a namespace embed a generation counter.
+    """
+    return namespace in settings.CACHE_VERSIONED_NAMESPACES
+
+
+def _get_generation_key(namespace, entity):
+    return f"cache_generation:{namespace}:{entity}"
+
+
+def _get_generation(namespace, entity):
+    """
+    Return the current generation of (namespace, entity).
+    Generations are looked up in worker memory first and bumps are published
+    like any other local cache invalidation.
+    """
+    generation_key = _get_generation_key(namespace, entity)
+    local_cache = get_local_cache()
+
+    generation = local_cache.get(generation_key)
+    if generation is not None:
+        return generation
+
+    generation = cache.get(generation_key)
+    if generation is None:
+        # Seed with a timestamp instead of 0, so a counter lost to eviction
+        # never brings an older generation (and its keys) back to life
+        cache.add(generation_key, time.time_ns(), timeout=None)
+        generation = cache.get(generation_key)
+
+    local_cache.set(generation_key, generation)
+
+    return generation
 
 
 def get_key(namespace, entity, identifier):
     """
     Generate a standard cache key. All cache keys should be generated using this function.
     e.g. key("article", "slug", slug) -> "article:slug:name-of-the-article"
+    Namespaces listed in CACHE_VERSIONED_NAMESPACES also embed the entity's generation,
+    e.g. "article:slug:v1700000000000000000:name-of-the-article".
     """
-    key = f"{namespace}:{entity}:{identifier}"
+    if _uses_generations(namespace):
+        generation = _get_generation(namespace, entity)
+        key = f"{namespace}:{entity}:v{generation}:{identifier}"
+    else:
+        key = f"{namespace}:{entity}:{identifier}"
 
     return key
 
 
+def _get_keys(namespace, entity, identifiers):
+    """
+    Map the keys of many identifiers back to those identifiers,
+    looking up the generation only once.
+    """
+    if _uses_generations(namespace):
+        generation = _get_generation(namespace, entity)
+        return {f"{namespace}:{entity}:v{generation}:{identifier}": identifier for identifier in identifiers}
+
+    return {get_key(namespace, entity, identifier): identifier for identifier in identifiers}
+
+
+@instrument_cache_helper
+def invalidate_cache_namespace(*, namespace, entity):
+    """
+    Invalidate every key of (namespace, entity) in O(1) by moving to a new generation.
+    Keys of older generations are never read again and age out through their TTLs,
+    so values in a versioned namespace should always be stored with a timeout.
+    Return the new generation.
+    """
+    if not _uses_generations(namespace):
+        raise ImproperlyConfigured(
+            f"Cache namespace '{namespace}' is not listed in CACHE_VERSIONED_NAMESPACES."
+        )
+
+    generation_key = _get_generation_key(namespace, entity)
+    try:
+        generation = cache.incr(generation_key)
+    except ValueError:
+        # The counter does not exist yet (or was evicted)
+        cache.add(generation_key, time.time_ns(), timeout=None)
+        generation = cache.incr(generation_key)
+
+    publish_invalidation(generation_key)
+
+    return generation
+
+
+@instrument_cache_helper
 def get_cache(*, namespace, entity, identifier):
     """
     Retrieve a value using the corresponding key.
+    Namespaces listed in CACHE_L1_NAMESPACES are served from worker memory first.
     """
     key = get_key(namespace, entity, identifier)
 
-    return cache.get(key)
+    if not uses_local_cache(namespace):
+        value = cache.get(key)
+        record_lookups(namespace, entity, hits=value is not None, misses=value is None)
+        return value
+
+    local_cache = get_local_cache()
+    value = local_cache.get(key)
+    if value is not None:
+        record_lookups(namespace, entity, hits=1, local_hits=1)
+        return value
 
+    value = cache.get(key)
+    if value is not None:
+        local_cache.set(key, value)
+    record_lookups(namespace, entity, hits=value is not None, misses=value is None)
 
+    return value
+
+
+@instrument_cache_helper
 def add_cache(*, namespace, entity, identifier, value, timeout=None):
     """
     Only add a key-value pair when the key does not exist,
@@ -28,9 +157,14 @@ def add_cache(*, namespace, entity, identifier, value, timeout=None):
     """
     key = get_key(namespace, entity, identifier)
 
-    return cache.add(key, value, timeout=timeout)
+    success = cache.add(key, value, timeout=timeout)
+    if success and uses_local_cache(namespace):
+        publish_invalidation(key)
 
+    return success
 
+
+@instrument_cache_helper
 def set_cache(*, namespace, entity, identifier, value, timeout=None):
     """
     Set a key-value pair, no matter whether the key exists.
@@ -38,9 +172,14 @@ def set_cache(*, namespace, entity, identifier, value, timeout=None):
     """
     key = get_key(namespace, entity, identifier)
 
-    return cache.set(key, value, timeout=timeout)
+    result = cache.set(key, value, timeout=timeout)
+    if uses_local_cache(namespace):
+        publish_invalidation(key)
+
+    return result
 
 
+@instrument_cache_helper
 def delete_cache(*, namespace, entity, identifier):
     """
     Delete a key-value pair.
@@ -48,35 +187,289 @@ def delete_cache(*, namespace, entity, identifier):
     """
     key = get_key(namespace, entity, identifier)
 
-    return cache.delete(key)
+    result = cache.delete(key)
+    if uses_local_cache(namespace):
+        publish_invalidation(key)
+
+    return result
+
+
+@instrument_cache_helper
+def get_many_cache(*, namespace, entity, identifiers):
+    """
+    Retrieve many values of one entity in a single round trip (MGET with django-redis).
+    Return a dict keyed by identifier; missing keys are left out.
+    """
+    keys = _get_keys(namespace, entity, identifiers)
+    if not keys:
+        return {}
+
+    if not uses_local_cache(namespace):
+        values = cache.get_many(list(keys))
+        record_lookups(namespace, entity, hits=len(values), misses=len(keys) - len(values))
+        return {keys[key]: value for key, value in values.items()}
+
+    local_cache = get_local_cache()
+    result = {}
+    missing_keys = []
+    for key, identifier in keys.items():
+        value = local_cache.get(key)
+        if value is None:
+            missing_keys.append(key)
+        else:
+            result[identifier] = value
+    local_hits = len(result)
+
+    if missing_keys:
+        for key, value in cache.get_many(missing_keys).items():
+            local_cache.set(key, value)
+            result[keys[key]] = value
+
+    record_lookups(
+        namespace, entity, hits=len(result), misses=len(keys) - len(result), local_hits=local_hits
+    )
+
+    return result
+
+
+@instrument_cache_helper
+def set_many_cache(*, namespace, entity, values, timeout=None):
+    """
+    Set many values of one entity in a single round trip (one pipeline with django-redis).
+    'values' is a dict keyed by identifier.
+    Return the identifiers that failed to be stored, like cache.set_many().
+    """
+    keys = _get_keys(namespace, entity, values)
+    if not keys:
+        return []
+
+    failed_keys = cache.set_many(
+        {key: values[identifier] for key, identifier in keys.items()}, timeout=timeout
+    )
+    if uses_local_cache(namespace):
+        publish_invalidation(*keys)
+
+    return [keys[key] for key in failed_keys or []]
 
 
+@instrument_cache_helper
+def delete_many_cache(*, namespace, entity, identifiers):
+    """
+    Delete many values of one entity in a single round trip.
+    """
+    keys = list(_get_keys(namespace, entity, identifiers))
+    if not keys:
+        return None
+
+    result = cache.delete_many(keys)
+    if uses_local_cache(namespace):
+        publish_invalidation(*keys)
+
+    return result
+
+
+def run_lua_script(source, *, keys, args):
+    """
+    Run a Lua script atomically on the Redis server behind the default cache.
+    'keys' are standard keys (from get_key), prefixed here like any other cache key.
+    Return None if the cache backend is not django-redis, so callers can fall back.
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    script = _lua_scripts.get(source)
+    if script is None:
+        # EVALSHA first, the script body is only sent again after a NOSCRIPT error
+        script = _lua_scripts[source] = client.register_script(source)
+
+    return script(keys=[str(cache.make_key(key)) for key in keys], args=args, client=client)
+
+
+@instrument_cache_helper
 def incr_cache(*, namespace, entity, identifier, delta=1, timeout=None):
     """
     Increase a number in cache. If not exist, create it as 0 then increment.
+    With Redis this is one atomic round trip, and 'timeout' only applies to a new key,
+    so later increments do not extend its lifetime.
     """
     key = get_key(namespace, entity, identifier)
-    try:
-        return cache.incr(key, delta)
-    except ValueError:
-        # key not found or not int
+
+    value = run_lua_script(INCR_WITH_TTL_SCRIPT, keys=[key], args=[delta, timeout or 0])
+    if value is None:
+        # Not Redis (e.g. the local memory cache in tests)
         cache.add(key, 0, timeout=timeout)
-        return cache.incr(key, delta)
+        value = cache.incr(key, delta)
+
+    if uses_local_cache(namespace):
+        publish_invalidation(key)
+
+    return value
+
+
+def get_cache_lock(*, namespace, entity, identifier, timeout):
+    """
+    Return a distributed lock stored under a standard cache key.
+    With django-redis, ``cache.lock`` returns a redis-py Lock,
+    which can be used as a context manager or through acquire()/release().
+    """
+    key = get_key(namespace, entity, identifier)
+    lock_function = getattr(cache, "lock", None)
+
+    if callable(lock_function):
+        return lock_function(key, timeout=timeout)
+    else:
+        raise ImproperlyConfigured(
+            "The cache backend does not provide a callable .lock() function. "
+        )
+
+
+def _should_recompute_early(envelope, *, beta, now):
+    """
+    Probabilistic early expiration (XFetch).
+    The closer the entry is to its expiry and the longer it took to compute,
+    the more likely a caller refreshes it before it actually expires.
+    """
+    expires_at = envelope["expires_at"]
+    if expires_at is None:
+        return False
+
+    # 1 - random() is in (0, 1], so the log is always defined and <= 0
+    return now - envelope["delta"] * beta * math.log(1 - random.random()) >= expires_at
 
 
-def get_or_set_cache(*, namespace, entity, identifier, creator, timeout=None):
+def _recompute_and_store(*, namespace, key, creator, timeout):
+    """
+    Run the creator and store its value in an envelope that records
+    how long it took (delta) and when it logically expires.
+    The physical TTL is twice the logical one, so a stale value
+    can still be served while one caller rebuilds it.
+    """
+    started_at = time.monotonic()
+    value = creator() if callable(creator) else creator
+    delta = time.monotonic() - started_at
+
+    now = time.time()
+    envelope = {
+        "value": value,
+        "delta": delta,
+        "expires_at": None if timeout is None else now + timeout,
+    }
+    cache.set(key, envelope, timeout=None if timeout is None else timeout * 2)
+    if uses_local_cache(namespace):
+        publish_invalidation(key)
+
+    return value
+
+
+def _get_or_set_single_flight(*, namespace, entity, identifier, creator, timeout, beta, lock_timeout, wait_timeout):
+    """
+    Only the caller holding the rebuild lock runs the creator.
+    Everyone else gets the stale value, or waits briefly on a cold miss.
+    """
+    key = get_key(namespace, entity, identifier)
+
+    envelope = cache.get(key)
+    if envelope is not None and not _should_recompute_early(envelope, beta=beta, now=time.time()):
+        return envelope["value"]
+
+    lock = get_cache_lock(
+        namespace='single_flight', entity=namespace, identifier=f"{entity}:{identifier}",
+        timeout=lock_timeout,
+    )
+
+    if lock.acquire(blocking=False):
+        try:
+            return _recompute_and_store(namespace=namespace, key=key, creator=creator, timeout=timeout)
+        finally:
+            try:
+                lock.release()
+            except LockNotOwnedError:
+                # The lock expired before the creator finished
+                logger.warning(f"Single-flight lock for {key} was released after expiry")
+            except RedisError:
+                # It expires on its own
+                logger.exception(f"Failed to release the single-flight lock for {key}")
+
+    if envelope is not None:
+        return envelope["value"]
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        envelope = cache.get(key)
+        if envelope is not None:
+            return envelope["value"]
+
+    # The lock holder is too slow, compute it ourselves rather than fail
+    return _recompute_and_store(namespace=namespace, key=key, creator=creator, timeout=timeout)
+
+
+@instrument_cache_helper
+def get_or_set_cache(
+        *, namespace, entity, identifier, creator, timeout=None,
+        single_flight=False, beta=1.0, lock_timeout=10, wait_timeout=2,
+):
     """
     Retrieves a key value from the cache and sets the value if it does not exist.
     "Cache Aside Pattern"
+
+    With single_flight=True, only one caller (across all workers) rebuilds a missing
+    or expiring value, and hot keys are refreshed early with probability
+    controlled by 'beta'. Values are then stored in an envelope,
+    so such keys must always be read through this function with single_flight=True.
     """
     key = get_key(namespace, entity, identifier)
-    return cache.get_or_set(key, creator, timeout=timeout)
+    created = False
+
+    def tracked_creator():
+        nonlocal created
+        created = True
+        return creator() if callable(creator) else creator
+
+    def fetch():
+        if single_flight:
+            value = _get_or_set_single_flight(
+                namespace=namespace, entity=entity, identifier=identifier, creator=tracked_creator,
+                timeout=timeout, beta=beta, lock_timeout=lock_timeout, wait_timeout=wait_timeout,
+            )
+        else:
+            value = cache.get_or_set(key, tracked_creator, timeout=timeout)
+
+        record_lookups(namespace, entity, hits=not created, misses=created)
+        return value
 
+    if not uses_local_cache(namespace):
+        return fetch()
 
+    local_cache = get_local_cache()
+    value = local_cache.get(key)
+    if value is not None:
+        record_lookups(namespace, entity, hits=1, local_hits=1)
+        return value
+
+    value = fetch()
+    if value is not None:
+        local_cache.set(key, value, timeout=timeout)
+
+    return value
+
+
+@instrument_cache_helper
 def delete_cache_pattern(*, namespace, entity, identifier, version=None):
     """
     Delete keys matching pattern 'namespace:entity:identifier' (identifier may include wildcards)
+    This SCANs the whole keyspace, so it is meant for ops use;
+    application code should prefer invalidate_cache_namespace().
+    In a versioned namespace the pattern matches keys of every generation.
     """
-    key = get_key(namespace, entity, identifier)
+    if _uses_generations(namespace):
+        key = f"{namespace}:{entity}:v*:{identifier}"
+    else:
+        key = get_key(namespace, entity, identifier)
+
+    result = cache.delete_pattern(key, version=version)
+    if uses_local_cache(namespace):
+        publish_invalidation()
 
-    return cache.delete_pattern(key, version=version)
+    return result
@@ -0,0 +1,169 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds (ms) of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+# Totals of the cache calls made while handling the current request (or task)
+_request_tally = ContextVar('cache_request_tally', default=None)
+
+
+class CacheStats:
+    """
+    Counters of one (namespace, entity) pair.
+    Only mutated while holding _stats_lock.
+    """
+    __slots__ = ('errors', 'hits', 'latency_buckets', 'latency_count', 'latency_sum_ms', 'local_hits', 'misses')
+
+    def __init__(self):
+        self.hits = 0
+        self.local_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_count = 0
+        self.latency_sum_ms = 0.0
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        buckets = {str(bound): count for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_buckets)}
+        buckets['+Inf'] = self.latency_buckets[-1]
+
+        return {
+            'hits': self.hits,
+            'local_hits': self.local_hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_ratio': self.hits / lookups if lookups else None,
+            'latency': {
+                'count': self.latency_count,
+                'sum_ms': round(self.latency_sum_ms, 3),
+                'buckets': buckets,
+            },
+        }
+
+
+def _get_stats(namespace, entity):
+    # Called with _stats_lock held
+    stats = _stats.get((namespace, entity))
+    if stats is None:
+        stats = _stats[(namespace, entity)] = CacheStats()
+    return stats
+
+
+def record_lookups(namespace, entity, *, hits=0, misses=0, local_hits=0):
+    """
+    Record the outcome of cache reads. 'local_hits' are hits served
+    from worker memory and are also counted in 'hits'.
+    """
+    with _stats_lock:
+        stats = _get_stats(namespace, entity)
+        stats.hits += hits
+        stats.local_hits += local_hits
+        stats.misses += misses
+
+    tally = _request_tally.get()
+    if tally is not None:
+        tally['cache_hits'] += hits
+        tally['cache_misses'] += misses
+
+
+@contextmanager
+def measure_cache_call(namespace, entity):
+    """
+    Record the latency of a cache helper call, and count it as an error if it raises.
+    """
+    started_at = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+
+        with _stats_lock:
+            stats = _get_stats(namespace, entity)
+            stats.latency_buckets[bucket] += 1
+            stats.latency_count += 1
+            stats.latency_sum_ms += duration_ms
+            if failed:
+                stats.errors += 1
+
+        tally = _request_tally.get()
+        if tally is not None:
+            tally['cache_calls'] += 1
+            tally['cache_time_ms'] += duration_ms
+            if failed:
+                tally['cache_errors'] += 1
+
+
+def instrument_cache_helper(func):
+    """
+    Measure a keyword-only cache helper, labelled by its namespace and entity arguments.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with measure_cache_call(kwargs['namespace'], kwargs['entity']):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def get_cache_metrics():
+    """
+    Return a snapshot of the counters of this process,
+    as a dict keyed by namespace, then by entity.
+    """
+    with _stats_lock:
+        snapshot = [(namespace, entity, stats.as_dict()) for (namespace, entity), stats in _stats.items()]
+
+    metrics = {}
+    for namespace, entity, values in sorted(snapshot, key=lambda item: (item[0], item[1])):
+        metrics.setdefault(namespace, {})[entity] = values
+
+    return metrics
+
+
+def reset_cache_metrics():
+    with _stats_lock:
+        _stats.clear()
+
+
+def start_request_tally():
+    """
+    Start counting the cache calls of the current request.
+    """
+    _request_tally.set({
+        'cache_calls': 0,
+        'cache_hits': 0,
+        'cache_misses': 0,
+        'cache_errors': 0,
+        'cache_time_ms': 0.0,
+    })
+
+
+def get_request_tally():
+    """
+    Return a copy of the current request's tally, or None if no tally was started.
+    """
+    tally = _request_tally.get()
+    if tally is None:
+        return None
+
+    tally = dict(tally)
+    tally['cache_time_ms'] = round(tally['cache_time_ms'], 2)
+    return tally
+
+
+def clear_request_tally():
+    _request_tally.set(None)
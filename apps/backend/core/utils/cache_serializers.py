@@ -0,0 +1,58 @@
+import json
+import zlib
+
+import orjson
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis.serializers.base import BaseSerializer
+
+# Every value written by ORJSONSerializer starts with one of these bytes.
+# JSON never starts with a control character, so entries written by the previous
+# JSONSerializer can still be read while both formats coexist in Redis.
+HEADER_ORJSON = b"\x01"
+HEADER_ORJSON_ZLIB = b"\x02"
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONSerializer(BaseSerializer):
+    """
+    A django-redis serializer encoding values with orjson,
+    compressed with zlib once they exceed a size threshold.
+    Values decode to exactly what JSONSerializer returned, so callers do not change.
+
+    Options (in CACHES["default"]["OPTIONS"]):
+    - SERIALIZER_COMPRESS_MIN_LENGTH: smallest encoded size (bytes) worth compressing
+    - SERIALIZER_COMPRESS_LEVEL: zlib compression level
+    """
+    default_compress_min_length = 1024
+    default_compress_level = 1
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.compress_min_length = options.get(
+            "SERIALIZER_COMPRESS_MIN_LENGTH", self.default_compress_min_length
+        )
+        self.compress_level = options.get("SERIALIZER_COMPRESS_LEVEL", self.default_compress_level)
+        # Datetimes, Decimals, lazy strings etc. are formatted the way JSONSerializer did
+        self._default = DjangoJSONEncoder().default
+
+    def dumps(self, value):
+        data = orjson.dumps(value, default=self._default, option=_ORJSON_OPTIONS)
+
+        if len(data) >= self.compress_min_length:
+            compressed = zlib.compress(data, self.compress_level)
+            if len(compressed) < len(data):
+                return HEADER_ORJSON_ZLIB + compressed
+
+        return HEADER_ORJSON + data
+
+    def loads(self, value):
+        header, data = value[:1], value[1:]
+
+        if header == HEADER_ORJSON:
+            return orjson.loads(data)
+        if header == HEADER_ORJSON_ZLIB:
+            return orjson.loads(zlib.decompress(data))
+
+        # Written by JSONSerializer before the rollout
+        return json.loads(value.decode())
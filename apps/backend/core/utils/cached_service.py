@@ -0,0 +1,101 @@
+import functools
+import inspect
+
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import delete_cache, get_cache, get_key, set_cache
+
+
+def _format_argument(value):
+    # Model instances are identified by their primary key
+    if isinstance(value, models.Model):
+        return str(value.pk)
+    return str(value)
+
+
+def cached_service(*, namespace, entity=None, timeout, negative_timeout=None, invalidate_on=None):
+    """
+    Memoise a function in the cache, keyed through get_key() by its bound arguments,
+    e.g. get_published_version_id(source_article_id=1) -> "articles:get_published_version_id:1".
+
+    - timeout: TTL of cached results
+    - negative_timeout: TTL of 'None' results; 'None' is not cached if this is not set
+    - invalidate_on: {model or "app_label.ModelName": callable(instance)}.
+      On post_save/post_delete of that model, the callable returns the keyword arguments
+      (or a list of them) of the calls whose results are dropped, or None to skip.
+
+    Results must be serializable by the cache backend (i.e. JSON values, not model instances).
+    Signals are not sent by queryset.update() or bulk_create(), callers doing so
+    must use the wrapper's .invalidate(...) themselves.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache_entity = entity or func.__name__
+
+        def get_identifier(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return ":".join(_format_argument(value) for value in bound.arguments.values())
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            identifier = get_identifier(*args, **kwargs)
+
+            # Results are wrapped in a list, so a cached None is told apart from a miss
+            cached = get_cache(namespace=namespace, entity=cache_entity, identifier=identifier)
+            if cached is not None:
+                return cached[0]
+
+            value = func(*args, **kwargs)
+
+            if value is not None:
+                set_cache(
+                    namespace=namespace, entity=cache_entity, identifier=identifier,
+                    value=[value], timeout=timeout,
+                )
+            elif negative_timeout is not None:
+                set_cache(
+                    namespace=namespace, entity=cache_entity, identifier=identifier,
+                    value=[None], timeout=negative_timeout,
+                )
+
+            return value
+
+        def invalidate(*args, **kwargs):
+            """
+            Drop the cached result of one call.
+            """
+            identifier = get_identifier(*args, **kwargs)
+            delete_cache(namespace=namespace, entity=cache_entity, identifier=identifier)
+
+        def handle_model_change(get_arguments, instance):
+            arguments = get_arguments(instance)
+            if arguments is None:
+                return
+            if isinstance(arguments, dict):
+                arguments = [arguments]
+
+            for call_kwargs in arguments:
+                invalidate(**call_kwargs)
+                # Drop it again once committed, in case another request
+                # cached the old value before the transaction finished
+                transaction.on_commit(functools.partial(invalidate, **call_kwargs))
+
+        for sender, get_arguments in (invalidate_on or {}).items():
+            def receiver(sender, instance, _get_arguments=get_arguments, **kwargs):
+                handle_model_change(_get_arguments, instance)
+
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    receiver, sender=sender, weak=False,
+                    dispatch_uid=f"cached_service:{func.__module__}.{func.__qualname__}:{sender}",
+                )
+
+        wrapper.invalidate = invalidate
+        wrapper.cache_key = lambda *args, **kwargs: get_key(namespace, cache_entity, get_identifier(*args, **kwargs))
+        wrapper.uncached = func
+
+        return wrapper
+
+    return decorator
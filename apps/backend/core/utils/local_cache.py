@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from logs.logging import get_logger
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+# An empty message on the invalidation channel means "drop everything",
+# otherwise it carries one or more keys separated by newlines
+_CLEAR_ALL_MESSAGE = ""
+_KEY_SEPARATOR = "\n"
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe LRU mapping whose entries expire after a TTL.
+    The least recently used entry is evicted once 'max_entries' is reached.
+    """
+    def __init__(self, *, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Return the value of a live entry, or 'default' if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Store a value. The TTL is capped by the cache's own timeout,
+        so an entry never outlives the configured staleness bound.
+        """
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        if timeout <= 0:
+            self.delete(key)
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = None
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def get_redis_client():
+    """
+    Return the raw redis client behind the default cache,
+    or None if the cache backend is not django-redis.
+    """
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection("default")
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def _get_invalidation_channel():
+    """
+    The pub/sub channel is prefixed like any other cache key,
+    so environments sharing one Redis instance do not invalidate each other.
+    """
+    return str(cache.make_key("core:local_cache:invalidation"))
+
+
+def _listen_for_invalidations(client, channel):
+    """
+    Evict local entries whenever another worker publishes a changed key.
+    Runs forever in a daemon thread and reconnects after failures.
+    """
+    while True:
+        try:
+            pubsub = client.pubsub()
+            pubsub.subscribe(channel)
+
+            for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    # Invalidations published before the subscription was active are lost
+                    _local_cache.clear()
+                    continue
+
+                if message["type"] != "message":
+                    continue
+
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8")
+
+                if data == _CLEAR_ALL_MESSAGE:
+                    _local_cache.clear()
+                    continue
+
+                for key in data.split(_KEY_SEPARATOR):
+                    _local_cache.delete(key)
+
+        except Exception:
+            logger.exception("Local cache invalidation listener disconnected")
+            time.sleep(1)
+
+
+def _ensure_invalidation_listener():
+    """
+    Start the listener thread once per process.
+    Threads do not survive fork(), so a new gunicorn worker starts its own.
+    """
+    global _listener_pid
+
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+
+    with _listener_lock:
+        if _listener_pid == pid:
+            return
+
+        client = get_redis_client()
+        if client is not None:
+            thread = threading.Thread(
+                target=_listen_for_invalidations,
+                args=(client, _get_invalidation_channel()),
+                name="local-cache-invalidation",
+                daemon=True,
+            )
+            thread.start()
+
+        _listener_pid = pid
+
+
+def get_local_cache():
+    """
+    Return the per-process LRU cache, starting the invalidation listener if needed.
+    Values stored here are shared between callers and must be treated as read-only.
+    """
+    global _local_cache
+
+    if _local_cache is None:
+        with _listener_lock:
+            if _local_cache is None:
+                _local_cache = LRUCache(
+                    max_entries=settings.CACHE_L1_MAX_ENTRIES,
+                    timeout=settings.CACHE_L1_TIMEOUT,
+                )
+
+    _ensure_invalidation_listener()
+
+    return _local_cache
+
+
+def uses_local_cache(namespace):
+    """
+    Check whether a namespace is served from the in-process cache.
+    """
+    return namespace in settings.CACHE_L1_NAMESPACES
+
+
+def publish_invalidation(*keys):
+    """
+    Evict the given keys (or everything if no key is given) from this process
+    and tell every other process to do the same with a single message.
+    """
+    local_cache = get_local_cache()
+    if not keys:
+        local_cache.clear()
+    for key in keys:
+        local_cache.delete(key)
+
+    client = get_redis_client()
+    if client is None:
+        return
+
+    message = _KEY_SEPARATOR.join(keys) if keys else _CLEAR_ALL_MESSAGE
+    try:
+        client.publish(_get_invalidation_channel(), message)
+    except Exception:
+        # Other workers fall back to the L1 TTL as the staleness bound
+        logger.exception("Failed to publish local cache invalidation")
+
+
+def clear_local_cache():
+    """
+    Drop every entry of this process's local cache, e.g. between tests.
+    """
+    if _local_cache is not None:
+        _local_cache.clear()
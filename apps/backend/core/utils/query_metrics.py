@@ -0,0 +1,43 @@
+import re
+import time
+from collections import Counter
+
+# "IN (%s, %s, %s)" and multi-row "VALUES (...), (...)" collapse to one placeholder group,
+# so the same query over a different number of ids keeps the same shape
+_PLACEHOLDER_LIST = re.compile(r"%s(?:\s*,\s*%s)+")
+_VALUES_LIST = re.compile(r"(\([^()]*\))(?:\s*,\s*\([^()]*\))+")
+
+
+def normalize_sql(sql):
+    """
+    Return the template of a query, identical for queries differing only in their parameters.
+    """
+    sql = _PLACEHOLDER_LIST.sub("%s", sql)
+    return _VALUES_LIST.sub(r"\1", sql)
+
+
+class QueryTally:
+    """
+    A database execute wrapper counting queries, their total time and how often each shape repeats.
+    Install it with connection.execute_wrapper().
+    """
+    def __init__(self):
+        self.count = 0
+        self.time_ms = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time_ms += (time.perf_counter() - started_at) * 1000
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    def repeated_shapes(self, *, threshold):
+        """
+        Return (template, count) of the shapes run at least 'threshold' times, most repeated first.
+        That is usually one query per object of a list (N+1).
+        """
+        return [(sql, count) for sql, count in self.shapes.most_common() if count >= threshold]
@@ -0,0 +1,118 @@
+import math
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from .cache import get_key, get_many_cache, incr_cache, run_lua_script
+
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local previous_weight = tonumber(ARGV[3])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+
+if previous * previous_weight + current + 1 > limit then
+    return {0, current, previous}
+end
+
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2] * 2)
+end
+return {1, current, previous}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+
+local allowed = 0
+if tokens >= requested then
+    tokens = tokens - requested
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after: int
+
+
+def hit_sliding_window(*, namespace, entity, identifier, limit, window):
+    """
+    Count one hit against a limit of 'limit' hits per 'window' seconds.
+    The count of the previous fixed window is weighted by how much of it still
+    overlaps the sliding window, which smooths out bursts at window boundaries.
+    Rejected hits are not counted.
+    """
+    now = time.time()
+    current_window, elapsed = divmod(now, window)
+    current_window = int(current_window)
+    previous_weight = 1 - elapsed / window
+
+    current_identifier = f"{identifier}:{current_window}"
+    previous_identifier = f"{identifier}:{current_window - 1}"
+
+    result = run_lua_script(
+        SLIDING_WINDOW_SCRIPT,
+        keys=[get_key(namespace, entity, current_identifier), get_key(namespace, entity, previous_identifier)],
+        args=[limit, window, previous_weight],
+    )
+    if result is not None:
+        allowed, current, previous = bool(result[0]), result[1], result[2]
+    else:
+        # Not Redis: the check and the increment are not atomic here
+        counts = get_many_cache(
+            namespace=namespace, entity=entity, identifiers=[current_identifier, previous_identifier]
+        )
+        current, previous = counts.get(current_identifier, 0), counts.get(previous_identifier, 0)
+        allowed = previous * previous_weight + current + 1 <= limit
+        if allowed:
+            current = incr_cache(
+                namespace=namespace, entity=entity, identifier=current_identifier, timeout=window * 2
+            )
+
+    remaining = max(0, math.floor(limit - previous * previous_weight - current))
+    retry_after = 0 if allowed else math.ceil(window - elapsed)
+
+    return RateLimitResult(allowed=allowed, remaining=remaining, retry_after=retry_after)
+
+
+def take_token(*, namespace, entity, identifier, capacity, refill_rate, tokens=1):
+    """
+    Take tokens from a bucket holding up to 'capacity' tokens,
+    refilled at 'refill_rate' tokens per second.
+    """
+    key = get_key(namespace, entity, identifier)
+    now = time.time()
+
+    result = run_lua_script(TOKEN_BUCKET_SCRIPT, keys=[key], args=[capacity, refill_rate, now, tokens])
+    if result is not None:
+        allowed, available = bool(result[0]), float(result[1])
+    else:
+        # Not Redis: the read and the write are not atomic here
+        bucket = cache.get(key) or {"tokens": capacity, "updated_at": now}
+        available = min(capacity, bucket["tokens"] + max(0, now - bucket["updated_at"]) * refill_rate)
+        allowed = available >= tokens
+        if allowed:
+            available -= tokens
+        cache.set(key, {"tokens": available, "updated_at": now}, timeout=math.ceil(capacity / refill_rate) + 1)
+
+    retry_after = 0 if allowed else math.ceil((tokens - available) / refill_rate)
+
+    return RateLimitResult(allowed=allowed, remaining=math.floor(available), retry_after=retry_after)
@@ -1,9 +1,43 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import (
     CreateModelMixin, ListModelMixin, RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin
 )
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.settings import api_settings
+import orjson
+
+import hashlib
+import itertools
 
+from core.renderers import ORJSON_OPTIONS, encode_default
 from core.responses import format_api_response
+from core.serializers import BulkListSerializer, parse_primary_keys, plan_queryset
+
+# Query plans by serializer class and readable fields, see QueryPlanningMixin
+_query_plans = {}
+
+
+def _get_field_signature(serializer):
+    """
+    Return the readable fields of a serializer and of its nested serializers, as a hashable tuple.
+    get_fields() may depend on the context (e.g. the user), so the plan of one request may not fit another.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+
+    return tuple(
+        (name, _get_field_signature(field) if isinstance(field, serializers.BaseSerializer) else field.source)
+        for name, field in serializer.fields.items()
+        if not field.write_only
+    )
 
 
 class FormattedResponseMixin:
@@ -27,6 +61,202 @@ class FormattedResponseMixin:
         )
 
 
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before any serializer work.
+    Validators are built from 'conditional_field' (a last-modified timestamp).
+
+    'conditional_get' is enabled automatically when the model has that field.
+    Set it to False on views whose output also depends on other rows,
+    since changes there do not touch the timestamp.
+    """
+    conditional_get = None
+    conditional_field = 'updated_at'
+
+    def is_conditional_get_enabled(self):
+        if self.request.method not in ('GET', 'HEAD'):
+            return False
+        if self.conditional_get is not None:
+            return self.conditional_get
+
+        try:
+            self.get_queryset().model._meta.get_field(self.conditional_field)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def make_etag(self, *parts):
+        """
+        Return a weak ETag, as the envelope's meta changes on every response.
+        The serializer, the full path (filters, page, fieldsets...) and the user are part of it,
+        since the same rows can be represented, filtered or scoped differently.
+        """
+        user = getattr(self.request, 'user', None)
+        scope = user.pk if user is not None and user.is_authenticated else 'anonymous'
+        raw = ":".join(
+            str(part) for part in (
+                self.get_serializer_class().__name__, self.request.get_full_path(), scope, *parts
+            )
+        )
+        return f'W/{quote_etag(hashlib.blake2b(raw.encode(), digest_size=16).hexdigest())}'
+
+    def get_not_modified_response(self, request, *, etag, last_modified):
+        """
+        Return a 304 (or 412) response if the client's copy is still valid, otherwise None.
+        """
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            # HTTP dates have a resolution of one second
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            # A 304 must carry the validators a 200 would have
+            self.set_validator_headers(response, etag=etag, last_modified=last_modified)
+        return response
+
+    @staticmethod
+    def set_validator_headers(response, *, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+
+class QueryPlanningMixin:
+    """
+    Apply the select_related / prefetch_related / defer plan derived from the
+    serializer's field sources to the queryset, see core.serializers.plan_queryset().
+    Plans are computed once per serializer class and set of readable fields.
+    """
+    auto_query_plan = True
+
+    def get_query_plan(self):
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return None
+
+        serializer = serializer_class(context=self.get_serializer_context())
+        key = (serializer_class, _get_field_signature(serializer))
+        plan = _query_plans.get(key)
+        if plan is None:
+            plan = _query_plans[key] = plan_queryset(serializer)
+        return plan
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        plan = self.get_query_plan() if self.auto_query_plan else None
+
+        return queryset if plan is None else plan.apply(queryset)
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients choose the fields of list and retrieve responses
+    with '?fields=title,status' or '?exclude=content'.
+
+    Columns only read by pruned fields are deferred on the queryset as well.
+    A SerializerMethodField has no source, so the columns it reads must be listed
+    in the serializer's 'Meta.method_field_sources', e.g. {'status_display': ['status']}.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+    sparse_fieldset_actions = ('list', 'retrieve')
+
+    def _parse_fieldset_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        return {field.strip() for field in value.split(',') if field.strip()}
+
+    def get_sparse_fieldset(self):
+        """
+        Return the (fields, exclude) sets requested by the client, or None when not used.
+        """
+        if getattr(self, 'action', None) not in self.sparse_fieldset_actions:
+            return None
+
+        fields = self._parse_fieldset_param(self.fields_query_param)
+        exclude = self._parse_fieldset_param(self.exclude_query_param)
+        if fields is None and exclude is None:
+            return None
+
+        return fields, exclude or set()
+
+    def get_pruned_field_names(self, serializer_fields):
+        """
+        Return the names of the serializer fields to drop, validating the requested ones.
+        """
+        fieldset = self.get_sparse_fieldset()
+        if fieldset is None:
+            return set()
+
+        fields, exclude = fieldset
+        unknown = ((fields or set()) | exclude) - set(serializer_fields)
+        if unknown:
+            raise ValidationError({'fields': [f"Unknown field(s): {', '.join(sorted(unknown))}"]})
+
+        kept = set(serializer_fields) if fields is None else fields
+        return set(serializer_fields) - (kept - exclude)
+
+    def get_deferred_model_fields(self, serializer):
+        """
+        Return the concrete model columns that no kept serializer field reads.
+        Relations are never deferred, as they may be traversed with select_related().
+        """
+        serializer_fields = serializer.fields
+        pruned = self.get_pruned_field_names(serializer_fields)
+        if not pruned:
+            return []
+
+        method_field_sources = getattr(getattr(serializer, 'Meta', None), 'method_field_sources', {})
+        read = set()
+        for name, field in serializer_fields.items():
+            if name in pruned:
+                continue
+            if name in method_field_sources or isinstance(field, serializers.SerializerMethodField):
+                read.update(method_field_sources.get(name, ()))
+            elif field.source != '*':
+                read.add(field.source_attrs[0])
+
+        model = serializer.Meta.model
+        deferred = []
+        for name in pruned:
+            field = serializer_fields[name]
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                continue
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                continue
+            is_column = model_field.concrete and not model_field.is_relation and not model_field.primary_key
+            if is_column and model_field.name not in read:
+                deferred.append(model_field.name)
+
+        return deferred
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_sparse_fieldset() is None:
+            return queryset
+
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        deferred = self.get_deferred_model_fields(serializer)
+
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.get_sparse_fieldset() is None:
+            return serializer
+
+        fields = serializer.child.fields if isinstance(serializer, serializers.ListSerializer) else serializer.fields
+        for name in self.get_pruned_field_names(fields):
+            fields.pop(name)
+
+        return serializer
+
+
 class MyCreateModelMixin(CreateModelMixin):
     """
     Create a model instance, but return a standard api response.
@@ -50,42 +280,104 @@ class MyCreateModelMixin(CreateModelMixin):
         )
 
 
-class MyListModelMixin(ListModelMixin):
+class MyListModelMixin(ConditionalGetMixin, ListModelMixin):
     """
     List a queryset, but return a standard api response.
+    Conditional GETs are answered with 304, see ConditionalGetMixin.
+    Views with 'ndjson_streaming' can also stream the whole queryset as NDJSON.
     This should always be used with GenericViewSet.
     """
     list_success_message = "listed"
     list_success_code = 'listed'
 
+    # Set 'ndjson_streaming' to allow '?stream=ndjson', which streams every row
+    # as one JSON object per line, without pagination or envelope
+    ndjson_streaming = False
+    ndjson_chunk_size = 2000
+    ndjson_content_type = 'application/x-ndjson'
+    stream_query_param = 'stream'
+
+    def wants_ndjson_stream(self, request):
+        return self.ndjson_streaming and request.query_params.get(self.stream_query_param) == 'ndjson'
+
+    def iter_ndjson(self, queryset):
+        """
+        Serialize the queryset chunk by chunk.
+        iterator() uses a server-side cursor on PostgreSQL, so memory stays flat.
+        """
+        rows = queryset.iterator(chunk_size=self.ndjson_chunk_size)
+
+        while chunk := list(itertools.islice(rows, self.ndjson_chunk_size)):
+            serializer = self.get_serializer(chunk, many=True)
+            yield b''.join(
+                orjson.dumps(item, default=encode_default, option=ORJSON_OPTIONS) + b'\n' for item in serializer.data
+            )
+
+    def make_list_etag(self, rows):
+        """
+        Return the ETag of a list response: the (pk, timestamp) of its rows,
+        plus what the pagination envelope adds to them (the total count, the cursors).
+        """
+        paginator = self.paginator
+        page = getattr(paginator, 'page', None)
+        pagination_state = (
+            page.paginator.count if page is not None else None,
+            getattr(paginator, 'next_cursor', None),
+            getattr(paginator, 'previous_cursor', None),
+        )
+
+        return self.make_etag(pagination_state, *(f"{row.pk}@{row.conditional_value}" for row in rows))
+
+    def get_ndjson_stream_response(self, queryset):
+        response = StreamingHttpResponse(self.iter_ndjson(queryset), content_type=self.ndjson_content_type)
+        # Tell nginx not to buffer the whole export
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        if self.wants_ndjson_stream(request):
+            return self.get_ndjson_stream_response(queryset)
+
+        conditional_get = self.is_conditional_get_enabled()
+        if conditional_get:
+            # Annotated, as sparse fieldsets and query plans may defer the column itself
+            queryset = queryset.annotate(conditional_value=F(self.conditional_field))
+
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            paginated_response = self.get_paginated_response(serializer.data)
-
-            return self.format_success_response(
-                message=self.list_success_message,
-                code=self.list_success_code,
-                data=paginated_response,
-                status_code=status.HTTP_200_OK,
-            )
+        rows = list(queryset) if page is None else page
 
-        serializer = self.get_serializer(queryset, many=True)
+        validators = None
+        if conditional_get:
+            # Built from the rows the response is made of, so it costs no extra query.
+            # No Last-Modified: the newest timestamp does not change when a row is deleted
+            # or filtered out, so only the ETag can tell whether the list is still the same
+            validators = {'etag': self.make_list_etag(rows), 'last_modified': None}
+            not_modified_response = self.get_not_modified_response(request, **validators)
+            if not_modified_response is not None:
+                return not_modified_response
 
-        return self.format_success_response(
+        serializer = self.get_serializer(rows, many=True)
+        data = serializer.data if page is None else self.get_paginated_response(serializer.data)
+
+        response = self.format_success_response(
             message=self.list_success_message,
             code=self.list_success_code,
-            data=serializer.data,
+            data=data,
             status_code=status.HTTP_200_OK,
         )
 
+        if validators is not None:
+            self.set_validator_headers(response, **validators)
+
+        return response
+
 
-class MyRetrieveModelMixin(RetrieveModelMixin):
+class MyRetrieveModelMixin(ConditionalGetMixin, RetrieveModelMixin):
     """
     Retrieve a model instance, but return a standard api response.
+    Conditional GETs are answered with 304, see ConditionalGetMixin.
     This should always be used with GenericViewSet.
     """
     retrieve_success_message = "retrieved"
@@ -93,15 +385,32 @@ class MyRetrieveModelMixin(RetrieveModelMixin):
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
+
+        validators = None
+        if self.is_conditional_get_enabled():
+            last_modified = getattr(instance, self.conditional_field)
+            validators = {
+                'etag': self.make_etag(instance.pk, last_modified),
+                'last_modified': last_modified,
+            }
+            not_modified_response = self.get_not_modified_response(request, **validators)
+            if not_modified_response is not None:
+                return not_modified_response
+
         serializer = self.get_serializer(instance)
 
-        return self.format_success_response(
+        response = self.format_success_response(
             message=self.retrieve_success_message,
             code=self.retrieve_success_code,
             data=serializer.data,
             status_code=status.HTTP_200_OK,
         )
 
+        if validators is not None:
+            self.set_validator_headers(response, **validators)
+
+        return response
+
 
 class MyUpdateModelMixin(UpdateModelMixin):
     """
@@ -147,3 +456,124 @@ class MyDestroyModelMixin(DestroyModelMixin):
             data=None,
             status_code=status.HTTP_200_OK,
         )
+
+
+class MyBulkModelMixin:
+    """
+    Opt-in bulk endpoints, each taking a JSON list and running in one transaction:
+    - POST   .../bulk_create/  [{...}, ...]                creates with one bulk_create()
+    - PATCH  .../bulk_update/  [{"id": ..., ...}, ...]     partial updates with one bulk_update()
+    - POST   .../bulk_delete/  [id, ...]                   deletes with one queryset.delete()
+
+    Validation is all or nothing, errors are reported per item in the list order.
+    Writes bypass Model.save() and its signals, see BulkListSerializer.
+    This should always be used with GenericViewSet.
+    """
+    bulk_max_items = 500
+
+    bulk_create_success_message = "created"
+    bulk_create_success_code = 'bulk_created'
+    bulk_update_success_message = "updated"
+    bulk_update_success_code = 'bulk_updated'
+    bulk_delete_success_message = "deleted"
+    bulk_delete_success_code = 'bulk_deleted'
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        context = self.get_serializer_context()
+        child = self.get_serializer_class()(context=context, partial=kwargs.get('partial', False))
+        return BulkListSerializer(*args, child=child, context=context, max_length=self.bulk_max_items, **kwargs)
+
+    def get_bulk_instances(self, primary_keys):
+        """
+        Return the locked instances among the viewset's queryset, by primary key as a string.
+        Object permissions are checked on each of them.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model
+        # Only the rows of the model are locked, not those joined by the query plan,
+        # which PostgreSQL rejects on the nullable side of an outer join
+        queryset = queryset.select_for_update(of=('self',))
+        instances = {
+            str(obj.pk): obj
+            for obj in queryset.filter(pk__in=parse_primary_keys(model, primary_keys))
+        }
+        for obj in instances.values():
+            self.check_object_permissions(self.request, obj)
+
+        return instances
+
+    def _validate_bulk_list(self, data):
+        if not isinstance(data, list):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Expected a list of items."]})
+        if len(data) > self.bulk_max_items:
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [f"Ensure there are no more than {self.bulk_max_items} items."]}
+            )
+
+    def perform_bulk_create(self, serializer):
+        serializer.save()
+
+    def perform_bulk_update(self, serializer):
+        serializer.save()
+
+    def perform_bulk_destroy(self, queryset):
+        queryset.delete()
+
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request, *args, **kwargs):
+        self._validate_bulk_list(request.data)
+
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            self.perform_bulk_create(serializer)
+
+        return self.format_success_response(
+            message=self.bulk_create_success_message,
+            code=self.bulk_create_success_code,
+            data=serializer.data,
+            status_code=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=['patch'])
+    def bulk_update(self, request, *args, **kwargs):
+        self._validate_bulk_list(request.data)
+
+        with transaction.atomic():
+            instances = self.get_bulk_instances(
+                [item.get('id') for item in request.data if isinstance(item, dict)]
+            )
+            serializer = self.get_bulk_serializer(instances, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            self.perform_bulk_update(serializer)
+
+        return self.format_success_response(
+            message=self.bulk_update_success_message,
+            code=self.bulk_update_success_code,
+            data=serializer.data,
+            status_code=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request, *args, **kwargs):
+        self._validate_bulk_list(request.data)
+
+        with transaction.atomic():
+            instances = self.get_bulk_instances(request.data)
+            deleted = {obj.pk for obj in instances.values()}
+            self.perform_bulk_destroy(self.get_queryset().filter(pk__in=deleted))
+
+        # Compared as parsed keys, e.g. uppercase UUIDs are deleted too
+        model = self.get_queryset().model
+        results = [
+            {'id': primary_key, 'deleted': any(pk in deleted for pk in parse_primary_keys(model, [primary_key]))}
+            for primary_key in request.data
+        ]
+
+        return self.format_success_response(
+            message=self.bulk_delete_success_message,
+            code=self.bulk_delete_success_code,
+            data=results,
+            status_code=status.HTTP_200_OK,
+        )
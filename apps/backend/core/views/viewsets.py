@@ -1,16 +1,21 @@
 from rest_framework.viewsets import GenericViewSet
 
 from .mixins import (
+    MyBulkModelMixin,
     MyCreateModelMixin,
     MyListModelMixin,
     MyRetrieveModelMixin,
     MyUpdateModelMixin,
     MyDestroyModelMixin,
-    FormattedResponseMixin
+    FormattedResponseMixin,
+    QueryPlanningMixin,
+    SparseFieldsetMixin,
 )
 
 
-class MyModelViewSet(MyCreateModelMixin,
+class MyModelViewSet(QueryPlanningMixin,
+                     SparseFieldsetMixin,
+                     MyCreateModelMixin,
                      MyListModelMixin,
                      MyRetrieveModelMixin,
                      MyUpdateModelMixin,
@@ -21,17 +26,33 @@ class MyModelViewSet(MyCreateModelMixin,
     A viewset that provides default `create()`, `retrieve()`, `update()`,
     `partial_update()`, `destroy()` and `list()` actions.
     Responses are wrapped with format_api_response().
+    List and retrieve accept '?fields=' / '?exclude=', see SparseFieldsetMixin.
+    Related objects are fetched as planned from the serializer, see QueryPlanningMixin.
     This viewset should always be used to replace drf ModelViewSet.
     """
 
     pass
 
 
-class MyReadOnlyModelViewSet(MyListModelMixin, MyRetrieveModelMixin, FormattedResponseMixin, GenericViewSet):
+class MyReadOnlyModelViewSet(QueryPlanningMixin,
+                             SparseFieldsetMixin,
+                             MyListModelMixin,
+                             MyRetrieveModelMixin,
+                             FormattedResponseMixin,
+                             GenericViewSet):
     """
     A viewset that provides default `list()` and `retrieve()` actions.
     Responses are wrapped with format_api_response().
+    List and retrieve accept '?fields=' / '?exclude=', see SparseFieldsetMixin.
+    Related objects are fetched as planned from the serializer, see QueryPlanningMixin.
     This viewset should always be used to replace drf ReadOnlyModelViewSet.
     """
 
     pass
+
+
+class MyBulkModelViewSet(MyBulkModelMixin, MyModelViewSet):
+    """
+    A MyModelViewSet that also provides the `bulk_create()`, `bulk_update()`
+    and `bulk_delete()` actions, see MyBulkModelMixin.
+    """
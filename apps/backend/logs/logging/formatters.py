@@ -9,6 +9,8 @@ class RuntimeFormatter(logging.Formatter):
     """
     CONTEXT_FIELDS_WHITELIST = (
         'request_id',
+        'db_queries',
+        'db_time_ms',
     )
 
     EXTRA_FIELDS_WHITELIST = (
@@ -20,7 +22,12 @@ class RuntimeFormatter(logging.Formatter):
         'task_id',
         'task_name',
         'task_path',
-        'queue_name'
+        'queue_name',
+        'cache_calls',
+        'cache_hits',
+        'cache_misses',
+        'cache_errors',
+        'cache_time_ms',
     )
 
     def format(self, record: logging.LogRecord) -> str:
@@ -1,5 +1,11 @@
+from django.conf import settings
+from django.db import connections
 from django.utils import timezone
 
+from contextlib import ExitStack
+
+from core.utils.cache_metrics import clear_request_tally, get_request_tally, start_request_tally
+from core.utils.query_metrics import QueryTally
 from logs.logging.context import add_log_context, clear_log_context
 from logs.logging import get_logger
 
@@ -9,12 +15,14 @@ logger = get_logger(__name__)
 class RequestLoggingMiddleware:
     """
     Log at the beginning and end of each request.
+    The completion line also carries the request's cache call totals.
     """
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         started_at = timezone.now()
+        start_request_tally()
 
         request_id = getattr(request, 'request_id', None)
         if request_id:
@@ -30,8 +38,67 @@ class RequestLoggingMiddleware:
 
         logger.info(
             f"Request completed: {request.method} {request.path} "
-            f"status={request.status_code} duration_ms={duration_ms}"
+            f"status={response.status_code} duration_ms={duration_ms}",
+            extra=get_request_tally(),
         )
 
+        clear_request_tally()
         clear_log_context()
         return response
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a view runs more queries than its budget and QUERY_BUDGET_RAISE is enabled.
+    """
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the database queries of each request and their total time.
+    The totals are added to the log context, so the completion line of
+    RequestLoggingMiddleware carries them. Install it right after that middleware.
+
+    Query shapes run QUERY_REPEAT_THRESHOLD times or more are logged as a likely N+1.
+    Views can set a 'query_budget' attribute (QUERY_BUDGET_DEFAULT otherwise).
+    Exceeding it logs a warning, or raises QueryBudgetExceeded with QUERY_BUDGET_RAISE (tests).
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    def get_query_budget(view_func):
+        # DRF views expose their class as 'cls', Django class-based views as 'view_class'
+        for view in (getattr(view_func, 'cls', None), getattr(view_func, 'view_class', None), view_func):
+            budget = getattr(view, 'query_budget', None)
+            if budget is not None:
+                return budget
+
+        return settings.QUERY_BUDGET_DEFAULT
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = self.get_query_budget(view_func)
+
+    def __call__(self, request):
+        tally = QueryTally()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(tally))
+            response = self.get_response(request)
+
+        add_log_context(db_queries=tally.count, db_time_ms=round(tally.time_ms, 3))
+
+        for sql, count in tally.repeated_shapes(threshold=settings.QUERY_REPEAT_THRESHOLD):
+            logger.warning(
+                f"Repeated query ({count} times, possible N+1): {request.method} {request.path} {sql}"
+            )
+
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and tally.count > budget:
+            message = f"Query budget exceeded: {request.method} {request.path} ran {tally.count} queries, budget={budget}"
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.tests.factories import create_user
+from core.tests.testcases import BaseTestCase
+from core.utils.cache import get_cache
+from core.utils.query_metrics import normalize_sql
+from logs.logging.context import clear_log_context, get_log_context
+from logs.middleware import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    RequestLoggingMiddleware,
+)
+
+User = get_user_model()
+
+
+class RequestLoggingMiddlewareTests(BaseTestCase):
+    def test_completion_log_carries_status_and_cache_tally(self):
+        def view(request):
+            get_cache(namespace="articles", entity="item", identifier=1)
+            return HttpResponse(status=204)
+
+        middleware = RequestLoggingMiddleware(view)
+        request = RequestFactory().get("/some/path/")
+
+        with self.assertLogs("logs.middleware", level="INFO") as logs:
+            response = middleware(request)
+
+        self.assertEqual(response.status_code, 204)
+        completed = logs.records[-1]
+        self.assertIn("status=204", completed.getMessage())
+        self.assertEqual(completed.cache_calls, 1)
+        self.assertEqual(completed.cache_misses, 1)
+
+
+class QueryBudgetMiddlewareTests(BaseTestCase):
+    def setUp(self):
+        create_user()
+        clear_log_context()
+
+    def tearDown(self):
+        clear_log_context()
+
+    @staticmethod
+    def make_view(*, queries, budget=None):
+        def view(request):
+            for _ in range(queries):
+                list(User.objects.filter(username="viewer"))
+            return HttpResponse(status=204)
+
+        view.query_budget = budget
+        return view
+
+    def call(self, view):
+        middleware = QueryBudgetMiddleware(view)
+        request = RequestFactory().get("/some/path/")
+        middleware.process_view(request, view, (), {})
+        return middleware(request)
+
+    def test_totals_are_added_to_the_log_context(self):
+        self.call(self.make_view(queries=2))
+
+        context = get_log_context()
+        self.assertEqual(context["db_queries"], 2)
+        self.assertGreaterEqual(context["db_time_ms"], 0)
+
+    @override_settings(QUERY_REPEAT_THRESHOLD=3)
+    def test_repeated_query_shapes_are_logged(self):
+        with self.assertLogs("logs.middleware", level="WARNING") as logs:
+            self.call(self.make_view(queries=3))
+
+        self.assertIn("Repeated query (3 times", logs.output[0])
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_exceeded_budget_raises_when_enabled(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.call(self.make_view(queries=2, budget=1))
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_exceeded_budget_is_logged_otherwise(self):
+        with self.assertLogs("logs.middleware", level="WARNING") as logs:
+            response = self.call(self.make_view(queries=2, budget=1))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertIn("ran 2 queries, budget=1", logs.output[0])
+
+
+class NormalizeSqlTests(SimpleTestCase):
+    def test_placeholder_lists_collapse_to_one_shape(self):
+        self.assertEqual(
+            normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s)'),
+        )
+        self.assertEqual(
+            normalize_sql('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO "t" ("a", "b") VALUES (%s)',
+        )
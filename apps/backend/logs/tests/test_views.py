@@ -0,0 +1,27 @@
+from django.urls import reverse
+from rest_framework import status
+
+from core.tests.factories import create_user
+from core.tests.testcases import BaseAPITestCase
+from core.utils.cache import get_cache
+
+
+class CacheMetricsViewTests(BaseAPITestCase):
+    def setUp(self):
+        self.url = reverse("cache_metrics")
+
+    def test_admin_can_read_cache_metrics(self):
+        self.authenticate(create_user(is_staff=True))
+        get_cache(namespace="articles", entity="item", identifier=1)
+
+        response = self.get_json(self.url)
+
+        self.assert_success_response(response, status_code=status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["articles"]["item"]["misses"], 1)
+
+    def test_regular_user_cannot_read_cache_metrics(self):
+        self.authenticate(create_user())
+
+        response = self.get_json(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import (
+    CacheMetricsView,
+)
+
+urlpatterns = [
+    path('logs/cache_metrics/', CacheMetricsView.as_view(), name='cache_metrics'),
+]
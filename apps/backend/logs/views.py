@@ -0,0 +1,16 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from core.utils.cache_metrics import get_cache_metrics
+from core.views.mixins import FormattedResponseMixin
+
+
+class CacheMetricsView(FormattedResponseMixin, APIView):
+    """
+    Return cache hits, misses, errors and latency histograms per namespace and entity.
+    Counters are kept per process, so each worker reports its own numbers.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return self.format_success_response(data=get_cache_metrics())
@@ -31,4 +31,13 @@ periodic_tasks = [
                 },
                 "args": [1],  # grace_days=1
             },
+            {
+                "name": "collect unreferenced content blobs",
+                "task": "articles.tasks.collect_content_blobs",
+                "queue_name": "maintenance",
+                "schedule": {
+                    'every': 1,
+                    'period': 'day'
+                },
+            },
 ]
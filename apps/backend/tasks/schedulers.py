@@ -1,12 +1,10 @@
-from django.core.cache import cache
-from django.core.exceptions import ImproperlyConfigured
 from django.db import transaction
 from django.utils import timezone
 from django.utils.module_loading import import_string
 
 from dataclasses import dataclass
 
-from core.utils.cache import get_key
+from core.utils.cache import get_cache_lock
 from logs.logging import get_logger
 from .models import PeriodicTask
 from .utils import compute_next_enqueue_at
@@ -32,15 +30,7 @@ def acquire_scheduler_lock(*, identifier="dispatch", ttl=30):
 
     PS: dispatch (分派/调度)
     """
-    key = get_key(namespace='scheduler', entity='lock', identifier=identifier)
-    lock_function = getattr(cache, "lock", None)
-
-    if callable(lock_function):
-        return lock_function(key, timeout=ttl)
-    else:
-        raise ImproperlyConfigured(
-            "The task backend does not provide a callable .lock() function. "
-        )
+    return get_cache_lock(namespace='scheduler', entity='lock', identifier=identifier, timeout=ttl)
 
 
 def dispatch_task(*, task, now):
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.db.models.functions.text
+from django.db import migrations
+
+from core.migration_operations import AddIndexOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        # CREATE EXTENSION IF NOT EXISTS pg_trgm, does nothing on other databases
+        django.contrib.postgres.operations.TrigramExtension(),
+        AddIndexOnPostgres(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='gin_trgm_ops'), name='user_username_trgm'),
+        ),
+    ]
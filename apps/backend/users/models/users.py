@@ -126,5 +126,8 @@ class User(UUIDPrimaryKeyMixin,
         verbose_name = _("user")
         verbose_name_plural = _("users")
 
+        # PostgreSQL-only index, kept out of the model state (see core.migration_operations):
+        # - user_username_trgm: GIN gin_trgm_ops on UPPER(username), for autocomplete (migration 0002)
+
     def __str__(self):
         return self.username
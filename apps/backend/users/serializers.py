@@ -7,6 +7,7 @@ from rest_framework.validators import UniqueValidator
 import io
 from PIL import Image
 
+from core.serializers import FlatRepresentationMixin
 from core.validators import (
     FileSizeValidator,
     FileTypeValidator,
@@ -96,7 +97,7 @@ class UserRegisterOutputSerializer(serializers.Serializer):
     code_ttl_seconds = serializers.IntegerField(read_only=True)
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(FlatRepresentationMixin, serializers.ModelSerializer):
     """
     List all user profiles
     """
@@ -7,6 +7,7 @@ import random
 import hashlib
 
 from core.exceptions import ServiceError
+from core.utils.autocomplete import autocomplete
 from core.utils.cache import add_cache, set_cache, get_cache, delete_cache, incr_cache
 from users.models import EmailAddress
 from users.tasks import send_verification_email_task
@@ -147,7 +148,8 @@ def verify_email(*, user, email, code):
 
     if stored_code != _hash_code(email, code):
         attempts = incr_cache(
-            namespace=namespace, entity="attempts", identifier=email, delta=1, timeout=600
+            namespace=namespace, entity="attempts", identifier=email, delta=1,
+            timeout=settings.VERIFICATION_CODE_TTL,
         )
         if attempts >= settings.MAX_VERIFICATION_ATTEMPTS:
             raise ServiceError(
@@ -174,3 +176,15 @@ def verify_email(*, user, email, code):
     return {
         "email": email_address.email
     }
+
+
+def autocomplete_usernames(query, *, limit):
+    """
+    Return up to 'limit' active users whose username starts with or resembles 'query',
+    as {'id', 'username'} dicts. Results are cached briefly per (query, limit).
+    """
+    return autocomplete(
+        queryset=User.objects.filter(is_active=True),
+        field='username', query=query, limit=limit,
+        namespace='users', entity='username_autocomplete',
+    )
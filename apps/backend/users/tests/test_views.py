@@ -149,6 +149,12 @@ class UserViewTests(BaseAPITestCase):
         self.assertTrue(self.email_address.is_verified)
         self.assertTrue(self.user.is_email_verified)
 
+    def test_autocomplete_suggests_usernames_anonymously(self):
+        response = self.get_json(reverse("profile-autocomplete"), {"q": "cap"})
+
+        self.assert_success_response(response, status_code=status.HTTP_200_OK, code="suggested")
+        self.assertEqual(response.data["data"], [{"id": str(self.user.id), "username": "captain"}])
+
 
 class SessionViewTests(BaseAPITestCase):
     def setUp(self):
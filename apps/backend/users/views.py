@@ -8,10 +8,11 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.exceptions import AuthenticationFailed
 
+from core.serializers import AutocompleteQuerySerializer
 from core.views.mixins import (
     FormattedResponseMixin, MyListModelMixin, MyRetrieveModelMixin
 )
-from .services.users import register, verify_email
+from .services.users import autocomplete_usernames, register, verify_email
 from .services.sessions import create_user_session, delete_user_session
 from .serializers import (
     UserRegisterInputSerializer,
@@ -51,7 +52,7 @@ class UserViewSet(MyListModelMixin,
 
     def get_permissions(self):
         self.action: str
-        if self.action in ('create', 'list', 'retrieve'):
+        if self.action in ('create', 'list', 'retrieve', 'autocomplete'):
             self.permission_classes = [AllowAny]
         elif self.action in ('me',):
             self.permission_classes = [IsAuthenticated]
@@ -77,6 +78,23 @@ class UserViewSet(MyListModelMixin,
             status_code=status.HTTP_201_CREATED
         )
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Suggest usernames starting with or resembling 'q' (at most 'limit').
+        """
+        query_serializer = AutocompleteQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        return self.format_success_response(
+            message="usernames suggested",
+            code='suggested',
+            data=autocomplete_usernames(
+                query_serializer.validated_data['q'], limit=query_serializer.validated_data['limit'],
+            ),
+            status_code=status.HTTP_200_OK,
+        )
+
     @action(detail=False, methods=['get', 'patch'], url_path='me')
     def me(self, request):
         user = request.user